@@ -0,0 +1,92 @@
+# Benchmarks model training throughput with the CPU budget (cpu_budget.py) against
+# the previous nested n_jobs=-1 setup (BayesSearchCV, ColumnTransformer and model
+# all at n_jobs=-1), with `--concurrent` training nodes running at once like
+# Kedro's ParallelRunner does. Every training runs in its own process.
+#
+# The gain grows with the number of cores: oversubscription runs up to cores²
+# threads. Run it on the target machine, e.g. a 32-core box:
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_cpu_budget.py
+#   python benchmarks/bench_cpu_budget.py --models random_forest_config xgboost_config --concurrent 1 2 4 --scale 4
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import joblib
+from common import load_parameters, load_training_data
+
+from egt309_pipeline.pipelines.model_training.cpu_budget import CPUBudget
+from egt309_pipeline.pipelines.model_training.nodes import (
+    _search_model,
+    _SearchSetup,
+    train_model,
+)
+
+
+def train_once(model_key: str, setup: str, options: dict, scale: int) -> float:
+    """Trains one model in this process, returns its wall time."""
+    parameters = load_parameters()
+    X_train, _, y_train, _, encoder = load_training_data(options, scale)
+    model_config = dict(parameters[model_key])
+
+    start = time.perf_counter()
+    if setup == "nested n_jobs=-1":
+        # Previous behaviour: -1 at every level, no thread pool limits
+        cores = joblib.cpu_count()
+        nested = CPUBudget(cores, cores, -1, -1, preprocessor_jobs=-1)
+        setup = _SearchSetup(model_config, options, encoder, budget=nested)
+        _search_model(X_train, y_train, setup)
+    else:
+        train_model(X_train, y_train, model_config, options, encoder)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models", nargs="+", default=["random_forest_config", "xgboost_config"]
+    )
+    parser.add_argument("--concurrent", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--n-iter", type=int, default=4)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    options = {
+        **load_parameters()["parameters_model_training"],
+        "bayes_search_n_iters": args.n_iter,
+    }
+    print(f"{joblib.cpu_count()} cores")
+    print(
+        f"{'model':>22}{'concurrent':>11}{'setup':>18}"
+        f"{'wall (s)':>10}{'models/h':>10}{'speed-up':>10}"
+    )
+    for model_key in args.models:
+        for concurrent in args.concurrent:
+            budget = {"total_cores": None, "concurrent_models": concurrent}
+            nested_rate = None
+            for setup in ("nested n_jobs=-1", "cpu_budget"):
+                run_options = {**options, "cpu_budget": budget}
+                start = time.perf_counter()
+                with ProcessPoolExecutor(max_workers=concurrent) as pool:
+                    list(
+                        pool.map(
+                            train_once,
+                            [model_key] * concurrent,
+                            [setup] * concurrent,
+                            [run_options] * concurrent,
+                            [args.scale] * concurrent,
+                        )
+                    )
+                wall = time.perf_counter() - start
+                rate = concurrent * 3600 / wall
+                nested_rate = nested_rate or rate
+                print(
+                    f"{model_key:>22}{concurrent:>11}{setup:>18}{wall:>10.1f}"
+                    f"{rate:>10.1f}{rate / nested_rate:>9.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
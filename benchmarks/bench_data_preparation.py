@@ -0,0 +1,97 @@
+# Benchmarks the data_preparation pipeline in its "nodes" and "fused" execution modes.
+# Every (mode, scale) pair runs in its own subprocess so that peak RSS is not shared.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_data_preparation.py
+#   python benchmarks/bench_data_preparation.py --scales 1 10 --modes fused
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from common import load_scaled_bmarket
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.runner import SequentialRunner
+
+from egt309_pipeline.pipelines.data_preparation import create_pipeline
+
+
+def run_worker(mode: str, scale: int) -> dict:
+    """Runs one pipeline mode through Kedro's SequentialRunner with in-memory datasets."""
+    df = load_scaled_bmarket(scale)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # Source and sink are assigned (like the SQL and CSV datasets, which do not copy),
+    # intermediate datasets are created by the runner with Kedro's default copy mode
+    catalog = DataCatalog(
+        datasets={
+            "bmarket": MemoryDataset(df, copy_mode="assign"),
+            "cleaned_bmarket": MemoryDataset(copy_mode="assign"),
+        }
+    )
+    del df
+
+    start = time.perf_counter()
+    SequentialRunner().run(
+        create_pipeline(
+            execution_mode=mode,
+            column_rules=[],
+            imputation_sampling="cdf",
+            cleaning_rules={},
+        ),
+        catalog,
+    )
+    wall_time = time.perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "mode": mode,
+        "scale": scale,
+        "rows": len(catalog.load("cleaned_bmarket")),
+        "wall_time_s": round(wall_time, 3),
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mib": round(peak_rss / 1024, 1),
+        "input_rss_mib": round(baseline_rss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--modes", nargs="+", default=["nodes", "fused"])
+    parser.add_argument("--worker", nargs=2, metavar=("MODE", "SCALE"))
+    args = parser.parse_args()
+
+    if args.worker:
+        mode, scale = args.worker
+        print(json.dumps(run_worker(mode, int(scale))))
+        return
+
+    print(
+        f"{'mode':<8}{'scale':>7}{'rows':>11}{'wall time (s)':>15}"
+        f"{'peak RSS (MiB)':>16}{'input RSS (MiB)':>17}"
+    )
+    for scale in args.scales:
+        for mode in args.modes:
+            result = subprocess.run(
+                [sys.executable, __file__, "--worker", mode, str(scale)],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            if result.returncode != 0:
+                print(f"{mode:<8}{scale:>7}  failed: {result.stderr.strip()[-200:]}")
+                continue
+
+            r = json.loads(result.stdout.strip().splitlines()[-1])
+            print(
+                f"{r['mode']:<8}{r['scale']:>7}{r['rows']:>11}{r['wall_time_s']:>15}"
+                f"{r['peak_rss_mib']:>16}{r['input_rss_mib']:>17}"
+            )
+
+
+if __name__ == "__main__":
+    main()
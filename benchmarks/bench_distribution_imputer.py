@@ -0,0 +1,68 @@
+# Benchmarks drawing imputed values with the previous approach (value_counts and
+# rng.choice with a probability list on every call) against a fitted
+# DistributionImputer with its "cdf" and "alias" sampling tables. Each call imputes
+# one chunk of `--chunk-rows` rows, 10% of them missing, in a column of `labels`
+# distinct values, as chunked or online imputation does.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_distribution_imputer.py
+#   python benchmarks/bench_distribution_imputer.py --labels 3 80 1000 --calls 500
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from egt309_pipeline.pipelines.data_preparation.distribution_imputer import (
+    DistributionImputer,
+)
+
+
+def make_column(labels: int, rows: int) -> pd.Series:
+    """Skewed integer column with 10% missing values."""
+    rng = np.random.default_rng(42)
+    col = pd.Series(rng.zipf(1.5, rows) % labels, dtype="float64")
+    col[rng.random(rows) < 0.1] = np.nan
+    return col
+
+
+def per_call(col: pd.Series, rng: np.random.Generator) -> np.ndarray:
+    # Previous implementation: the distribution is rebuilt on every call
+    counts = col.value_counts()
+    probabilities = (counts / counts.sum()).tolist()
+    return rng.choice(counts.index.tolist(), size=col.isna().sum(), p=probabilities)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--labels", type=int, nargs="+", default=[3, 80, 1000])
+    parser.add_argument("--chunk-rows", type=int, default=10_000)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'labels':>7}{'engine':>12}{'fit (ms)':>10}{'per call (ms)':>15}")
+    for labels in args.labels:
+        col = make_column(labels, args.chunk_rows)
+        engines = {"per-call": None}
+        for method in ("cdf", "alias"):
+            start = time.perf_counter()
+            imputer = DistributionImputer(method=method).fit(col)
+            imputer.sample(1, imputer.rng())  # builds the sampling table
+            engines[method] = (imputer, time.perf_counter() - start)
+
+        for engine, fitted in engines.items():
+            rng = np.random.default_rng(42)
+            start = time.perf_counter()
+            for _ in range(args.calls):
+                if fitted is None:
+                    per_call(col, rng)
+                else:
+                    fitted[0].fill(col, rng)
+            call_time = (time.perf_counter() - start) / args.calls
+            fit_time = "-" if fitted is None else f"{fitted[1] * 1000:.2f}"
+            print(f"{labels:>7}{engine:>12}{fit_time:>10}{call_time * 1000:>15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# Benchmarks native early stopping of the boosted models in train_model: every
+# model is trained (Bayesian search, refit & threshold tuning) with early
+# stopping (its early_stopping config, or EARLY_STOPPING when it has none, as
+# early stopping is opt-in) and without it (searching n_estimators/iterations), and
+# the wall time, the rounds of the final model and its ROC AUC on the test split
+# are compared.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_early_stopping.py
+#   python benchmarks/bench_early_stopping.py --models xgboost_config --n-iter 10
+
+import argparse
+import time
+
+from common import load_parameters, load_training_data
+from sklearn.metrics import roc_auc_score
+
+from egt309_pipeline.pipelines.model_training.nodes import train_model
+
+# early_stopping of the models whose config has none, with the name of the AUC
+# metric in every library
+EARLY_STOPPING = {"rounds": 50, "validation_fraction": 0.1}
+AUC_METRICS = {"xgboost": "auc", "lightgbm": "auc", "catboost": "AUC"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models", nargs="+", default=["xgboost_config", "lightgbm_config"]
+    )
+    parser.add_argument("--n-iter", type=int, default=3)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    parameters = load_parameters()
+    options = {
+        **parameters["parameters_model_training"],
+        "bayes_search_n_iters": args.n_iter,
+    }
+    X_train, X_test, y_train, y_test, encoder = load_training_data(options, args.scale)
+
+    print(f"{len(X_train)} training rows, {args.n_iter} candidates")
+    print(
+        f"{'model':>22}{'early stopping':>16}{'train (s)':>11}{'speed-up':>10}"
+        f"{'rounds':>8}{'test AUC':>10}"
+    )
+    for model_key in args.models:
+        full_time = None
+        for early_stopping in (False, True):
+            model_config = dict(parameters[model_key])
+            if not early_stopping:
+                model_config.pop("early_stopping", None)
+            elif "early_stopping" not in model_config:
+                library = model_config["class"].split(".")[0]
+                model_config["early_stopping"] = {
+                    **EARLY_STOPPING,
+                    "eval_metric": AUC_METRICS[library],
+                }
+
+            start = time.perf_counter()
+            model, best_params = train_model(
+                X_train, y_train, model_config, options, encoder
+            )
+            elapsed = time.perf_counter() - start
+            full_time = full_time or elapsed
+            rounds = next(
+                value
+                for name, value in best_params.items()
+                if name.endswith(("n_estimators", "iterations"))
+            )
+            auc = roc_auc_score(y_test, model.predict_proba(X_test)[:, 1])
+            print(
+                f"{model_key:>22}{str(early_stopping):>16}{elapsed:>11.1f}"
+                f"{full_time / elapsed:>9.2f}x{rounds:>8}{auc:>10.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
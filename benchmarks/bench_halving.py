@@ -0,0 +1,95 @@
+# Benchmarks the hyperparameter search strategies of train_model: the Bayesian
+# search and successive halving (with stratified subsamples and with n_estimators
+# as the resource) evaluate the same number of candidates, drawn from the same
+# search_space; the search wall time, the out-of-fold recall of the best candidate
+# and its recall threshold are compared.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_halving.py
+#   python benchmarks/bench_halving.py --models xgboost_config --n-candidates 81 --scale 2
+
+import argparse
+import tempfile
+import time
+
+from common import load_parameters, load_training_data
+from sklearn.metrics import recall_score
+
+from egt309_pipeline.pipelines.model_training.nodes import (
+    _search_model,
+    _SearchSetup,
+)
+from egt309_pipeline.pipelines.model_training.out_of_fold import load_out_of_fold
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models", nargs="+", default=["random_forest_config", "xgboost_config"]
+    )
+    parser.add_argument("--n-candidates", type=int, default=27)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    parameters = load_parameters()
+    options = parameters["parameters_model_training"]
+    X_train, _, y_train, _, encoder = load_training_data(options, args.scale)
+
+    strategies = {
+        "bayes": {"search_strategy": "bayes"},
+        "halving n_samples": {"search_strategy": "halving", "resource": "n_samples"},
+        "halving n_estimators": {
+            "search_strategy": "halving",
+            "resource": "n_estimators",
+        },
+    }
+    print(f"{len(X_train)} training rows, {args.n_candidates} candidates")
+    print(
+        f"{'model':>22}{'strategy':>22}{'search (s)':>12}{'speed-up':>10}"
+        f"{'OOF recall':>12}{'threshold':>11}"
+    )
+    for model_key in args.models:
+        bayes_time = None
+        for strategy, settings_ in strategies.items():
+            model_config = dict(parameters[model_key])
+            search_strategy = settings_["search_strategy"]
+            resource = settings_.get("resource", "n_samples")
+            if resource not in ("n_samples", *model_config.get("search_space", {})):
+                continue
+            run_options = {
+                **options,
+                "search_strategy": search_strategy,
+                "bayes_search_n_iters": args.n_candidates,
+                "halving": {
+                    **options.get("halving", {}),
+                    "n_candidates": args.n_candidates,
+                    "resource": resource,
+                },
+            }
+
+            with tempfile.TemporaryDirectory() as cache_dir:
+                start = time.perf_counter()
+                model, best_params = _search_model(
+                    X_train,
+                    y_train,
+                    _SearchSetup(
+                        model_config, run_options, encoder, cache_dir=cache_dir
+                    ),
+                )
+                elapsed = time.perf_counter() - start
+                y_proba = load_out_of_fold(cache_dir, best_params, X_train.index)
+
+            # Out-of-fold recall_weighted of the best candidate, at 0.5
+            score = recall_score(
+                y_train, (y_proba >= 0.5).astype(y_train.dtype), average="weighted"
+            )
+            bayes_time = bayes_time or elapsed
+            print(
+                f"{model_key:>22}{strategy:>22}{elapsed:>12.1f}"
+                f"{bayes_time / elapsed:>9.2f}x{score:>12.4f}"
+                f"{model.threshold_:>11.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
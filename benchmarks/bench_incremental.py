@@ -0,0 +1,92 @@
+# Benchmarks the "incremental" execution mode of the data_preparation pipeline: the
+# table (repeated `scale` times) is ingested once, `--new-rows` rows are appended, and
+# the incremental run that follows is timed against a full rebuild of the same table.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_incremental.py
+#   python benchmarks/bench_incremental.py --scales 1 10 --new-rows 100 5000
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from common import DB_PATH, TABLE
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.runner import SequentialRunner
+
+from egt309_pipeline.datasets import ArrowDataset, IncrementalSQLTableDataset
+from egt309_pipeline.pipelines.data_preparation import create_pipeline
+
+OPTIONS = {"execution_mode": "incremental", "sql_pushdown": False, "column_rules": []}
+
+
+def run_incremental(directory: Path, options: dict) -> float:
+    """Runs the incremental pipeline once on directory/bmarket.db, returns wall time."""
+    output = directory / "cleaned_bmarket"
+    catalog = DataCatalog(
+        datasets={
+            "bmarket_increment": IncrementalSQLTableDataset(
+                table_name=TABLE,
+                credentials={"con": f"sqlite:///{directory / 'bmarket.db'}"},
+                checkpoint=str(output / "_checkpoint.json"),
+            ),
+            "cleaned_bmarket": ArrowDataset(
+                filepath=str(output), save_args={"preserve_index": False}
+            ),
+            "params:parameters_data_preparation": MemoryDataset(options),
+        }
+    )
+    pipeline = create_pipeline(
+        execution_mode="incremental",
+        sql_pushdown=False,
+        column_rules=[],
+        imputation_sampling="cdf",
+        cleaning_rules={},
+    )
+    start = time.perf_counter()
+    SequentialRunner().run(pipeline, catalog)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--new-rows", type=int, nargs="+", default=[100, 1000, 10000])
+    args = parser.parse_args()
+
+    with sqlite3.connect(DB_PATH) as con:
+        df = pd.read_sql(f"SELECT * FROM {TABLE}", con)
+
+    print(
+        f"{'scale':>6}{'table rows':>12}{'new rows':>10}"
+        f"{'incremental (s)':>17}{'full rebuild (s)':>18}{'speed-up':>10}"
+    )
+    for scale in args.scales:
+        for new_rows in args.new_rows:
+            with tempfile.TemporaryDirectory() as tmp:
+                directory = Path(tmp)
+                with sqlite3.connect(directory / "bmarket.db") as con:
+                    for _ in range(scale):
+                        df.to_sql(TABLE, con, if_exists="append", index=False)
+                run_incremental(directory, OPTIONS)
+
+                with sqlite3.connect(directory / "bmarket.db") as con:
+                    df.sample(new_rows, replace=True, random_state=42).to_sql(
+                        TABLE, con, if_exists="append", index=False
+                    )
+                incremental_time = run_incremental(directory, OPTIONS)
+                # Any change to the parameters forces a rebuild
+                rebuild_time = run_incremental(directory, {**OPTIONS, "rebuild": 1})
+
+            print(
+                f"{scale:>6}{len(df) * scale + new_rows:>12}{new_rows:>10}"
+                f"{incremental_time:>17.3f}{rebuild_time:>18.3f}"
+                f"{rebuild_time / incremental_time:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
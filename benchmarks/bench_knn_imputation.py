@@ -0,0 +1,110 @@
+# Benchmarks the blocked KD-tree KNN imputation used by impute_age(impute_method="knn")
+# against sklearn's KNNImputer on synthetic data. Every (engine, rows) pair runs in
+# its own subprocess so that peak RSS is not shared. KNNImputer is quadratic, so it
+# is skipped above --max-sklearn-rows.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_knn_imputation.py
+#   python benchmarks/bench_knn_imputation.py --rows 10000 100000 --max-sklearn-rows 10000
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from sklearn.impute import KNNImputer
+
+from egt309_pipeline.pipelines.data_preparation.nodes import _my_knnimputer
+
+N_FEATURES = 8
+MISSING_RATIO = 0.05
+FEATURES = [f"x{i}" for i in range(N_FEATURES)]
+# KD-tree engines: {name: eps}, eps > 0 is an approximate neighbour search
+KDTREE_ENGINES = {"kdtree": 0.0, "kdtree-eps0.5": 0.5}
+
+
+def make_data(rows: int) -> pd.DataFrame:
+    """Synthetic table: numeric features and a target missing in 5% of the rows."""
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame(rng.normal(size=(rows, N_FEATURES)), columns=FEATURES)
+    df["target"] = df.to_numpy() @ rng.normal(size=N_FEATURES) + rng.normal(size=rows)
+    df.loc[rng.random(rows) < MISSING_RATIO, "target"] = np.nan
+    return df
+
+
+def run_worker(engine: str, rows: int) -> dict:
+    df = make_data(rows)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    if engine in KDTREE_ENGINES:
+        eps = KDTREE_ENGINES[engine]
+        imputed = _my_knnimputer(df, "target", corr_cols=FEATURES, eps=eps)["target"]
+    else:
+        imputed = KNNImputer(n_neighbors=5).fit_transform(df[[*FEATURES, "target"]])
+        imputed = imputed[:, -1]
+    wall_time = time.perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    missing = df["target"].isna().to_numpy()
+    return {
+        "engine": engine,
+        "rows": rows,
+        "imputed": int(missing.sum()),
+        "wall_time_s": round(wall_time, 3),
+        # ru_maxrss is reported in KiB on Linux
+        "peak_rss_mib": round(peak_rss / 1024, 1),
+        "input_rss_mib": round(baseline_rss / 1024, 1),
+        # Imputed values, to check that both engines agree
+        "checksum": round(float(np.asarray(imputed)[missing].sum()), 6),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--max-sklearn-rows", type=int, default=100_000)
+    parser.add_argument("--worker", nargs=2, metavar=("ENGINE", "ROWS"))
+    args = parser.parse_args()
+
+    if args.worker:
+        engine, rows = args.worker
+        print(json.dumps(run_worker(engine, int(rows))))
+        return
+
+    print(
+        f"{'engine':<15}{'rows':>10}{'imputed':>9}{'wall time (s)':>15}"
+        f"{'peak RSS (MiB)':>16}{'input RSS (MiB)':>17}{'checksum':>16}"
+    )
+    for rows in args.rows:
+        for engine in (*KDTREE_ENGINES, "KNNImputer"):
+            if engine == "KNNImputer" and rows > args.max_sklearn_rows:
+                print(f"{engine:<15}{rows:>10}  skipped (quadratic)")
+                continue
+
+            result = subprocess.run(
+                [sys.executable, __file__, "--worker", engine, str(rows)],
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            if result.returncode != 0:
+                print(f"{engine:<15}{rows:>10}  failed: {result.stderr.strip()[-200:]}")
+                continue
+
+            r = json.loads(result.stdout.strip().splitlines()[-1])
+            print(
+                f"{r['engine']:<15}{r['rows']:>10}{r['imputed']:>9}"
+                f"{r['wall_time_s']:>15}{r['peak_rss_mib']:>16}"
+                f"{r['input_rss_mib']:>17}{r['checksum']:>16}"
+            )
+
+
+if __name__ == "__main__":
+    main()
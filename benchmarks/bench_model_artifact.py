@@ -0,0 +1,200 @@
+# Benchmarks loading a trained model from the previous pickle entry against the
+# ModelArtifactDataset (native booster files, parsed lazily). Every model of the
+# registry is fitted once on X_train with its model_params and --n-estimators
+# rounds (no search), wrapped like train_model's output (RecallOptimizedClassifier
+# around the preprocessor & model Pipeline) and saved in both formats; then
+# every (model, format) load runs in its own
+# subprocess (as the evaluation pipeline or a serving process starting), which
+# times the imports of the model libraries (the same for both formats), then the
+# load and the first predict_proba on X_test. total is load + first predict; load
+# RSS is the growth of the worker's resident memory during the load.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_model_artifact.py
+#   python benchmarks/bench_model_artifact.py --models xgboost random_forest --n-estimators 500
+
+import argparse
+import importlib
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+FORMATS = ("pickle", "artifact")
+MODEL_LIBRARIES = (
+    "sklearn.ensemble",
+    "xgboost",
+    "lightgbm",
+    "catboost",
+    "egt309_pipeline.pipelines.model_training.nodes",
+)
+
+
+def rss_mib() -> float:
+    # Resident memory of this process (Linux)
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * resource.getpagesize() / 2**20
+
+
+def make_dataset(fmt: str, directory: Path):
+    from kedro_datasets.pickle import PickleDataset  # noqa: PLC0415
+
+    from egt309_pipeline.datasets import ModelArtifactDataset  # noqa: PLC0415
+
+    if fmt == "pickle":
+        return PickleDataset(filepath=str(directory / "model.pkl"))
+    return ModelArtifactDataset(filepath=str(directory / "model"))
+
+
+def load_split(directory: Path) -> tuple:
+    from common import load_scaled_bmarket  # noqa: PLC0415
+
+    from egt309_pipeline.pipelines.data_preparation.nodes import (  # noqa: PLC0415
+        clean_bmarket_fused,
+    )
+    from egt309_pipeline.pipelines.model_training.nodes import (  # noqa: PLC0415
+        compact_dtypes,
+        split_dataset,
+    )
+
+    cleaned = compact_dtypes(clean_bmarket_fused(load_scaled_bmarket()), {})
+    X_train, X_test, y_train, y_test = split_dataset(
+        cleaned, {"test_size": 0.2, "random_state": 42}
+    )
+    X_test.to_pickle(directory / "X_test.pkl")
+    return X_train, y_train
+
+
+def fit_model(name: str, model_config: dict, n_estimators: int, X_train, y_train):
+    from sklearn.pipeline import Pipeline  # noqa: PLC0415
+
+    from egt309_pipeline.pipelines.model_training.nodes import (  # noqa: PLC0415
+        RecallOptimizedClassifier,
+        _build_preprocessor,
+        _init_model,
+        fit_encoder,
+    )
+
+    model_config = {
+        **model_config,
+        "model_params": dict(model_config.get("model_params", {})),
+    }
+    rounds_param = (
+        "iterations" if "catboost" in model_config["class"] else "n_estimators"
+    )
+    model_config["model_params"][rounds_param] = n_estimators
+    model = _init_model(X_train, model_config, {"random_state": 42})
+    preprocessor = _build_preprocessor(X_train, model_config, fit_encoder(X_train))
+    steps = [("model", model)]
+    if preprocessor:
+        steps.insert(0, ("preprocessor", preprocessor))
+
+    start = time.perf_counter()
+    pipeline = Pipeline(steps).fit(X_train, y_train)
+    print(f"Fitted {name} in {time.perf_counter() - start:.1f}s", file=sys.stderr)
+
+    # The threshold is tuned on the training predictions, the load is what counts
+    final_model = RecallOptimizedClassifier(base_estimator=pipeline, cv=3)
+    return final_model.fit(
+        X_train, y_train, y_proba=pipeline.predict_proba(X_train)[:, 1]
+    )
+
+
+def run_worker(fmt: str, directory: str) -> dict:
+    X_test = pd.read_pickle(Path(directory) / "X_test.pkl")
+    dataset = make_dataset(fmt, Path(directory))
+
+    # The libraries the model needs are imported whatever its format
+    start = time.perf_counter()
+    for module in MODEL_LIBRARIES:
+        importlib.import_module(module)
+    import_time = time.perf_counter() - start
+
+    rss = rss_mib()
+    start = time.perf_counter()
+    model = dataset.load()
+    load_time = time.perf_counter() - start
+    load_rss = rss_mib() - rss
+
+    start = time.perf_counter()
+    model.predict_proba(X_test)
+    predict_time = time.perf_counter() - start
+
+    return {
+        "import_s": round(import_time, 4),
+        "load_s": round(load_time, 4),
+        "load_rss_mib": round(load_rss, 2),
+        "first_predict_s": round(predict_time, 4),
+    }
+
+
+def disk_size_mib(path: Path) -> float:
+    files = [path] if path.is_file() else list(path.rglob("*"))
+    return sum(file.stat().st_size for file in files) / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        default=["xgboost", "lightgbm", "catboost", "random_forest", "adaboost"],
+    )
+    parser.add_argument("--n-estimators", type=int, default=300)
+    parser.add_argument("--worker", nargs=2, metavar=("FORMAT", "DIR"))
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(*args.worker)))
+        return
+
+    from common import load_parameters  # noqa: PLC0415
+
+    parameters = load_parameters()
+    registry = parameters["model_registry_config"]
+
+    print(
+        f"{'model':>15}{'format':>10}{'size (MiB)':>12}{'imports (s)':>13}{'load (s)':>10}"
+        f"{'load RSS (MiB)':>16}{'1st predict (s)':>17}{'total (s)':>11}"
+    )
+    for name in args.models:
+        model_config = parameters[registry[name]["model_config_key"]]
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            X_train, y_train = load_split(directory)
+            model = fit_model(name, model_config, args.n_estimators, X_train, y_train)
+            for fmt in FORMATS:
+                make_dataset(fmt, directory).save(model)
+
+            for fmt in FORMATS:
+                result = subprocess.run(
+                    [sys.executable, __file__, "--worker", fmt, tmp],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    cwd=ROOT,
+                )
+                if result.returncode != 0:
+                    print(f"{name:>15}{fmt:>10}  failed: {result.stderr[-300:]}")
+                    continue
+
+                r = json.loads(result.stdout.strip().splitlines()[-1])
+                size = disk_size_mib(
+                    directory / ("model.pkl" if fmt == "pickle" else "model")
+                )
+                print(
+                    f"{name:>15}{fmt:>10}{size:>12.2f}{r['import_s']:>13.3f}"
+                    f"{r['load_s']:>10.3f}{r['load_rss_mib']:>16.1f}"
+                    f"{r['first_predict_s']:>17.3f}"
+                    f"{r['load_s'] + r['first_predict_s']:>11.3f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Benchmarks the "parallel" execution mode of the data_preparation pipeline
+# (clean_bmarket_parallel) against the single-process "fused" pass, on the table
+# repeated `scale` times, for every number of processes in `--n-jobs`. Every run is
+# checked to produce exactly the output of the fused pass, and the output is also
+# compared across `--shards` shard counts.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_parallel.py
+#   python benchmarks/bench_parallel.py --scales 10 100 --n-jobs 1 2 4 8
+
+import argparse
+import os
+import time
+
+from common import load_scaled_bmarket
+
+from egt309_pipeline.pipelines.data_preparation.nodes import (
+    clean_bmarket_fused,
+    clean_bmarket_parallel,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100])
+    parser.add_argument("--n-jobs", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 7, 64])
+    args = parser.parse_args()
+
+    print(f"{os.cpu_count()} cores available")
+    print(
+        f"{'scale':>6}{'rows':>10}{'engine':>14}{'time (s)':>10}"
+        f"{'speed-up':>10}{'identical':>11}"
+    )
+    for scale in args.scales:
+        df = load_scaled_bmarket(scale)
+        start = time.perf_counter()
+        expected = clean_bmarket_fused(df)
+        fused_time = time.perf_counter() - start
+        print(f"{scale:>6}{len(df):>10}{'fused':>14}{fused_time:>10.3f}")
+
+        for n_jobs in args.n_jobs:
+            start = time.perf_counter()
+            cleaned, _ = clean_bmarket_parallel(df, n_jobs=n_jobs)
+            parallel_time = time.perf_counter() - start
+            print(
+                f"{scale:>6}{len(df):>10}{f'n_jobs={n_jobs}':>14}"
+                f"{parallel_time:>10.3f}{fused_time / parallel_time:>9.1f}x"
+                f"{str(cleaned.equals(expected)):>11}"
+            )
+
+        for n_shards in args.shards:
+            cleaned, _ = clean_bmarket_parallel(df, n_jobs=1, n_shards=n_shards)
+            print(
+                f"{scale:>6}{len(df):>10}{f'shards={n_shards}':>14}"
+                f"{'':>20}{str(cleaned.equals(expected)):>11}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# Benchmarks the fold-level preprocessing cache of train_model: the Bayesian search
+# (and the refit & recall threshold tuning that follow it) of every model is timed
+# with preprocessing_cache on and off, on bmarket repeated `--scale` times.
+# n_estimators/iterations are capped with `--max-estimators` so that the share
+# of preprocessing in every fit is visible; the cache saves the same time per fit
+# whatever the model costs.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_preprocessing_cache.py
+#   python benchmarks/bench_preprocessing_cache.py --scale 4 --n-iter 20 --models svc_config
+
+import argparse
+import time
+
+from common import load_parameters, load_training_data
+
+from egt309_pipeline.pipelines.model_training.nodes import train_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        default=["random_forest_config", "xgboost_config", "adaboost_config"],
+    )
+    parser.add_argument("--scale", type=int, default=2)
+    parser.add_argument("--n-iter", type=int, default=10)
+    parser.add_argument("--max-estimators", type=int, default=20)
+    args = parser.parse_args()
+
+    parameters = load_parameters()
+    options = {
+        **parameters["parameters_model_training"],
+        "bayes_search_n_iters": args.n_iter,
+    }
+    X_train, _, y_train, _, encoder = load_training_data(options, args.scale)
+
+    print(f"{len(X_train)} training rows, {args.n_iter} candidates")
+    print(f"{'model':>22}{'cache':>7}{'search (s)':>12}{'speed-up':>10}")
+    for model_key in args.models:
+        uncached_time = None
+        for cache in (False, True):
+            model_config = dict(parameters[model_key])
+            search_space = dict(model_config.get("search_space", {}))
+            for name in ("n_estimators", "iterations"):
+                if name in search_space:
+                    search_space[name] = {
+                        "type": "Integer",
+                        "low": max(1, args.max_estimators // 2),
+                        "high": args.max_estimators,
+                    }
+            model_config["search_space"] = search_space
+
+            start = time.perf_counter()
+            train_model(
+                X_train,
+                y_train,
+                model_config,
+                {**options, "preprocessing_cache": cache},
+                encoder,
+            )
+            elapsed = time.perf_counter() - start
+            uncached_time = uncached_time or elapsed
+            print(
+                f"{model_key:>22}{str(cache):>7}{elapsed:>12.2f}"
+                f"{uncached_time / elapsed:>9.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Benchmarks the fold-level pruning of the Bayesian search of train_model: the
+# search of every model runs with `pruning` off and on, and the fits, search
+# wall time and CV score of the best candidate are compared. n_estimators and
+# iterations are capped with `--max-estimators` to keep the run short.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_pruning.py
+#   python benchmarks/bench_pruning.py --models xgboost_config --n-iter 50 --percentile 75
+
+import argparse
+import time
+
+from common import load_parameters, load_training_data
+
+from egt309_pipeline.pipelines.model_training import search as search_module
+from egt309_pipeline.pipelines.model_training.nodes import (
+    _search_model,
+    _SearchSetup,
+)
+from egt309_pipeline.pipelines.model_training.search import BayesianSearch
+
+
+class RecordingSearch(BayesianSearch):
+    """BayesianSearch that keeps its last fitted instance, for its cv_results_."""
+
+    last = None
+
+    def fit(self, X, y):
+        RecordingSearch.last = self
+        return super().fit(X, y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models", nargs="+", default=["random_forest_config", "xgboost_config"]
+    )
+    parser.add_argument("--n-iter", type=int, default=20)
+    parser.add_argument("--percentile", type=float, default=50)
+    parser.add_argument("--max-estimators", type=int, default=100)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    parameters = load_parameters()
+    options = {
+        **parameters["parameters_model_training"],
+        "search_strategy": "bayes",
+        "bayes_search_n_iters": args.n_iter,
+    }
+    X_train, _, y_train, _, encoder = load_training_data(options, args.scale)
+    # _build_search imports the search classes when it runs
+    search_module.BayesianSearch = RecordingSearch
+
+    pruning = {
+        "percentile": args.percentile,
+        "n_startup_candidates": 5,
+        "n_warmup_folds": 1,
+    }
+    print(f"{len(X_train)} training rows, {args.n_iter} candidates")
+    print(
+        f"{'model':>22}{'pruning':>9}{'fits':>6}{'search (s)':>12}"
+        f"{'speed-up':>10}{'best score':>12}"
+    )
+    for model_key in args.models:
+        model_config = dict(parameters[model_key])
+        search_space = dict(model_config.get("search_space", {}))
+        for name in ("n_estimators", "iterations"):
+            if name in search_space:
+                search_space[name] = {
+                    "type": "Integer",
+                    "low": max(1, args.max_estimators // 10),
+                    "high": args.max_estimators,
+                }
+        model_config["search_space"] = search_space
+
+        unpruned_time = None
+        for model_pruning in (None, pruning):
+            start = time.perf_counter()
+            _search_model(
+                X_train,
+                y_train,
+                _SearchSetup(
+                    model_config, {**options, "pruning": model_pruning}, encoder
+                ),
+            )
+            elapsed = time.perf_counter() - start
+            search = RecordingSearch.last
+            unpruned_time = unpruned_time or elapsed
+            print(
+                f"{model_key:>22}{str(model_pruning is not None):>9}"
+                f"{sum(search.cv_results_['n_folds']):>6}{elapsed:>12.1f}"
+                f"{unpruned_time / elapsed:>9.2f}x{search.best_score_:>12.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
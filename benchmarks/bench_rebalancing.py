@@ -0,0 +1,58 @@
+# Benchmarks BlockedSMOTE (rebalancing.py) against imblearn's SMOTE on synthetic
+# imbalanced data (11% minority, like Subscription Status): wall time and peak
+# traced memory of one resampling, and of resampling the same fold again as every
+# Bayesian search candidate does (served from the recipe cache).
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_rebalancing.py
+#   python benchmarks/bench_rebalancing.py --rows 100000 1000000 --features 60
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from imblearn.over_sampling import SMOTE
+from sklearn.datasets import make_classification
+
+from egt309_pipeline.pipelines.model_training.rebalancing import BlockedSMOTE
+
+
+def measure(sampler, X, y) -> tuple:
+    """Wall time (s) and peak traced memory (MB) of sampler.fit_resample."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    sampler.fit_resample(X, y)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[30_000, 300_000])
+    parser.add_argument("--features", type=int, default=60)
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    args = parser.parse_args()
+
+    print(f"{'rows':>9}{'sampler':>22}{'time (s)':>10}{'peak (MB)':>11}")
+    for rows in args.rows:
+        X, y = make_classification(rows, args.features, weights=[0.89], random_state=42)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            samplers = {
+                "imblearn SMOTE": SMOTE(random_state=42),
+                "BlockedSMOTE": BlockedSMOTE(random_state=42, n_jobs=args.n_jobs),
+                "BlockedSMOTE (cached)": BlockedSMOTE(
+                    random_state=42, n_jobs=args.n_jobs, cache_dir=cache_dir
+                ),
+            }
+            # Fills the cache, as the first candidate fitted on a fold does
+            samplers["BlockedSMOTE (cached)"].fit_resample(X, y)
+            for name, sampler in samplers.items():
+                elapsed, peak = measure(sampler, X, y)
+                print(f"{rows:>9}{name:>22}{elapsed:>10.3f}{peak:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
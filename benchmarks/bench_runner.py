@@ -0,0 +1,70 @@
+# Benchmarks the SharedMemoryRunner on the model training & evaluation
+# pipelines: they run with the SequentialRunner, the ParallelRunner and the
+# SharedMemoryRunner (with the node costs of parameters_runner, within
+# --cores cores), on an in-memory catalog holding the cleaned dataset, and the
+# run wall time and peak memory of the process tree (proportional set size,
+# see bench_shared_data.py) are compared. Every model of the registry with
+# train_now is trained, with the configured parameters.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_runner.py
+#   python benchmarks/bench_runner.py --cores 8 --scale 4
+
+import argparse
+import time
+
+from bench_shared_data import PeakMemory
+from common import load_parameters, load_scaled_bmarket
+from kedro.io import DataCatalog, SharedMemoryDataCatalog
+from kedro.runner import ParallelRunner, SequentialRunner
+
+from egt309_pipeline.pipelines.data_preparation.nodes import clean_bmarket_fused
+from egt309_pipeline.pipelines.model_evaluation import (
+    create_pipeline as create_evaluation_pipeline,
+)
+from egt309_pipeline.pipelines.model_training import (
+    create_pipeline as create_training_pipeline,
+)
+from egt309_pipeline.runner import SharedMemoryRunner
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cores", type=int, default=4)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    parameters = load_parameters()
+    cleaned = clean_bmarket_fused(load_scaled_bmarket(args.scale))
+    pipeline = create_training_pipeline() + create_evaluation_pipeline()
+
+    runner_config = {
+        **(parameters.get("parameters_runner") or {}),
+        "total_cores": args.cores,
+    }
+    runners = {
+        "SequentialRunner": lambda: SequentialRunner(),
+        "ParallelRunner": lambda: ParallelRunner(max_workers=args.cores),
+        "SharedMemoryRunner": lambda: SharedMemoryRunner(config=runner_config),
+    }
+    print(f"{len(cleaned)} rows, {len(pipeline.nodes)} nodes, {args.cores} cores")
+    print(f"{'runner':>20}{'run (s)':>10}{'peak PSS (MiB)':>16}")
+    for name, runner in runners.items():
+        parallel = name != "SequentialRunner"
+        catalog = SharedMemoryDataCatalog() if parallel else DataCatalog()
+        catalog["cleaned_bmarket"] = cleaned
+        for key, value in parameters.items():
+            catalog[f"params:{key}"] = value
+
+        peak = PeakMemory()
+        peak.start()
+        start = time.perf_counter()
+        runner().run(pipeline, catalog)
+        elapsed = time.perf_counter() - start
+        peak.stopped.set()
+        peak.join()
+        print(f"{name:>20}{elapsed:>10.1f}{peak.peak / 2**20:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+# Benchmarks the persisted search history of train_model: the Bayesian search of
+# every model runs cold (empty history), then resumes after an interruption (a
+# history of `--interrupted-at` candidates), then runs again with the complete
+# history, and the wall time of each is compared.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_search_history.py
+#   python benchmarks/bench_search_history.py --models random_forest_config --n-iter 20 --interrupted-at 15
+
+import argparse
+import tempfile
+import time
+
+from common import load_parameters, load_training_data
+
+from egt309_pipeline.pipelines.model_training.nodes import train_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models", nargs="+", default=["random_forest_config", "xgboost_config"]
+    )
+    parser.add_argument("--n-iter", type=int, default=10)
+    parser.add_argument("--interrupted-at", type=int, default=7)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    parameters = load_parameters()
+    options = {**parameters["parameters_model_training"], "search_strategy": "bayes"}
+    X_train, _, y_train, _, encoder = load_training_data(options, args.scale)
+
+    print(f"{len(X_train)} training rows, {args.n_iter} candidates")
+    print(f"{'model':>22}{'run':>26}{'train (s)':>11}{'speed-up':>10}")
+    for model_key in args.models:
+        with (
+            tempfile.TemporaryDirectory() as cold,
+            tempfile.TemporaryDirectory() as warm,
+        ):
+            runs = (
+                ("cold", cold, args.n_iter),
+                (f"interrupted at {args.interrupted_at}", warm, args.interrupted_at),
+                ("resumed", warm, args.n_iter),
+                ("complete history", warm, args.n_iter),
+            )
+            cold_time = None
+            for run, history, n_iter in runs:
+                start = time.perf_counter()
+                train_model(
+                    X_train,
+                    y_train,
+                    dict(parameters[model_key]),
+                    {
+                        **options,
+                        "bayes_search_n_iters": n_iter,
+                        "search_history": history,
+                    },
+                    encoder,
+                )
+                elapsed = time.perf_counter() - start
+                cold_time = cold_time or elapsed
+                print(
+                    f"{model_key:>22}{run:>26}{elapsed:>11.1f}"
+                    f"{cold_time / elapsed:>9.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
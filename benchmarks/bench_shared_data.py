@@ -0,0 +1,134 @@
+# Benchmarks the memory-mapped training data of train_model's search workers
+# (`shared_data`): the search of a model runs with 1, 2 & 4 workers, with the
+# data copied into every fold fit and memory-mapped once, and the peak memory of
+# the whole process tree (proportional set size, which splits shared pages
+# between the processes mapping them) and the search wall time are compared.
+# Every worker count is warmed up first, so that neither run pays for starting
+# the worker processes. `--object-columns` skips compact_dtypes, leaving the
+# string columns as Python objects. Linux only (/proc/<pid>/smaps_rollup).
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_shared_data.py
+#   python benchmarks/bench_shared_data.py --model xgboost_config --workers 1 4 8 --scale 8 --n-points 2
+#   python benchmarks/bench_shared_data.py --object-columns
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from common import load_parameters, load_training_data
+
+from egt309_pipeline.pipelines.model_training.nodes import (
+    _search_model,
+    _SearchSetup,
+)
+
+
+def tree_pss(pid: int) -> int:
+    """Proportional set size (bytes) of a process and its descendants."""
+    children = {}
+    for stat in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            fields = stat.read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        children.setdefault(int(fields[1]), []).append(int(stat.parent.name))
+
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            rollup = Path(f"/proc/{current}/smaps_rollup").read_text()
+        except OSError:
+            continue
+        for line in rollup.splitlines():
+            if line.startswith("Pss:"):
+                total += int(line.split()[1]) * 1024
+    return total
+
+
+class PeakMemory(threading.Thread):
+    """Samples tree_pss of this process until stopped, keeping the peak."""
+
+    def __init__(self, interval: float = 0.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = 0
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.is_set():
+            self.peak = max(self.peak, tree_pss(os.getpid()))
+            self.stopped.wait(self.interval)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model", default="lightgbm_config")
+    parser.add_argument("--workers", nargs="+", type=int, default=[1, 2, 4])
+    parser.add_argument("--n-iter", type=int, default=4)
+    parser.add_argument("--n-points", type=int, default=1)
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--object-columns", action="store_true")
+    args = parser.parse_args()
+
+    parameters = load_parameters()
+    options = {
+        **parameters["parameters_model_training"],
+        "search_strategy": "bayes",
+        "bayes_search_n_iters": args.n_iter,
+        "batch_proposals": {"n_points": args.n_points},
+        "search_history": None,
+        "search_time_budget": None,
+    }
+    X_train, _, y_train, _, encoder = load_training_data(
+        options, args.scale, compact=not args.object_columns
+    )
+    model_config = dict(parameters[args.model])
+
+    size = X_train.memory_usage(deep=True).sum() / 2**20
+    print(f"{len(X_train)} training rows ({size:.1f} MiB), {args.model}")
+    print(f"{'workers':>8}{'shared_data':>13}{'peak PSS (MiB)':>16}{'search (s)':>12}")
+    for n_workers in args.workers:
+        cpu_budget = {"total_cores": n_workers, "search_workers": n_workers}
+        _search_model(
+            X_train,
+            y_train,
+            _SearchSetup(
+                model_config,
+                {**options, "bayes_search_n_iters": 1, "cpu_budget": cpu_budget},
+                encoder,
+            ),
+        )
+        for shared_data in (False, True):
+            run_options = {
+                **options,
+                "shared_data": shared_data,
+                "cpu_budget": cpu_budget,
+            }
+            peak = PeakMemory()
+            with tempfile.TemporaryDirectory() as cache_dir:
+                peak.start()
+                start = time.perf_counter()
+                _search_model(
+                    X_train,
+                    y_train,
+                    _SearchSetup(
+                        model_config, run_options, encoder, cache_dir=cache_dir
+                    ),
+                )
+                elapsed = time.perf_counter() - start
+                peak.stopped.set()
+                peak.join()
+            print(
+                f"{n_workers:>8}{str(shared_data):>13}"
+                f"{peak.peak / 2**20:>16.1f}{elapsed:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
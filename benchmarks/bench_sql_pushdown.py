@@ -0,0 +1,130 @@
+# Benchmarks reading bmarket with and without SQL pushdown of the column drops and
+# row filters of the data_preparation pipeline. The table is repeated `scale` times
+# into a temporary SQLite database, and every (variant, scale) pair runs in its own
+# subprocess so that peak RSS is not shared.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_sql_pushdown.py
+#   python benchmarks/bench_sql_pushdown.py --scales 1 10 --mode fused
+
+import argparse
+import json
+import resource
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from common import DB_PATH, TABLE
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.runner import SequentialRunner
+from kedro_datasets.pandas import SQLTableDataset
+
+from egt309_pipeline.datasets import SQLTableHandleDataset
+from egt309_pipeline.pipelines.data_preparation import create_pipeline
+from egt309_pipeline.pipelines.data_preparation.pipeline import _pushdown_steps
+from egt309_pipeline.pipelines.data_preparation.sql_pushdown import read_with_pushdown
+
+
+def write_scaled_db(scale: int, path: Path) -> None:
+    """Writes bank_marketing repeated `scale` times to a new SQLite database."""
+    with sqlite3.connect(DB_PATH) as con:
+        df = pd.read_sql(f"SELECT * FROM {TABLE}", con)
+    with sqlite3.connect(path) as con:
+        for _ in range(scale):
+            df.to_sql(TABLE, con, if_exists="append", index=False)
+
+
+def run_worker(variant: str, mode: str, db_path: str) -> dict:
+    """Loads the table, then runs the pipeline, with or without pushdown."""
+    credentials = {"con": f"sqlite:///{db_path}"}
+    sql_pushdown = variant == "pushdown"
+    if sql_pushdown:
+        source_name = "bmarket_table"
+        source = SQLTableHandleDataset(table_name=TABLE, credentials=credentials)
+        steps = _pushdown_steps()
+        load = lambda: read_with_pushdown(source.load(), steps)  # noqa: E731
+    else:
+        source_name = "bmarket"
+        source = SQLTableDataset(table_name=TABLE, credentials=credentials)
+        load = source.load
+
+    start = time.perf_counter()
+    loaded_rows = len(load())
+    load_time = time.perf_counter() - start
+    load_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    catalog = DataCatalog(
+        datasets={
+            source_name: source,
+            "cleaned_bmarket": MemoryDataset(copy_mode="assign"),
+        }
+    )
+    pipeline = create_pipeline(
+        execution_mode=mode,
+        sql_pushdown=sql_pushdown,
+        column_rules=[],
+        imputation_sampling="cdf",
+        cleaning_rules={},
+    )
+    start = time.perf_counter()
+    SequentialRunner().run(pipeline, catalog)
+    run_time = time.perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "variant": variant,
+        "loaded_rows": loaded_rows,
+        "rows": len(catalog.load("cleaned_bmarket")),
+        "load_time_s": round(load_time, 3),
+        "run_time_s": round(run_time, 3),
+        # ru_maxrss is reported in KiB on Linux
+        "load_rss_mib": round(load_rss / 1024, 1),
+        "peak_rss_mib": round(peak_rss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--mode", default="nodes", choices=["nodes", "fused"])
+    parser.add_argument("--worker", nargs=3, metavar=("VARIANT", "MODE", "DB"))
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(*args.worker)))
+        return
+
+    print(f"execution_mode: {args.mode}")
+    print(
+        f"{'variant':<10}{'scale':>7}{'rows read':>11}{'load (s)':>10}"
+        f"{'load RSS (MiB)':>16}{'run (s)':>9}{'peak RSS (MiB)':>16}"
+    )
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = Path(tmp) / "bmarket.db"
+            write_scaled_db(scale, db_path)
+            for variant in ("full", "pushdown"):
+                result = subprocess.run(
+                    [sys.executable, __file__, "--worker", variant, args.mode, db_path],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                )
+                if result.returncode != 0:
+                    print(f"{variant:<10}{scale:>7}  failed: {result.stderr[-200:]}")
+                    continue
+
+                r = json.loads(result.stdout.strip().splitlines()[-1])
+                print(
+                    f"{variant:<10}{scale:>7}{r['loaded_rows']:>11}"
+                    f"{r['load_time_s']:>10}{r['load_rss_mib']:>16}"
+                    f"{r['run_time_s']:>9}{r['peak_rss_mib']:>16}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# Benchmarks the startup of the project's kedro commands: `kedro registry list`
+# (settings, hooks & every pipeline built, nothing run) and
+# `kedro run --pipeline data_preparation` (the same startup, then the data
+# preparation nodes). Every command runs --repeats times in its own process;
+# the median wall time is reported, and the time Python spent importing modules
+# (summed over the top-level imports of python -X importtime, in one more run).
+#
+# `kedro run` writes the outputs of data_preparation (cleaned_bmarket, the
+# distribution imputers) like a normal run.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_startup.py
+#   python benchmarks/bench_startup.py --repeats 5 --commands "registry list"
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+COMMANDS = ("registry list", "run --pipeline data_preparation")
+
+# Top-level entries of -X importtime: "import time: self | cumulative | name"
+IMPORT_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\S.*)$")
+
+
+def run_command(command: str, importtime: bool = False) -> tuple:
+    """(wall time, import time or None) of a kedro command, in seconds."""
+    flags = ["-X", "importtime"] if importtime else []
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *flags, "-m", "kedro", *command.split()],
+        capture_output=True,
+        text=True,
+        check=False,
+        cwd=ROOT,
+    )
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"kedro {command} failed: {result.stderr[-500:]}")
+    if not importtime:
+        return elapsed, None
+
+    import_us = sum(
+        int(match.group(1))
+        for match in map(IMPORT_LINE.match, result.stderr.splitlines())
+        if match and not match.group(2).startswith(" ")
+    )
+    return elapsed, import_us / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--commands", nargs="+", default=list(COMMANDS))
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'command':>36}{'wall (s)':>10}{'imports (s)':>13}{'runs (s)':>28}")
+    for command in args.commands:
+        walls = [run_command(command)[0] for _ in range(args.repeats)]
+        # Timing the imports slows them down: they are timed in a run of their own
+        _, imports = run_command(command, importtime=True)
+        print(
+            f"{'kedro ' + command:>36}{statistics.median(walls):>10.2f}"
+            f"{imports:>13.2f}{' '.join(f'{wall:.2f}' for wall in walls):>28}"
+        )
+
+
+if __name__ == "__main__":
+    main()
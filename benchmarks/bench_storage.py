@@ -0,0 +1,122 @@
+# Benchmarks loading cleaned_bmarket and X_train from the previous catalog entries
+# (CSV & pickle) against the columnar ArrowDataset, including a 2-column projection.
+# The cleaned table is repeated `scale` times; files are written once, then every
+# (entry, format, scale) load runs in its own subprocess so the RSS it adds is measured alone.
+#
+# Usage (from the repository root, after `kedro run` wrote cleaned_bmarket):
+#   python benchmarks/bench_storage.py
+#   python benchmarks/bench_storage.py --scales 1 10 100
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+from kedro_datasets.pandas import CSVDataset
+from kedro_datasets.pickle import PickleDataset
+
+from egt309_pipeline.datasets import ArrowDataset
+from egt309_pipeline.pipelines.model_training.nodes import compact_dtypes, split_dataset
+
+ROOT = Path(__file__).resolve().parents[1]
+SOURCE = ArrowDataset(filepath=str(ROOT / "data" / "03_primary" / "cleaned_bmarket"))
+PROJECTION = ["Age", "Campaign Calls"]
+
+
+def make_datasets(directory: Path) -> dict:
+    """{(entry, format): dataset} for every entry/format pair, in directory."""
+    return {
+        ("cleaned_bmarket", "csv"): CSVDataset(
+            filepath=str(directory / "cleaned_bmarket.csv")
+        ),
+        ("cleaned_bmarket", "arrow"): ArrowDataset(
+            filepath=str(directory / "cleaned_bmarket"),
+            save_args={"preserve_index": False},
+        ),
+        ("X_train", "pickle"): PickleDataset(filepath=str(directory / "X_train.pkl")),
+        ("X_train", "arrow"): ArrowDataset(filepath=str(directory / "X_train")),
+        ("X_train", "arrow-2-cols"): ArrowDataset(
+            filepath=str(directory / "X_train"), load_args={"columns": PROJECTION}
+        ),
+    }
+
+
+def write_files(scale: int, directory: Path) -> None:
+    df = pd.concat([SOURCE.load()] * scale, ignore_index=True)
+    X_train, *_ = split_dataset(
+        compact_dtypes(df, {}), {"test_size": 0.2, "random_state": 42}
+    )
+    for (entry, fmt), dataset in make_datasets(directory).items():
+        if fmt != "arrow-2-cols":
+            dataset.save(df if entry == "cleaned_bmarket" else X_train)
+
+
+def current_rss_mib() -> float:
+    """Resident memory of this process right now (Linux), in MiB."""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+
+
+def run_worker(entry: str, fmt: str, directory: str) -> dict:
+    dataset = make_datasets(Path(directory))[(entry, fmt)]
+    baseline_rss = current_rss_mib()
+
+    start = time.perf_counter()
+    data = dataset.load()
+    load_time = time.perf_counter() - start
+
+    return {
+        "rows": len(data),
+        "columns": data.shape[1],
+        "load_time_s": round(load_time, 4),
+        # Memory-mapped pages count once they are read
+        "load_rss_mib": round(current_rss_mib() - baseline_rss, 1),
+        "in_memory_mib": round(data.memory_usage(deep=True).sum() / 2**20, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--worker", nargs=3, metavar=("ENTRY", "FORMAT", "DIR"))
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(*args.worker)))
+        return
+
+    print(
+        f"{'entry':<17}{'format':<14}{'scale':>6}{'rows':>10}{'cols':>6}"
+        f"{'load (s)':>10}{'load RSS (MiB)':>16}{'in memory (MiB)':>17}"
+    )
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            write_files(scale, Path(tmp))
+            for entry, fmt in make_datasets(Path(tmp)):
+                result = subprocess.run(
+                    [sys.executable, __file__, "--worker", entry, fmt, tmp],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                )
+                if result.returncode != 0:
+                    print(
+                        f"{entry:<17}{fmt:<14}{scale:>6}  failed: {result.stderr[-200:]}"
+                    )
+                    continue
+
+                r = json.loads(result.stdout.strip().splitlines()[-1])
+                print(
+                    f"{entry:<17}{fmt:<14}{scale:>6}{r['rows']:>10}{r['columns']:>6}"
+                    f"{r['load_time_s']:>10}{r['load_rss_mib']:>16}"
+                    f"{r['in_memory_mib']:>17}"
+                )
+
+
+if __name__ == "__main__":
+    main()
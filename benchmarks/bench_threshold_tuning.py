@@ -0,0 +1,73 @@
+# Benchmarks the recall threshold tuning of train_model (RecallOptimizedClassifier)
+# with the out-of-fold predictions stored during the Bayesian search against
+# fitting the best candidate on every fold again (cross_val_predict), and checks
+# that both give the same threshold.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_threshold_tuning.py
+#   python benchmarks/bench_threshold_tuning.py --models xgboost_config --scale 2
+
+import argparse
+import tempfile
+import time
+
+from common import load_parameters, load_training_data
+
+from egt309_pipeline.pipelines.model_training.nodes import (
+    RecallOptimizedClassifier,
+    _search_model,
+    _SearchSetup,
+)
+from egt309_pipeline.pipelines.model_training.out_of_fold import load_out_of_fold
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models", nargs="+", default=["random_forest_config", "xgboost_config"]
+    )
+    parser.add_argument("--scale", type=int, default=1)
+    parser.add_argument("--n-iter", type=int, default=3)
+    args = parser.parse_args()
+
+    parameters = load_parameters()
+    options = {
+        **parameters["parameters_model_training"],
+        "bayes_search_n_iters": args.n_iter,
+    }
+    X_train, _, y_train, _, encoder = load_training_data(options, args.scale)
+
+    print(f"{'model':>22}{'tuning':>19}{'time (s)':>10}{'threshold':>11}")
+    for model_key in args.models:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            model, best_params = _search_model(
+                X_train,
+                y_train,
+                _SearchSetup(
+                    dict(parameters[model_key]), options, encoder, cache_dir=cache_dir
+                ),
+            )
+            start = time.perf_counter()
+            y_proba = load_out_of_fold(cache_dir, best_params, X_train.index)
+            stored = RecallOptimizedClassifier(
+                model.base_estimator, model.cv, model.min_recall
+            ).fit(X_train, y_train, y_proba=y_proba)
+            stored_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        refit = RecallOptimizedClassifier(
+            model.base_estimator, model.cv, model.min_recall
+        ).fit(X_train, y_train)
+        refit_time = time.perf_counter() - start
+
+        for tuning, elapsed, tuned in (
+            ("cross_val_predict", refit_time, refit),
+            ("stored OOF", stored_time, stored),
+        ):
+            print(
+                f"{model_key:>22}{tuning:>19}{elapsed:>10.3f}{tuned.threshold_:>11.4f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
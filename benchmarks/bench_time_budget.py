@@ -0,0 +1,90 @@
+# Benchmarks the cost-aware Bayesian search of train_model: the search of every
+# model runs with the default acquisition function (gp_hedge) and with EI per
+# second (EIps), without and with a search_time_budget, and the candidates
+# evaluated, their mean fold fit time, the search wall time and the CV score of
+# the best candidate are compared.
+#
+# Usage (from the repository root):
+#   python benchmarks/bench_time_budget.py
+#   python benchmarks/bench_time_budget.py --models random_forest_config --n-iter 50 --time-budget 120
+
+import argparse
+import time
+
+import numpy as np
+from common import load_parameters, load_training_data
+
+from egt309_pipeline.pipelines.model_training import search as search_module
+from egt309_pipeline.pipelines.model_training.nodes import (
+    _search_model,
+    _SearchSetup,
+)
+from egt309_pipeline.pipelines.model_training.search import BayesianSearch
+
+
+class RecordingSearch(BayesianSearch):
+    """BayesianSearch that keeps its last fitted instance, for its cv_results_."""
+
+    last = None
+
+    def fit(self, X, y):
+        RecordingSearch.last = self
+        return super().fit(X, y)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models", nargs="+", default=["random_forest_config", "xgboost_config"]
+    )
+    parser.add_argument("--n-iter", type=int, default=20)
+    parser.add_argument("--time-budget", type=float, default=60)
+    parser.add_argument("--scale", type=int, default=1)
+    args = parser.parse_args()
+
+    parameters = load_parameters()
+    options = {
+        **parameters["parameters_model_training"],
+        "search_strategy": "bayes",
+        "bayes_search_n_iters": args.n_iter,
+        "search_history": None,
+    }
+    X_train, _, y_train, _, encoder = load_training_data(options, args.scale)
+    # _build_search imports the search classes when it runs
+    search_module.BayesianSearch = RecordingSearch
+
+    print(f"{len(X_train)} training rows, at most {args.n_iter} candidates")
+    print(
+        f"{'model':>22}{'acq_func':>10}{'budget (s)':>12}{'candidates':>12}"
+        f"{'fit (s)':>9}{'search (s)':>12}{'best score':>12}"
+    )
+    for model_key in args.models:
+        model_config = dict(parameters[model_key])
+        for time_budget in (None, args.time_budget):
+            for acq_func in ("gp_hedge", "EIps"):
+                start = time.perf_counter()
+                _search_model(
+                    X_train,
+                    y_train,
+                    _SearchSetup(
+                        model_config,
+                        {
+                            **options,
+                            "bayes_acq_func": acq_func,
+                            "search_time_budget": time_budget,
+                        },
+                        encoder,
+                    ),
+                )
+                elapsed = time.perf_counter() - start
+                search = RecordingSearch.last
+                print(
+                    f"{model_key:>22}{acq_func:>10}{str(time_budget):>12}"
+                    f"{len(search.cv_results_['params']):>12}"
+                    f"{np.mean(search.cv_results_['mean_fit_time']):>9.2f}"
+                    f"{elapsed:>12.1f}{search.best_score_:>12.4f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
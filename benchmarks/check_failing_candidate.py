@@ -0,0 +1,78 @@
+# Checks that a hyperparameter search survives candidates whose fit raises: the
+# searches of train_model (Bayesian, with and without pruning and batch
+# proposals, and successive halving) tune a LogisticRegression whose "l1"
+# candidates fail with the lbfgs solver. Every search must finish, rank the
+# failed candidates last and select an "l2" candidate; a search where every
+# candidate fails must raise the "No candidate ... finished" error.
+#
+# Usage (from the repository root):
+#   python benchmarks/check_failing_candidate.py
+
+import argparse
+import warnings
+
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from skopt.space import Categorical, Real
+
+from egt309_pipeline.pipelines.model_training.search import (
+    BayesianSearch,
+    SuccessiveHalvingSearch,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n-iter", type=int, default=12)
+    args = parser.parse_args()
+
+    warnings.filterwarnings("ignore")
+    X, y = make_classification(n_samples=1000, random_state=42)
+    space = {
+        "C": Real(1e-3, 10, prior="log-uniform"),
+        "penalty": Categorical(["l1", "l2"]),
+    }
+    model = LogisticRegression(solver="lbfgs")
+    common = {"cv": 3, "scoring": "roc_auc", "random_state": 42}
+    searches = {
+        "bayes": BayesianSearch(model, space, n_iter=args.n_iter, **common),
+        "bayes, pruning": BayesianSearch(
+            model,
+            space,
+            n_iter=args.n_iter,
+            pruning={"n_startup_candidates": 1},
+            **common,
+        ),
+        "bayes, 2 points": BayesianSearch(
+            model, space, n_iter=args.n_iter, n_points=2, n_jobs=2, **common
+        ),
+        "halving": SuccessiveHalvingSearch(model, space, n_candidates=9, **common),
+    }
+
+    print(f"{'search':>16}{'candidates':>12}{'failed':>8}{'best penalty':>14}")
+    for name, search in searches.items():
+        search.fit(X, y)
+        scores = np.asarray(search.cv_results_["mean_test_score"])
+        n_failed = int(np.isnan(scores).sum())
+        print(
+            f"{name:>16}{len(scores):>12}{n_failed:>8}"
+            f"{search.best_params_['penalty']:>14}"
+        )
+        assert n_failed > 0, f"{name}: no candidate failed"
+        assert search.best_params_["penalty"] == "l2", f"{name}: failed best"
+
+    failing = BayesianSearch(
+        model, {"penalty": Categorical(["l1"])}, n_iter=3, **common
+    )
+    try:
+        failing.fit(X, y)
+    except ValueError as error:
+        assert "No candidate" in str(error), error
+        print(f"every candidate failed: {error}")
+    else:
+        raise AssertionError("a search without any finished candidate succeeded")
+
+
+if __name__ == "__main__":
+    main()
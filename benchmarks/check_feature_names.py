@@ -0,0 +1,98 @@
+# Checks that every model of the registry is fitted on the column names: each
+# model is trained by train_model (with the configured options, the preprocessing
+# cache included, on `--rows` rows of X_train and with its rounds capped) in a
+# new process, as the first model of its process like under `kedro run`, and its
+# refit estimator (the last step of the Pipeline) must have the columns of the
+# preprocessor's output as feature names (feature_names_in_, or CatBoost's
+# feature_names_; LightGBM replaces their spaces with "_"). Otherwise predicting
+# from a DataFrame warns "X has feature names, but ... was fitted without feature
+# names".
+#
+# Usage (from the repository root):
+#   python benchmarks/check_feature_names.py
+#   python benchmarks/check_feature_names.py --models adaboost catboost --rows 5000
+
+import argparse
+import json
+import subprocess
+import sys
+import warnings
+
+from common import ROOT, load_parameters, load_training_data
+
+from egt309_pipeline.pipelines.model_training.nodes import train_model
+
+
+def run_worker(name: str, rows: int) -> dict:
+    """Trains one model of the registry, returns the feature names of its refit."""
+    warnings.filterwarnings("ignore")
+    parameters = load_parameters()
+    options = {
+        **parameters["parameters_model_training"],
+        "bayes_search_n_iters": 2,
+        "search_history": None,
+    }
+    X_train, _, y_train, _, encoder = load_training_data(options)
+    X_train, y_train = X_train.iloc[:rows], y_train.iloc[:rows]
+
+    config = parameters["model_registry_config"][name]
+    model_config = dict(parameters[config["model_config_key"]])
+    search_space = dict(model_config.get("search_space", {}))
+    for rounds in ("n_estimators", "iterations"):
+        if rounds in search_space:
+            search_space[rounds] = {"type": "Integer", "low": 5, "high": 10}
+    model_config["search_space"] = search_space
+
+    model, _ = train_model(
+        X_train, y_train, model_config, options, encoder, config.get("rebalancing")
+    )
+    pipeline = model.base_estimator
+    estimator = pipeline.steps[-1][1]
+    columns = pipeline[:-1].transform(X_train.head()).columns
+    names = getattr(estimator, "feature_names_in_", None)
+    if names is None:
+        names = getattr(estimator, "feature_names_", None) or []
+    return {
+        "estimator": type(estimator).__name__,
+        "feature_names": [name.replace(" ", "_") for name in names],
+        "columns": [column.replace(" ", "_") for column in columns],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--models", nargs="+")
+    parser.add_argument("--rows", type=int, default=3000)
+    parser.add_argument("--worker", metavar="MODEL")
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(args.worker, args.rows)))
+        return
+
+    models = args.models or list(load_parameters()["model_registry_config"])
+    print(f"{'model':>15}{'estimator':>24}{'feature names':>15}")
+    failed = []
+    for name in models:
+        result = subprocess.run(
+            [sys.executable, __file__, "--worker", name, "--rows", str(args.rows)],
+            capture_output=True,
+            text=True,
+            check=False,
+            cwd=ROOT,
+        )
+        if result.returncode != 0:
+            print(f"{name:>15}  failed: {result.stderr[-300:]}")
+            failed.append(name)
+            continue
+
+        r = json.loads(result.stdout.strip().splitlines()[-1])
+        ok = r["feature_names"] == r["columns"]
+        print(f"{name:>15}{r['estimator']:>24}{str(ok):>15}")
+        if not ok:
+            failed.append(name)
+    assert not failed, f"fitted without the column names: {failed}"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Checks that the models loaded by ModelArtifactDataset are fitted estimators of
+# their own classes: every model of the registry is fitted (as bench_model_artifact
+# does, with --n-estimators rounds), saved as an artifact and loaded, lazily and
+# not. The loaded model and its Pipeline must pass sklearn's check_is_fitted
+# without a "not fitted" warning, every step must be of the class of the saved
+# step, and the loaded model must predict the probabilities of the saved one.
+#
+# Usage (from the repository root):
+#   python benchmarks/check_model_artifact.py
+#   python benchmarks/check_model_artifact.py --models catboost xgboost
+
+import argparse
+import tempfile
+import warnings
+from pathlib import Path
+
+import numpy as np
+from bench_model_artifact import fit_model, load_split
+from common import load_parameters
+from sklearn.exceptions import NotFittedError
+from sklearn.utils.validation import check_is_fitted
+
+from egt309_pipeline.datasets import ModelArtifactDataset
+
+
+def check_loaded(saved, loaded, X_test) -> list:
+    """Problems of a loaded model, compared with the model it was saved from."""
+    problems = []
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        for estimator in (loaded, loaded.base_estimator):
+            try:
+                check_is_fitted(estimator)
+            except NotFittedError as error:
+                problems.append(f"NotFittedError: {error}")
+    # e.g. "This Pipeline instance is not fitted yet" (a FutureWarning in
+    # scikit-learn 1.7); other warnings (CatBoost's missing sklearn tags) are not
+    # about the artifact
+    problems += [str(w.message) for w in caught if "not fitted" in str(w.message)]
+    for (name, step), (_, loaded_step) in zip(
+        saved.base_estimator.steps, loaded.base_estimator.steps
+    ):
+        if type(loaded_step) is not type(step):
+            problems.append(f"step {name} is a {type(loaded_step).__name__}")
+    if not np.allclose(saved.predict_proba(X_test), loaded.predict_proba(X_test)):
+        problems.append("different probabilities")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        default=["xgboost", "lightgbm", "catboost", "random_forest", "adaboost"],
+    )
+    parser.add_argument("--n-estimators", type=int, default=20)
+    args = parser.parse_args()
+
+    parameters = load_parameters()
+    registry = parameters["model_registry_config"]
+
+    print(f"{'model':>15}{'lazy':>7}  problems")
+    failed = []
+    for name in args.models:
+        model_config = parameters[registry[name]["model_config_key"]]
+        with tempfile.TemporaryDirectory() as tmp:
+            directory = Path(tmp)
+            X_train, y_train = load_split(directory)
+            X_test = X_train.head(1000)
+            model = fit_model(name, model_config, args.n_estimators, X_train, y_train)
+            ModelArtifactDataset(filepath=str(directory / "model")).save(model)
+
+            for lazy in (True, False):
+                dataset = ModelArtifactDataset(
+                    filepath=str(directory / "model"), load_args={"lazy": lazy}
+                )
+                problems = check_loaded(model, dataset.load(), X_test)
+                print(f"{name:>15}{str(lazy):>7}  {'; '.join(problems) or '-'}")
+                if problems:
+                    failed.append(f"{name} (lazy={lazy})")
+    assert not failed, f"loaded models with problems: {failed}"
+
+
+if __name__ == "__main__":
+    main()
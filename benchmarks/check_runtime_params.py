@@ -0,0 +1,102 @@
+# Checks that the options read when the pipelines are built follow the runtime
+# params of the session (`kedro run --params ...`): for every case, a Kedro
+# session is created with the case's runtime params in a new process (the
+# project's pipelines are built once per process), its context is loaded and the
+# default pipeline is built, as `kedro run` does. The pipeline must have (and not
+# have) the case's nodes, and the SharedMemoryRunner must read the case's
+# parameters_runner.
+#
+# Usage (from the repository root):
+#   python benchmarks/check_runtime_params.py
+
+import argparse
+import json
+import subprocess
+import sys
+
+from common import ROOT
+
+# (runtime params, node in the pipeline, node not in the pipeline)
+CASES = [
+    ({}, "clean_clientID_node", "clean_bmarket_fused_node"),
+    (
+        {"parameters_data_preparation": {"execution_mode": "fused"}},
+        "clean_bmarket_fused_node",
+        "clean_clientID_node",
+    ),
+    (
+        {"parameters_data_preparation": {"sql_pushdown": True}},
+        "read_bmarket_pushdown_node",
+        "clean_clientID_node",
+    ),
+    ({}, "compact_dtypes_node", None),
+    (
+        {"parameters_model_training": {"compact_dtypes": False}},
+        "split_dataset_node",
+        "compact_dtypes_node",
+    ),
+]
+RUNNER_CORES = 3
+
+
+def run_worker(runtime_params: dict) -> dict:
+    """Builds the default pipeline in a session, returns its nodes & runner config."""
+    from kedro.framework.project import pipelines  # noqa: PLC0415
+    from kedro.framework.session import KedroSession  # noqa: PLC0415
+    from kedro.framework.startup import bootstrap_project  # noqa: PLC0415
+
+    from egt309_pipeline.runner import _load_runner_config  # noqa: PLC0415
+
+    bootstrap_project(ROOT)
+    with KedroSession.create(
+        project_path=ROOT, runtime_params=runtime_params
+    ) as session:
+        session.load_context()
+        nodes = [node.name.split(".")[-1] for node in pipelines["__default__"].nodes]
+        return {"nodes": nodes, "runner": _load_runner_config()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--worker", metavar="RUNTIME_PARAMS")
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_worker(json.loads(args.worker))))
+        return
+
+    print(f"{'runtime params':>60}  problems")
+    failed = []
+    for params, present, absent in CASES:
+        runtime_params = {
+            **params,
+            "parameters_runner": {"total_cores": RUNNER_CORES},
+        }
+        result = subprocess.run(
+            [sys.executable, __file__, "--worker", json.dumps(runtime_params)],
+            capture_output=True,
+            text=True,
+            check=False,
+            cwd=ROOT,
+        )
+        if result.returncode != 0:
+            problems = [f"failed: {result.stderr[-300:]}"]
+        else:
+            r = json.loads(result.stdout.strip().splitlines()[-1])
+            problems = []
+            if present not in r["nodes"]:
+                problems.append(f"no {present}")
+            if absent in r["nodes"]:
+                problems.append(f"has {absent}")
+            if r["runner"].get("total_cores") != RUNNER_CORES:
+                problems.append(f"runner total_cores {r['runner'].get('total_cores')}")
+
+        case = json.dumps(runtime_params, separators=(",", ":"))
+        print(f"{case[-60:]:>60}  {'; '.join(problems) or '-'}")
+        if problems:
+            failed.append(case)
+    assert not failed, f"runtime params not followed: {failed}"
+
+
+if __name__ == "__main__":
+    main()
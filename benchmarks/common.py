@@ -0,0 +1,51 @@
+# Data shared by the benchmarks: the project's parameters and bank_marketing,
+# repeated `scale` times, cleaned and split the way the pipelines do it. The
+# benchmarks are run from the repository root, which puts this directory on
+# sys.path (e.g. `from common import load_training_data`).
+
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+from kedro.framework.startup import bootstrap_project
+
+from egt309_pipeline.config import project_parameters
+from egt309_pipeline.pipelines.data_preparation.nodes import clean_bmarket_fused
+from egt309_pipeline.pipelines.model_training.nodes import (
+    compact_dtypes,
+    fit_encoder,
+    split_dataset,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+DB_PATH = ROOT / "data" / "01_raw" / "bmarket.db"
+TABLE = "bank_marketing"
+
+
+def load_parameters() -> dict:
+    """Parameters of the project (model registry included), parsed once per process."""
+    # Project settings (config patterns of the model registry, hooks)
+    bootstrap_project(ROOT)
+    return project_parameters()
+
+
+def load_scaled_bmarket(scale: int = 1) -> pd.DataFrame:
+    """Loads bank_marketing and repeats it `scale` times."""
+    with sqlite3.connect(DB_PATH) as con:
+        df = pd.read_sql(f"SELECT * FROM {TABLE}", con)
+    return pd.concat([df] * scale, ignore_index=True)
+
+
+def load_training_data(options: dict, scale: int = 1, compact: bool = True) -> tuple:
+    """
+    Cleans bank_marketing (repeated `scale` times), splits it like
+    split_dataset and fits the categorical encoder on X_train.
+
+    `compact=False` skips compact_dtypes, leaving the object columns. Returns
+    (X_train, X_test, y_train, y_test, encoder).
+    """
+    df = clean_bmarket_fused(load_scaled_bmarket(scale))
+    if compact:
+        df = compact_dtypes(df, options)
+    X_train, X_test, y_train, y_test = split_dataset(df, options)
+    return X_train, X_test, y_train, y_test, fit_encoder(X_train)
@@ -0,0 +1,66 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import json
+from functools import cache
+from pathlib import Path
+
+from kedro.config import (
+    OmegaConfigLoader,  # Docs: https://docs.kedro.org/en/stable/api/kedro.config.OmegaConfigLoader.html
+)
+from kedro.framework.project import settings
+
+# Parameters of the running Kedro session, set by SessionParametersHook once the
+# session's context is created (before the pipelines are built)
+_session = {}
+
+
+def project_parameters() -> dict:
+    """
+    Parameters of the project's configuration (the model registry included),
+    shared by every create_pipeline and the SharedMemoryRunner instead of each
+    parsing every YAML file again.
+
+    Within a Kedro session (e.g. `kedro run`), the parameters of the session's
+    context: those of its environment (--env) with its runtime params (--params)
+    applied, the same values as the nodes' params: inputs. Outside a session
+    (e.g. the benchmarks), those of conf/base & conf/local, parsed once per
+    process.
+
+    The dict is shared: read it, do not modify it.
+
+    Returns
+    -------
+    dict
+        Parameters by top-level key, e.g. parameters["model_registry_config"]
+    """
+    if "parameters" in _session:
+        return _session["parameters"]
+    # The settings are part of the key: they change once a project is
+    # bootstrapped (e.g. the model_registry_config* pattern)
+    return _load_parameters(
+        str(Path.cwd() / settings.CONF_SOURCE),
+        json.dumps(settings.CONFIG_LOADER_ARGS, sort_keys=True, default=str),
+    )
+
+
+@cache
+def _load_parameters(conf_source: str, settings_key: str) -> dict:
+    # settings_key (the settings, serialized) only keys the cache
+    conf_loader = OmegaConfigLoader(
+        conf_source=conf_source, **settings.CONFIG_LOADER_ARGS
+    )
+    return conf_loader["parameters"]
+
+
+def use_session_parameters(parameters: dict):
+    """
+    Makes project_parameters return the parameters of a Kedro session's context
+    (see SessionParametersHook), for the rest of the process.
+
+    Parameters
+    ----------
+    parameters: dict
+        The context's params (conf of its env, runtime params applied)
+    """
+    _session["parameters"] = parameters
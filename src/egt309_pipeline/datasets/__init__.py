@@ -0,0 +1,21 @@
+"""Custom Kedro datasets used by the project's catalog."""
+
+from .arrow_dataset import ArrowDataset
+from .chunked_csv_dataset import ChunkedCSVDataset
+from .chunked_sql_dataset import ChunkedSQLTableDataset, SQLTableChunks
+from .incremental_sql_dataset import IncrementalSQLTableDataset, SQLTableIncrement
+from .model_artifact_dataset import LazyPart, ModelArtifactDataset
+from .sql_table_handle_dataset import SQLTableHandle, SQLTableHandleDataset
+
+__all__ = [
+    "ArrowDataset",
+    "ChunkedCSVDataset",
+    "ChunkedSQLTableDataset",
+    "IncrementalSQLTableDataset",
+    "LazyPart",
+    "ModelArtifactDataset",
+    "SQLTableChunks",
+    "SQLTableHandle",
+    "SQLTableHandleDataset",
+    "SQLTableIncrement",
+]
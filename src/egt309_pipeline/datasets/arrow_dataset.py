@@ -0,0 +1,175 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import json
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+from kedro.io.core import AbstractDataset, DatasetError
+
+# Schema metadata key marking data that was saved from a pd.Series
+_SERIES_KEY = b"egt309_series"
+
+
+class ArrowDataset(AbstractDataset[pd.DataFrame | pd.Series, pd.DataFrame | pd.Series]):
+    """
+    Columnar storage for pandas DataFrames and Series in Arrow IPC (Feather v2) files.
+
+    Files are uncompressed by default and read through a memory map, so numeric
+    columns are loaded zero-copy (they are read-only views of the file) and only the
+    columns asked for in load_args['columns'] are read from disk. pandas dtypes are
+    kept, including 'category' and downcast widths (int8, float32...), and Series
+    are loaded back as Series.
+
+    The dataset is a directory of part files, and loading reads all parts as one
+    frame. Saving a DataFrame or Series always replaces every part with a single
+    one. Saving a dict of {name: DataFrame} instead adds each frame as
+    part-<name>.arrow and keeps the existing parts: a generator node streams its
+    chunks by yielding the first one as a frame and the next ones as dicts, and
+    incremental updates add their new rows the same way. Names should sort after
+    the parts already there, as parts load in name order. The directory belongs to
+    the dataset: replacing the parts also deletes any other file in it (e.g. a
+    checkpoint describing the previous parts).
+
+    Parameters
+    ----------
+    filepath: str
+        Directory holding the part files
+
+    load_args: dict, optional
+        'columns': list of columns to load (default: all)
+        'memory_map': bool, read through a memory map (default: True)
+
+    save_args: dict, optional
+        'compression': None (default), "lz4" or "zstd"; compressed files cannot
+        be loaded zero-copy
+        'preserve_index': passed to pyarrow.Table.from_pandas (default: None, stores
+        the index unless it is a RangeIndex)
+
+    Example (catalog.yml)
+    ---------------------
+        X_train:
+          type: egt309_pipeline.datasets.ArrowDataset
+          filepath: data/05_model_input/X_train
+          load_args:
+            columns: [Age, Occupation]
+    """
+
+    DEFAULT_LOAD_ARGS: dict[str, Any] = {"columns": None, "memory_map": True}
+    DEFAULT_SAVE_ARGS: dict[str, Any] = {"compression": None, "preserve_index": None}
+
+    def __init__(
+        self,
+        *,
+        filepath: str,
+        load_args: dict[str, Any] = None,
+        save_args: dict[str, Any] = None,
+        metadata: dict[str, Any] = None,
+    ):
+        self._filepath = PurePosixPath(filepath)
+        self._load_args = {**self.DEFAULT_LOAD_ARGS, **(load_args or {})}
+        self._save_args = {**self.DEFAULT_SAVE_ARGS, **(save_args or {})}
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {
+            "filepath": self._filepath,
+            "load_args": self._load_args,
+            "save_args": self._save_args,
+        }
+
+    def _parts(self) -> list[Path]:
+        return sorted(Path(self._filepath).glob("part-*.arrow"))
+
+    def _exists(self) -> bool:
+        return bool(self._parts())
+
+    def load(self) -> pd.DataFrame | pd.Series:
+        parts = self._parts()
+        if not parts:
+            raise DatasetError(f"No Arrow part files found in '{self._filepath}'")
+
+        tables = [self._read_part(part) for part in parts]
+        table = pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+        if len(tables) > 1:
+            table = table.replace_schema_metadata(_concat_metadata(tables))
+
+        # split_blocks lets pandas keep each column as its own (zero-copy) array
+        data = table.to_pandas(split_blocks=True)
+        if (table.schema.metadata or {}).get(_SERIES_KEY):
+            return data.iloc[:, 0]
+        return data
+
+    def _read_part(self, part: Path) -> pa.Table:
+        if self._load_args["memory_map"]:
+            source = pa.memory_map(str(part), "r")
+        else:
+            source = pa.OSFile(str(part), "r")
+        table = pa.ipc.open_file(source).read_all()
+
+        columns = self._load_args["columns"]
+        if columns is None:
+            return table
+
+        # Unread columns are never paged in from the memory map
+        index_columns = [
+            col
+            for col in (table.schema.pandas_metadata or {}).get("index_columns", [])
+            if isinstance(col, str)
+        ]
+        missing = set(columns) - set(table.column_names)
+        if missing:
+            raise DatasetError(f"Columns {sorted(missing)} not in '{self._filepath}'")
+        return table.select([*columns, *index_columns])
+
+    def save(
+        self, data: pd.DataFrame | pd.Series | dict[str, pd.DataFrame | pd.Series]
+    ) -> None:
+        directory = Path(self._filepath)
+        if isinstance(data, dict):
+            directory.mkdir(parents=True, exist_ok=True)
+            for name, part_data in data.items():
+                self._write_part(part_data, directory / f"part-{name}.arrow")
+            return
+
+        # Old files are unlinked, not truncated, so memory maps of them that are
+        # still open stay valid
+        if directory.is_dir():
+            for file in directory.iterdir():
+                if file.is_file():
+                    file.unlink()
+        directory.mkdir(parents=True, exist_ok=True)
+        self._write_part(data, directory / "part-00000.arrow")
+
+    def _write_part(self, data: pd.DataFrame | pd.Series, part: Path) -> None:
+        is_series = isinstance(data, pd.Series)
+        frame = data.to_frame() if is_series else data
+        table = pa.Table.from_pandas(
+            frame, preserve_index=self._save_args["preserve_index"]
+        )
+        if is_series:
+            table = table.replace_schema_metadata(
+                {**table.schema.metadata, _SERIES_KEY: b"1"}
+            )
+
+        options = pa.ipc.IpcWriteOptions(compression=self._save_args["compression"])
+        with pa.OSFile(str(part), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+
+
+def _concat_metadata(tables: list[pa.Table]) -> dict:
+    """
+    Schema metadata for the concatenation of several parts: the first part's,
+    with a RangeIndex (stored as metadata only, per part) reset to a default one
+    """
+    metadata = dict(tables[0].schema.metadata or {})
+    pandas_metadata = tables[0].schema.pandas_metadata
+    if pandas_metadata and any(
+        not isinstance(col, str) for col in pandas_metadata["index_columns"]
+    ):
+        pandas_metadata["index_columns"] = []
+        metadata[b"pandas"] = json.dumps(pandas_metadata).encode()
+    return metadata
@@ -0,0 +1,33 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import pandas as pd
+from kedro.io.core import get_filepath_str
+from kedro_datasets.pandas import CSVDataset
+
+
+class ChunkedCSVDataset(CSVDataset):
+    """
+    CSVDataset that can be written incrementally.
+
+    Saving a DataFrame always overwrites the file (with the header row), like
+    pandas.CSVDataset. Saving a dict of {name: DataFrame} appends the rows of every
+    frame, in order and without a header, so a generator node can stream its output
+    to a single CSV file by yielding the first chunk as a frame and the next ones as
+    dicts (like ArrowDataset). Loading behaves exactly like pandas.CSVDataset.
+    """
+
+    def save(self, data: pd.DataFrame | dict[str, pd.DataFrame]) -> None:
+        if not isinstance(data, dict):
+            super().save(data)
+            return
+
+        save_path = get_filepath_str(self._get_save_path(), self._protocol)
+        save_args = {**self._save_args, "header": False}
+        with self._fs.open(
+            save_path, **{**self._fs_open_args_save, "mode": "a"}
+        ) as fs_file:
+            for chunk in data.values():
+                chunk.to_csv(path_or_buf=fs_file, **save_args)
+
+        self._invalidate_cache()
@@ -0,0 +1,83 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+from collections.abc import Iterator
+from typing import Any
+
+import pandas as pd
+from kedro.io.core import DatasetError
+from kedro_datasets.pandas import SQLTableDataset
+
+
+class SQLTableChunks:
+    """
+    Re-iterable view over a SQL table that yields it in row chunks.
+
+    Every iteration issues a new query, so a node can make several passes over the
+    table (e.g. one pass to gather statistics, one pass to transform) while only
+    one chunk is held in memory at a time.
+
+    Chunks are indexed by their row position in the table (unless 'index_col' is
+    given), so they carry the same index labels as a full-table load.
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.Engine
+        Engine connected to the database holding the table
+
+    load_args: dict
+        Arguments passed to pandas.read_sql_table, including 'table_name'
+
+    chunksize: int
+        Number of rows per chunk
+    """
+
+    def __init__(self, engine, load_args: dict[str, Any], chunksize: int):
+        self._engine = engine
+        self._load_args = load_args
+        self.chunksize = chunksize
+
+    def __iter__(self) -> Iterator[pd.DataFrame]:
+        start = 0
+        chunks = pd.read_sql_table(
+            con=self._engine, chunksize=self.chunksize, **self._load_args
+        )
+        for chunk in chunks:
+            if "index_col" not in self._load_args:
+                chunk.index = pd.RangeIndex(start, start + len(chunk))
+            start += len(chunk)
+            yield chunk
+
+
+class ChunkedSQLTableDataset(SQLTableDataset):
+    """
+    SQLTableDataset that loads the table lazily in row chunks instead of all at once.
+
+    Loading returns a SQLTableChunks object; iterate over it to read the table one
+    chunk at a time. Saving behaves exactly like pandas.SQLTableDataset.
+
+    Example (catalog.yml)
+    ---------------------
+        bmarket_chunks:
+          type: egt309_pipeline.datasets.ChunkedSQLTableDataset
+          table_name: bank_marketing
+          credentials:
+            con: "sqlite:///data/01_raw/bmarket.db"
+          load_args:
+            chunksize: 10000
+    """
+
+    def __init__(self, *, load_args: dict[str, Any] = None, **kwargs):
+        load_args = dict(load_args or {})
+        chunksize = load_args.pop("chunksize", None)
+        if not chunksize or chunksize <= 0:
+            raise DatasetError("'chunksize' must be a positive number of rows.")
+
+        super().__init__(load_args=load_args, **kwargs)
+        self._chunksize = chunksize
+
+    def _describe(self) -> dict[str, Any]:
+        return {**super()._describe(), "chunksize": self._chunksize}
+
+    def load(self) -> SQLTableChunks:
+        return SQLTableChunks(self.engine, self._load_args, self._chunksize)
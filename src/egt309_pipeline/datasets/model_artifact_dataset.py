@@ -0,0 +1,360 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import importlib.metadata
+import json
+import logging
+import mmap
+import pickle
+import sys
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+import numpy as np
+from kedro.io.core import AbstractDataset, DatasetError
+
+logger = logging.getLogger(__name__)
+
+_MANIFEST = "manifest.json"
+_SKELETON = "skeleton.pkl"
+_TREE_NODES = "tree_nodes.npy"
+_TREE_VALUES = "tree_values.npy"
+
+# Native file format of every kind of part
+_SUFFIXES = {"xgboost": ".ubj", "lightgbm": ".txt", "catboost": ".cbm"}
+
+# Distributions whose versions the manifest records (when they are imported)
+_DISTRIBUTIONS = {
+    "sklearn": "scikit-learn",
+    "xgboost": "xgboost",
+    "lightgbm": "lightgbm",
+    "catboost": "catboost",
+}
+
+
+# Attributes of a LazyPart itself, never looked up on its part
+_LAZY_PART_ATTRIBUTES = {"_kind", "_buffer", "_part"}
+
+
+class ModelArtifactDataset(AbstractDataset[Any, Any]):
+    """
+    Trained model stored as separate pieces in their native formats, instead of a
+    single pickle of the whole RecallOptimizedClassifier & its sklearn Pipeline.
+
+    Every booster of the model is written in its library's own binary format
+    (XGBoost UBJSON, LightGBM model text, the native model of a CatBoost estimator
+    in cbm), and the trees of sklearn
+    ensembles (RandomForest, AdaBoost, a DecisionTree...) as two numpy arrays
+    shared by all trees. What remains (the preprocessor, the wrappers & their
+    parameters) is a small pickle, and manifest.json describes the artifact: its
+    parts, the library versions it was saved with and the decision threshold of a
+    RecallOptimizedClassifier, which can be read or adjusted without loading the
+    model (the manifest's threshold is the one the loaded model uses).
+
+    Boosters are loaded lazily: their files are memory-mapped, and every booster
+    is only parsed from its mapping the first time the model uses it (e.g. the
+    first predict_proba). The estimators themselves (XGBClassifier,
+    CatBoostClassifier...) are loaded whole around their boosters, so sklearn
+    sees fitted estimators of their own classes before any parsing. Pickling a loaded model (e.g. for joblib workers) parses
+    its boosters first. sklearn trees are built on load, as Tree.__setstate__
+    copies the arrays it is given: they are copied from the memory-mapped .npy
+    files, which only spares the intermediate buffer of unpickling them. Models of
+    other libraries (e.g. SVC) are stored whole in the pickle.
+
+    The directory belongs to the dataset: a save replaces every file in it.
+
+    Parameters
+    ----------
+    filepath: str
+        Directory of the artifact
+
+    load_args: dict, optional
+        'lazy': bool, parse the boosters on first use (default: True)
+
+    Example (catalog.yml)
+    ---------------------
+        "{model_name}_model_weights":
+          type: egt309_pipeline.datasets.ModelArtifactDataset
+          filepath: saved_models/{model_name}/{model_name}_model
+    """
+
+    DEFAULT_LOAD_ARGS: dict[str, Any] = {"lazy": True}
+
+    def __init__(
+        self,
+        *,
+        filepath: str,
+        load_args: dict[str, Any] = None,
+        metadata: dict[str, Any] = None,
+    ):
+        self._filepath = PurePosixPath(filepath)
+        self._load_args = {**self.DEFAULT_LOAD_ARGS, **(load_args or {})}
+        self.metadata = metadata
+
+    def _describe(self) -> dict[str, Any]:
+        return {"filepath": self._filepath, "load_args": self._load_args}
+
+    def _exists(self) -> bool:
+        # The manifest is written last, once every part is
+        return (Path(self._filepath) / _MANIFEST).is_file()
+
+    def load(self) -> Any:
+        directory = Path(self._filepath)
+        if not self._exists():
+            raise DatasetError(f"No model artifact found in '{self._filepath}'")
+
+        manifest = json.loads((directory / _MANIFEST).read_text(encoding="utf-8"))
+        for module, saved in manifest["versions"].items():
+            installed = _version(module)
+            if installed != saved:
+                logger.warning(
+                    f"'{self._filepath}' was saved with {module} {saved}, "
+                    f"loading it with {installed}"
+                )
+
+        with (directory / _SKELETON).open("rb") as file:
+            unpickler = _ArtifactUnpickler(file, directory, self._load_args["lazy"])
+            model = unpickler.load()
+        if manifest.get("threshold") is not None:
+            model.threshold_ = manifest["threshold"]
+        return model
+
+    def save(self, data: Any) -> None:
+        directory = Path(self._filepath)
+        # Old files are unlinked, not truncated, so memory maps of them that are
+        # still open (models loaded lazily) stay valid
+        if directory.is_dir():
+            for file in directory.iterdir():
+                if file.is_file():
+                    file.unlink()
+        directory.mkdir(parents=True, exist_ok=True)
+
+        with (directory / _SKELETON).open("wb") as file:
+            pickler = _ArtifactPickler(file, directory)
+            pickler.dump(data)
+        pickler.save_trees()
+
+        threshold = getattr(data, "threshold_", None)
+        manifest = {
+            "model": f"{type(data).__module__}.{type(data).__qualname__}",
+            "threshold": None if threshold is None else float(threshold),
+            "parts": pickler.parts,
+            "trees": pickler.tree_count,
+            "versions": {
+                module: _version(module)
+                for module in _DISTRIBUTIONS
+                if module in sys.modules
+            },
+        }
+        (directory / _MANIFEST).write_text(
+            json.dumps(manifest, indent=2), encoding="utf-8"
+        )
+
+
+class LazyPart:
+    """
+    Booster (or native model of a CatBoost estimator) of a loaded
+    ModelArtifactDataset, parsed from its memory-mapped file the first time one of
+    its attributes is used. Stands in for the booster in the estimator it belongs
+    to, and pickles as the parsed booster.
+    """
+
+    def __init__(self, kind: str, buffer: mmap.mmap):
+        self._kind = kind
+        self._buffer = buffer
+        self._part = None
+
+    def __getattr__(self, name: str):
+        # Only reached for the attributes of the part (sklearn's __sklearn_tags__
+        # & co. included)
+        if name in _LAZY_PART_ATTRIBUTES:
+            raise AttributeError(name)
+        return getattr(self.resolve(), name)
+
+    def __reduce__(self):
+        return _resolved, (self.resolve(),)
+
+    def __repr__(self) -> str:
+        state = "parsed" if self._part is not None else "not parsed"
+        return f"LazyPart({self._kind}, {state})"
+
+    def resolve(self) -> Any:
+        """
+        Parsed booster, parsed on the first call
+        """
+        if self._part is None:
+            self._part = _parse(self._kind, self._buffer)
+            self._buffer = None
+        return self._part
+
+
+class _ArtifactPickler(pickle.Pickler):
+    # Pickles a model, writing its boosters to their own files and collecting the
+    # arrays of its trees
+    def __init__(self, file, directory: Path):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.directory = directory
+        self.parts = []
+        self.tree_count = 0
+        self._tree_nodes = []
+        self._tree_values = []
+        self._offsets = [0, 0]  # Nodes & values of the trees collected so far
+
+    def reducer_override(self, obj):
+        # A fitted CatBoost estimator is pickled as itself, but for its native
+        # model (its _object), which is stored as a part
+        if not _is_fitted_catboost(obj):
+            return NotImplemented
+        state = {name: value for name, value in vars(obj).items() if name != "_object"}
+        return _rebuild_catboost, (type(obj), state, _CatBoostModel(obj))
+
+    def persistent_id(self, obj) -> tuple:
+        if isinstance(obj, _CatBoostModel):
+            kind, obj = "catboost", obj.estimator
+        else:
+            kind = _part_kind(obj)
+        if kind is None:
+            return None
+        if kind == "tree":
+            return self._collect_tree(obj)
+
+        name = f"part-{len(self.parts)}{_SUFFIXES[kind]}"
+        path = str(self.directory / name)
+        if kind == "xgboost":
+            obj.save_model(path)
+        elif kind == "lightgbm":
+            obj.save_model(path, num_iteration=-1)  # Every round, like pickle
+        else:
+            obj.save_model(path, format="cbm")
+        self.parts.append({"file": name, "kind": kind, "class": type(obj).__name__})
+        return kind, name
+
+    def _collect_tree(self, tree) -> tuple:
+        # The arrays of a tree, appended to the arrays of all trees
+        _, args, state = tree.__reduce__()
+        nodes, values = state["nodes"], state["values"]
+        self._tree_nodes.append(nodes)
+        self._tree_values.append(values.ravel())
+        node_offset, value_offset = self._offsets
+        self._offsets = [node_offset + len(nodes), value_offset + values.size]
+        self.tree_count += 1
+        return "tree", args, state["max_depth"], node_offset, value_offset, values.shape
+
+    def save_trees(self):
+        if not self._tree_nodes:
+            return
+        np.save(self.directory / _TREE_NODES, np.concatenate(self._tree_nodes))
+        np.save(self.directory / _TREE_VALUES, np.concatenate(self._tree_values))
+
+
+class _ArtifactUnpickler(pickle.Unpickler):
+    # Unpickles a model, mapping its boosters from their own files & building its
+    # trees from the shared arrays
+    def __init__(self, file, directory: Path, lazy: bool):
+        super().__init__(file)
+        self.directory = directory
+        self.lazy = lazy
+        self._trees = None
+
+    def persistent_load(self, pid: tuple) -> Any:
+        kind, *args = pid
+        if kind == "tree":
+            return self._load_tree(*args)
+
+        (name,) = args
+        part = LazyPart(kind, _map(self.directory / name))
+        return part if self.lazy else part.resolve()
+
+    def _load_tree(self, args, max_depth, node_offset, value_offset, values_shape):
+        from sklearn.tree._tree import Tree  # noqa: PLC0415
+
+        if self._trees is None:
+            self._trees = tuple(
+                np.load(self.directory / name, mmap_mode="r")
+                for name in (_TREE_NODES, _TREE_VALUES)
+            )
+        all_nodes, all_values = self._trees
+        node_count = values_shape[0]
+        tree = Tree(*args)
+        tree.__setstate__(
+            {
+                "max_depth": max_depth,
+                "node_count": node_count,
+                "nodes": all_nodes[node_offset : node_offset + node_count],
+                "values": all_values[
+                    value_offset : value_offset + int(np.prod(values_shape))
+                ].reshape(values_shape),
+            }
+        )
+        return tree
+
+
+class _CatBoostModel:
+    # Native model of a fitted CatBoost estimator, stored as a part of its own
+    def __init__(self, estimator):
+        self.estimator = estimator
+
+
+def _part_kind(obj) -> str:
+    # Kind of part an object is stored as, None when it is pickled (the modules
+    # are only looked up, a model cannot come from a library that is not imported)
+    module = type(obj).__module__
+    if module == "xgboost.core" and type(obj).__name__ == "Booster":
+        return "xgboost"
+    if module == "lightgbm.basic" and type(obj).__name__ == "Booster":
+        return "lightgbm"
+    if module == "sklearn.tree._tree" and type(obj).__name__ == "Tree":
+        return "tree"
+    return None
+
+
+def _is_fitted_catboost(obj) -> bool:
+    catboost = sys.modules.get("catboost")
+    return (
+        catboost is not None and isinstance(obj, catboost.CatBoost) and obj.is_fitted()
+    )
+
+
+def _rebuild_catboost(model_class, state: dict, model) -> Any:
+    # CatBoost estimator around its native model (a LazyPart when loaded lazily):
+    # its other attributes (parameters, tree count...) need no parsing
+    estimator = model_class.__new__(model_class)
+    estimator.__dict__.update(state)
+    estimator._object = model
+    return estimator
+
+
+def _parse(kind: str, buffer: mmap.mmap) -> Any:
+    # Booster (or CatBoost model) from the contents of its file
+    if kind == "xgboost":
+        import xgboost  # noqa: PLC0415
+
+        booster = xgboost.Booster()
+        booster.load_model(bytearray(buffer))
+        return booster
+    if kind == "lightgbm":
+        import lightgbm  # noqa: PLC0415
+
+        return lightgbm.Booster(model_str=buffer[:].decode("utf-8"))
+
+    from catboost import CatBoost  # noqa: PLC0415
+
+    return CatBoost().load_model(blob=buffer[:])._object
+
+
+def _map(path: Path) -> mmap.mmap:
+    # Read-only memory map of a file, valid after the file is closed or unlinked
+    with path.open("rb") as file:
+        return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _resolved(part: Any) -> Any:
+    # Unpickles a LazyPart as the part it stood in for
+    return part
+
+
+def _version(module: str) -> str:
+    try:
+        return importlib.metadata.version(_DISTRIBUTIONS[module])
+    except importlib.metadata.PackageNotFoundError:
+        return None
@@ -0,0 +1,84 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+from functools import cached_property
+from typing import Any
+
+import pandas as pd
+import sqlalchemy as sa
+from kedro_datasets.pandas import SQLTableDataset
+
+
+class SQLTableHandle:
+    """
+    Handle on a SQL table that has not been read yet.
+
+    Lets a node decide what to read from the table (e.g. which columns and rows)
+    so the database does the filtering instead of pandas.
+
+    Parameters
+    ----------
+    engine: sqlalchemy.engine.Engine
+        Engine connected to the database holding the table
+
+    table_name: str
+        Name of the table
+
+    schema: str, optional
+        Schema holding the table
+    """
+
+    def __init__(self, engine, table_name: str, schema: str = None):
+        self._engine = engine
+        self.table_name = table_name
+        self.schema = schema
+
+    @cached_property
+    def table(self) -> sa.Table:
+        """
+        Reflected table, used to build queries against it
+        """
+        return sa.Table(
+            self.table_name,
+            sa.MetaData(),
+            schema=self.schema,
+            autoload_with=self._engine,
+        )
+
+    def read(self, query: sa.Select = None, **kwargs) -> pd.DataFrame:
+        """
+        Run query (default: the whole table) and return the result
+
+        Parameters
+        ----------
+        query: sqlalchemy.Select, optional
+            Query to run against the table
+
+        **kwargs
+            Passed on to pandas.read_sql_query
+        """
+        if query is None:
+            query = sa.select(self.table)
+        return pd.read_sql_query(query, con=self._engine, **kwargs)
+
+
+class SQLTableHandleDataset(SQLTableDataset):
+    """
+    SQLTableDataset that loads a SQLTableHandle instead of the table's contents.
+
+    Saving behaves exactly like pandas.SQLTableDataset.
+
+    Example (catalog.yml)
+    ---------------------
+        bmarket_table:
+          type: egt309_pipeline.datasets.SQLTableHandleDataset
+          table_name: bank_marketing
+          credentials:
+            con: "sqlite:///data/01_raw/bmarket.db"
+    """
+
+    def load(self) -> SQLTableHandle:
+        load_args: dict[str, Any] = self._load_args
+        return SQLTableHandle(
+            self.engine, load_args["table_name"], load_args.get("schema")
+        )
@@ -0,0 +1,182 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.utils.validation import check_is_fitted
+
+ENCODINGS = ("ohe", "int")
+
+
+class CategoricalEncoder(TransformerMixin, BaseEstimator):
+    """
+    Fit-once, transform-many encoder for the categorical columns of a DataFrame.
+
+    fit() learns the sorted categories of every categorical column (the same
+    categories sklearn's OneHotEncoder/OrdinalEncoder and LabelEncoder learn), and
+    transform() maps every column to its category codes in one vectorized lookup.
+    One-hot output is written into a single preallocated matrix (or built directly
+    as a CSR matrix with sparse_output=True) instead of one frame per column.
+
+    A fitted encoder can be saved (e.g. with pickle.PickleDataset) and applied to
+    new data, and its categories_ passed to a new encoder so that fitting it again
+    (e.g. inside every cross-validation fold) only checks the columns.
+
+    Values not seen during fit are encoded as all zeros ("ohe") or unknown_value
+    ("int"), like handle_unknown="ignore"/"use_encoded_value" in sklearn.
+
+    Parameters
+    ----------
+    encoding: str, default="ohe"
+        "ohe" (one-hot encoding) or "int" (integer encoding)
+
+    columns: list[str], optional
+        Columns to encode; default: every object, string and category column.
+        The other columns are passed through in place
+
+    categories: dict[str, list], optional
+        Categories of every column to encode (e.g. the categories_ of a fitted
+        encoder); learned from the data when not given
+
+    sparse_output: bool, default=False
+        Return a scipy CSR matrix ("ohe" only; passed through columns must be numeric)
+
+    unknown_value: int, default=-1
+        Code of unseen values with "int" encoding
+
+    Example
+    -------
+        encoder = CategoricalEncoder(encoding="ohe").fit(X_train)
+        X_test_encoded = encoder.transform(X_test)
+    """
+
+    def __init__(
+        self,
+        encoding: str = "ohe",
+        columns: list[str] = None,
+        categories: dict[str, list] = None,
+        sparse_output: bool = False,
+        unknown_value: int = -1,
+    ):
+        self.encoding = encoding
+        self.columns = columns
+        self.categories = categories
+        self.sparse_output = sparse_output
+        self.unknown_value = unknown_value
+
+    def fit(self, X: pd.DataFrame, y=None) -> "CategoricalEncoder":
+        if self.encoding not in ENCODINGS:
+            raise ValueError(f"encoding must be one of {ENCODINGS}")
+        if self.sparse_output and self.encoding != "ohe":
+            raise ValueError("sparse_output is only supported with 'ohe' encoding")
+
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.n_features_in_ = X.shape[1]
+
+        columns = self.columns
+        if columns is None:
+            columns = X.select_dtypes(include=["object", "string", "category"]).columns
+        self.columns_ = list(columns)
+
+        self.categories_ = {}
+        for col in self.columns_:
+            if self.categories is not None and col in self.categories:
+                self.categories_[col] = list(self.categories[col])
+            else:
+                self.categories_[col] = _sorted_categories(X[col])
+        return self
+
+    def transform(self, X: pd.DataFrame) -> pd.DataFrame | sparse.csr_matrix:
+        check_is_fitted(self, "categories_")
+        codes = {col: self._codes(X[col]) for col in self.columns_}
+
+        if self.encoding == "int":
+            data = {
+                col: np.where(codes[col] < 0, self.unknown_value, codes[col])
+                if col in codes
+                else X[col]
+                for col in X.columns
+            }
+            return pd.DataFrame(data, index=X.index)
+
+        if self.sparse_output:
+            return self._one_hot_sparse(X, codes)
+        return self._one_hot_dense(X, codes)
+
+    def get_feature_names_out(self, input_features=None) -> np.ndarray:
+        check_is_fitted(self, "categories_")
+        names = []
+        for col in self.feature_names_in_:
+            if self.encoding == "ohe" and col in self.categories_:
+                names.extend(f"{col}_{value}" for value in self.categories_[col])
+            else:
+                names.append(col)
+        return np.asarray(names, dtype=object)
+
+    def _codes(self, values: pd.Series) -> np.ndarray:
+        # Position of every value in the fitted categories, -1 when unseen
+        categories = self.categories_[values.name]
+        return pd.Categorical(values, categories=categories).codes.astype(np.int64)
+
+    def _offsets(self) -> dict[str, int]:
+        # First one-hot column of every encoded column in the one-hot block
+        offsets, width = {}, 0
+        for col in self.columns_:
+            offsets[col] = width
+            width += len(self.categories_[col])
+        return offsets
+
+    def _one_hot_dense(self, X: pd.DataFrame, codes: dict) -> pd.DataFrame:
+        offsets = self._offsets()
+        width = sum(len(categories) for categories in self.categories_.values())
+        one_hot = np.zeros((len(X), width))
+        rows = np.arange(len(X))
+        for col, col_codes in codes.items():
+            known = col_codes >= 0
+            one_hot[rows[known], offsets[col] + col_codes[known]] = 1.0
+
+        if list(X.columns) == self.columns_:
+            return pd.DataFrame(
+                one_hot, columns=self.get_feature_names_out(), index=X.index
+            )
+
+        # Passed through columns keep their place (and dtype) between encoded ones
+        data = {}
+        for col in X.columns:
+            if col not in codes:
+                data[col] = X[col]
+                continue
+            for i, value in enumerate(self.categories_[col]):
+                data[f"{col}_{value}"] = one_hot[:, offsets[col] + i]
+        return pd.DataFrame(data, index=X.index)
+
+    def _one_hot_sparse(self, X: pd.DataFrame, codes: dict) -> sparse.csr_matrix:
+        # One (row, column, value) triplet per non-zero entry, assembled once
+        rows, cols, values, width = [], [], [], 0
+        row_ids = np.arange(len(X))
+        for col in X.columns:
+            if col in codes:
+                known = codes[col] >= 0
+                rows.append(row_ids[known])
+                cols.append(width + codes[col][known])
+                values.append(np.ones(known.sum()))
+                width += len(self.categories_[col])
+            else:
+                col_values = X[col].to_numpy(dtype=np.float64)
+                nonzero = col_values != 0
+                rows.append(row_ids[nonzero])
+                cols.append(np.full(nonzero.sum(), width))
+                values.append(col_values[nonzero])
+                width += 1
+
+        return sparse.csr_matrix(
+            (np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(len(X), width),
+        )
+
+
+def _sorted_categories(values: pd.Series) -> list:
+    # Distinct non-missing values in sorted order (the order sklearn's encoders use)
+    return sorted(values.dropna().unique().tolist())
@@ -2,12 +2,16 @@
 # Autoformatted & Linted with Ruff
 # Docstrings follow Google's Python Docstring Format
 
+# The hooks are created by every kedro command (settings.py): rich_gradient,
+# requests and pandas are only imported when a hook needs them
+
 import logging
+import sys
 
-import requests
 from kedro.framework.hooks import hook_impl
 from rich.console import Console
-from rich_gradient import Gradient
+
+from egt309_pipeline.config import use_session_parameters
 
 logger = logging.getLogger(__name__)
 console = Console(force_terminal=True, _environ={"COLUMNS": "100"}, color_system="256")
@@ -21,6 +25,8 @@ def print_banner(large_banner_text: str, small_text_under: str):
         large_banner_text (str): Large Banner Text to be printed
         small_text_under: (str): Small text underneath the Large Banner Text
     """
+    from rich_gradient import Gradient  # noqa: PLC0415
+
     # Taken from https://uigradients.com/#SlightOceanView and https://uigradients.com/#Magic
     banner_colours = ["#a8c0ff", "#a17fe0", "#3f2b96"]
     text_colours = ["#a8c0ff", "#a17fe0"]
@@ -67,6 +73,20 @@ class DisplayBannerBeforePipelineRuns:
         print_banner(block_banner_text, pipline_start_alert)
 
 
+class SessionParametersHook:
+    @hook_impl
+    def after_context_created(self, context):
+        """
+        Shares the parameters of the session's context (its --env & --params
+        included) with create_pipeline and the SharedMemoryRunner, which Kedro
+        builds and runs after the context is created.
+
+        Args:
+            context (KedroContext): Context of the session
+        """
+        use_session_parameters(context.params)
+
+
 class TrainingCompleteHook:
     @hook_impl
     def after_pipeline_run(self):
@@ -75,6 +95,7 @@ class TrainingCompleteHook:
         This is to update the server that the pipeline has completed (aka training is done),
         so that the server can requery the model metrics to display.
         """
+        import requests  # noqa: PLC0415
 
         # The primary url should automatically resolve to the visualisation-server docker container, assuming the pipeline is ran in a container as well.
         # If the primary url can't be contacted (meaning that the pipeline is running outside a container), the fallback localhost url is used instead.
@@ -132,3 +153,70 @@ class TrainingCompleteHook:
                 logger.error(
                     f"Can't contact Localhost. Is flask server running?\nException: {exception}"
                 )
+
+
+class MemoryReportHook:
+    """
+    Logs the in-memory size of every pandas dataset that a pipeline run loads or
+    produces (e.g. cleaned_bmarket vs compact_bmarket, X_train, X_test) once the run
+    has finished, so the effect of dtype changes is visible on every run.
+    """
+
+    def __init__(self):
+        self._sizes = {}
+
+    @hook_impl
+    def before_pipeline_run(self):
+        """
+        Clears the sizes recorded in a previous run
+        """
+        self._sizes = {}
+
+    @hook_impl
+    def before_node_run(self, inputs: dict):
+        """
+        Records the size of the datasets loaded for a node
+
+        Args:
+            inputs (dict): Node inputs by dataset name
+        """
+        self._record(inputs)
+
+    @hook_impl
+    def after_node_run(self, outputs: dict):
+        """
+        Records the size of the datasets produced by a node
+
+        Args:
+            outputs (dict): Node outputs by dataset name
+        """
+        self._record(outputs)
+
+    @hook_impl
+    def after_pipeline_run(self):
+        """
+        Logs the recorded sizes, one line per dataset
+        """
+        if not self._sizes:
+            return
+
+        lines = [
+            f"  {name}: {rows:,} rows, {size / 2**20:,.2f} MiB"
+            for name, (rows, size) in self._sizes.items()
+        ]
+        logger.info("Dataset memory report:\n" + "\n".join(lines))
+
+    def _record(self, datasets: dict):
+        # No dataset can be a DataFrame before pandas is imported
+        pd = sys.modules.get("pandas")
+        if pd is None:
+            return
+
+        for name, data in datasets.items():
+            if name in self._sizes or not isinstance(data, (pd.DataFrame, pd.Series)):
+                continue
+
+            # deep=True counts the Python strings held by object columns
+            usage = data.memory_usage(deep=True)
+            size = usage.sum() if isinstance(usage, pd.Series) else usage
+            self._sizes[name] = (len(data), int(size))
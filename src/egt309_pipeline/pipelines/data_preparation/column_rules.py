@@ -0,0 +1,227 @@
+"""
+Declarative column rules for the data_preparation pipeline.
+
+A rule is a dict naming a column and one of the transforms in RULES, e.g.
+
+    {"column": "Campaign Calls", "rule": "abs"}
+
+Rules are written in parameters_data_preparation.yml: cleaning_rules for the
+built-in cleaning steps (defaults in nodes.py) and column_rules for extra ones.
+compile_rules turns a list of rules into vectorized functions once: string rules
+run once per unique value of the column and are broadcast back with the factorized
+codes, numeric rules are NumPy ufuncs and comparisons, so no rule runs Python code
+per row.
+
+Every rule takes an optional "output": the result is written under that name in
+place of the source column (same position), instead of overwriting the column.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+_MISSING = object()
+
+
+def map_unique_values(col: pd.Series, func: Callable) -> pd.Series:
+    """
+    Apply func to every distinct value of a column instead of every row
+    The column is factorized, func runs once per unique value, and the results
+    are gathered back with the integer codes (a single vectorized take)
+    Missing values are kept as missing
+
+    parameters:
+    -----------
+    col: pd.Series
+        Column to transform
+
+    func: Callable
+        Function applied to each unique value
+    """
+    codes, uniques = pd.factorize(col)
+    mapped = np.asarray(uniques.map(func))
+    if (codes == -1).any():
+        mapped = np.append(mapped.astype(object), None)
+    return pd.Series(mapped[codes], index=col.index, name=col.name)
+
+
+def _normalise(value: Any) -> Any:
+    return value.strip().lower() if isinstance(value, str) else value
+
+
+def strip_suffix(col: pd.Series, suffix: str, dtype: str = None) -> pd.Series:
+    """
+    Remove suffix from every value (e.g. "57 years" -> "57"), then cast to dtype
+
+    parameters:
+    -----------
+    col: pd.Series
+        String column
+
+    suffix: str
+        Suffix to remove, values without it are kept as they are
+
+    dtype: str
+        Optional dtype of the result (e.g. "int")
+    """
+    col_new = map_unique_values(col, lambda x: x.removesuffix(suffix))
+    return col_new.astype(dtype) if dtype else col_new
+
+
+def normalise_case_map(
+    col: pd.Series, mapping: dict, default: Any = _MISSING, dtype: str = None
+) -> pd.Series:
+    """
+    Map values to canonical ones, ignoring case and surrounding whitespace
+    (e.g. {"cell": "cellular"} maps "Cell", "CELL " and "cell" to "cellular")
+
+    parameters:
+    -----------
+    col: pd.Series
+        Column to map
+
+    mapping: dict
+        {value: canonical value}, keys are compared in lower case
+
+    default: Any
+        Value for entries not in mapping (default: keep the entry)
+
+    dtype: str
+        Optional dtype of the result (e.g. "bool")
+    """
+    lookup = {_normalise(key): value for key, value in mapping.items()}
+
+    def func(x):
+        key = _normalise(x)
+        if key in lookup:
+            return lookup[key]
+        return x if default is _MISSING else default
+
+    col_new = map_unique_values(col, func)
+    return col_new.astype(dtype) if dtype else col_new
+
+
+def absolute(col: pd.Series) -> pd.Series:
+    """
+    Absolute value of a numeric column
+
+    parameters:
+    -----------
+    col: pd.Series
+        Numeric column
+    """
+    return np.abs(col)
+
+
+def sentinel_to_flag(col: pd.Series, sentinel: Any) -> pd.Series:
+    """
+    Boolean flag that is False where the column holds the sentinel value
+    (e.g. 999 = "never contacted") and True everywhere else
+
+    parameters:
+    -----------
+    col: pd.Series
+        Column holding the sentinel
+
+    sentinel: Any
+        Value marking "not applicable"
+    """
+    return col != sentinel
+
+
+# Rules that transform a single column: {rule name: kernel(col, **args)}
+RULES = {
+    "strip_suffix": strip_suffix,
+    "normalise_case_map": normalise_case_map,
+    "abs": absolute,
+    "sentinel_to_flag": sentinel_to_flag,
+}
+
+
+def _drop_if_equals(column: str, value: Any) -> Callable:
+    def apply(df: pd.DataFrame) -> pd.DataFrame:
+        return df.loc[df[column] != value]
+
+    return apply
+
+
+def _column_rule(column: str, kernel: Callable, output: str, args: dict) -> Callable:
+    def apply(df: pd.DataFrame) -> pd.DataFrame:
+        col_new = kernel(df[column], **args)
+        if output == column:
+            df[column] = col_new
+            return df
+
+        # Written in place of the source column
+        position = df.columns.get_loc(column)
+        df = df.drop(columns=column)
+        df.insert(position, output, col_new)
+        return df
+
+    return apply
+
+
+def compile_rule(rule: dict) -> Callable[[pd.DataFrame], pd.DataFrame]:
+    """
+    Turn one rule into a function from DataFrame to DataFrame
+    The function may modify the frame it is given (see apply_column_rules)
+
+    parameters:
+    -----------
+    rule: dict
+        {"column": str, "rule": str, "output": str (optional), **rule arguments}
+    """
+    args = dict(rule)
+    try:
+        column, name = args.pop("column"), args.pop("rule")
+    except KeyError as e:
+        raise ValueError(f"Column rule {rule} is missing {e}") from e
+
+    if name == "drop_if_equals":
+        return _drop_if_equals(column, **args)
+    if name not in RULES:
+        raise ValueError(
+            f"Unknown column rule '{name}', expected one of "
+            f"{[*RULES, 'drop_if_equals']}"
+        )
+
+    output = args.pop("output", column)
+    return _column_rule(column, RULES[name], output, args)
+
+
+def compile_rules(rules: list[dict]) -> Callable[[pd.DataFrame], pd.DataFrame]:
+    """
+    Turn a list of rules into one function applying them in order
+
+    parameters:
+    -----------
+    rules: list[dict]
+        Rules, see compile_rule
+    """
+    compiled = [compile_rule(rule) for rule in rules]
+
+    def apply(df: pd.DataFrame) -> pd.DataFrame:
+        # Copy-on-write: row filters and column writes only copy what they change
+        with pd.option_context("mode.copy_on_write", True):
+            for func in compiled:
+                df = func(df)
+        return df
+
+    return apply
+
+
+def apply_column_rules(df: pd.DataFrame, rules: list[dict]) -> pd.DataFrame:
+    """
+    Apply rules to a copy of df
+
+    parameters:
+    -----------
+    df: pd.DataFrame
+        Input DataFrame
+
+    rules: list[dict]
+        Rules, see compile_rule
+    """
+    return compile_rules(rules)(df.copy())
@@ -0,0 +1,88 @@
+"""
+Blocked, tree-indexed KNN imputation for the data_preparation pipeline.
+
+sklearn's KNNImputer computes the distance from every row to be imputed to every
+other row, which grows quadratically with the table. Here the rows that hold a value
+(donors) are indexed once in a KD-tree, and the rows to impute are queried against it
+in fixed-size blocks, so memory stays bounded by block_size * n_neighbors and each
+block is searched on all cores (scipy releases the GIL during the query).
+
+Like KNNImputer (uniform weights), the imputed value is the mean target value of
+the n_neighbors donors closest in Euclidean distance over the feature columns.
+With eps > 0 the search is approximate: each returned neighbour is at most
+(1 + eps) times farther than the true one, which prunes the tree much harder on
+high-dimensional features.
+"""
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+
+def knn_impute(
+    features: np.ndarray,
+    target: np.ndarray,
+    missing: np.ndarray,
+    n_neighbors: int = 5,
+    block_size: int = 65536,
+    n_jobs: int = -1,
+    eps: float = 0.0,
+) -> np.ndarray:
+    """
+    Impute target for the rows flagged in missing from their nearest donors
+
+    parameters:
+    -----------
+    features: np.ndarray
+        (n_rows, n_features) numeric features without missing values
+
+    target: np.ndarray
+        (n_rows,) values to impute, only read where missing is False
+
+    missing: np.ndarray
+        (n_rows,) boolean mask of the rows to impute
+
+    n_neighbors: int
+        Number of donors averaged for each imputed value
+
+    block_size: int
+        Number of rows queried at a time
+
+    n_jobs: int
+        Number of threads used per query, -1 uses all cores
+
+    eps: float
+        Approximation factor of the search, 0 (default) for exact neighbours
+
+    returns:
+    --------
+    np.ndarray
+        (missing.sum(),) imputed values, in row order
+    """
+    features = np.asarray(features, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    missing = np.asarray(missing, dtype=bool)
+
+    if np.isnan(features).any():
+        raise ValueError("KNN imputation features must not contain missing values")
+
+    donor_target = target[~missing]
+    if len(donor_target) == 0:
+        raise ValueError("KNN imputation needs at least one row with a value")
+
+    # Without features every donor is equally close: KNNImputer uses the mean
+    recipients = features[missing]
+    if features.shape[1] == 0:
+        return np.full(len(recipients), donor_target.mean())
+
+    tree = cKDTree(features[~missing])
+    k = min(n_neighbors, len(donor_target))
+
+    imputed = np.empty(len(recipients))
+    for start in range(0, len(recipients), block_size):
+        block = recipients[start : start + block_size]
+        _, neighbours = tree.query(block, k=k, eps=eps, workers=n_jobs)
+        imputed[start : start + len(block)] = donor_target[
+            neighbours.reshape(len(block), k)
+        ].mean(axis=1)
+
+    return imputed
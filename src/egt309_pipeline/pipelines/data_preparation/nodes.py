@@ -3,18 +3,31 @@ This is a boilerplate pipeline 'data_preparation'
 generated using Kedro 1.0.0
 """
 
-import logging
+# sklearn, imblearn, scipy & joblib are imported by the functions that use them,
+# so building the pipelines (every kedro command) does not import them
 
-logger = logging.getLogger(__name__)
+from __future__ import annotations
 
-from typing import Any, Tuple, Union
+import hashlib
+import json
+import logging
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 import pandas as pd
-from imblearn.over_sampling import SMOTE
-from sklearn.impute import KNNImputer
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder
+
+from .column_rules import apply_column_rules, compile_rules
+from .distribution_imputer import DistributionImputer
+from .sql_pushdown import sql_pushdown
+
+if TYPE_CHECKING:
+    from sklearn.preprocessing import LabelEncoder, OneHotEncoder
+
+    from egt309_pipeline.encoding import CategoricalEncoder
+
+logger = logging.getLogger(__name__)
 
 # Define catalog to load dataset
 # conf_loader = OmegaConfigLoader(
@@ -30,10 +43,14 @@ def _my_knnimputer(
     target_val: Any = None,
     corr_cols: list = None,
     n_neighbors: int = 5,
+    block_size: int = 65536,
+    n_jobs: int = -1,
+    eps: float = 0.0,
 ):
     """
     Impute target values such as missing data with KNN
     Ensure all columns in corr_cols are encoded or numeric
+    Neighbours are searched in a KD-tree, in blocks, on all cores (see knn_imputation)
 
     paramters:
     ----------
@@ -52,28 +69,46 @@ def _my_knnimputer(
     n_neighbors: int
       Set the number of similar groups (nearest neighbours) to look
       at when estimating a missing value.
+
+    block_size: int
+      Number of rows to impute that are searched at a time (bounds memory)
+
+    n_jobs: int
+      Number of threads used for the neighbour search, -1 uses all cores
+
+    eps: float
+      > 0 for an approximate (faster) neighbour search, see knn_imputation
     """
+    from .knn_imputation import knn_impute  # noqa: PLC0415
+
     df_copy = df.copy()
-    imputer = KNNImputer(n_neighbors=n_neighbors)
+    df_copy[target_col] = df_copy[target_col].astype(float)
 
+    missing = df_copy[target_col].isna()
     if target_val is not None:
-        df_copy[target_col] = df_copy[target_col].map(
-            lambda x: np.nan if x == target_val else x
-        )
-
-    if corr_cols is not None:
-        final_corr_cols = (
-            corr_cols if target_col in corr_cols else corr_cols.append(target_col)
-        )
-        df_copy[final_corr_cols] = imputer.fit_transform(df_copy[final_corr_cols])
-    else:
-        df_copy[target_col] = imputer.fit_transform(df_copy[[target_col]])
-
+        missing |= df_copy[target_col] == target_val
+    if not missing.any():
+        return df_copy
+
+    # corr_cols is not modified, the target column is never a feature
+    feature_cols = [col for col in corr_cols or [] if col != target_col]
+    df_copy.loc[missing, target_col] = knn_impute(
+        df_copy[feature_cols].to_numpy(dtype=float),
+        df_copy[target_col].to_numpy(),
+        missing.to_numpy(),
+        n_neighbors=n_neighbors,
+        block_size=block_size,
+        n_jobs=n_jobs,
+        eps=eps,
+    )
     return df_copy
 
 
 def _random_distribution(
-    df: pd.DataFrame, target_col: str, target_val: Any = None
+    df: pd.DataFrame,
+    target_col: str,
+    target_val: Any = None,
+    imputer: DistributionImputer = None,
 ) -> pd.DataFrame:
     """
     Apply random distribution imputation to selected column
@@ -93,20 +128,15 @@ def _random_distribution(
         "none"    : imputes all the np.nan or None in specified column
         150       : imputes all values with 150 in the specified column
         "unknown" : imputes all values with unknown in the specified column
+
+    imputer: DistributionImputer
+        Fitted imputer to draw from (see fit_distribution_imputers),
+        fitted on the column itself when not given
     """
+    if imputer is None:
+        imputer = DistributionImputer(target_val).fit(df[target_col])
     df_temp = df.copy()
-    col = df_temp[target_col]
-    rng = np.random.default_rng(42)
-    if target_val is None:
-        temp_col = col[~col.isna()]
-        tobe_fill = col.isna()
-    else:
-        temp_col = col[col != target_val]
-        tobe_fill = col == target_val
-    distribution = temp_col.value_counts(normalize=True).tolist()
-    labels = temp_col.value_counts().index.tolist()
-    fill_mask = tobe_fill
-    fill = rng.choice(labels, size=fill_mask.sum(), p=distribution)  # type: ignore
+    fill_mask, fill = imputer.fill(df_temp[target_col])
     df_temp.loc[fill_mask, target_col] = fill
     return df_temp
 
@@ -127,6 +157,67 @@ def _reindex_target_col(df: pd.DataFrame) -> pd.DataFrame:
     return df_reorganized
 
 
+# Column rules (see column_rules.py) behind the cleaning steps. These are the
+# defaults: cleaning_rules in parameters_data_preparation.yml overrides them
+AGE_RULE = {"column": "Age", "rule": "strip_suffix", "suffix": " years", "dtype": "int"}
+OCCUPATION_RULE = {"column": "Occupation", "rule": "drop_if_equals", "value": "unknown"}
+MARITAL_STATUS_RULE = {
+    "column": "Marital Status",
+    "rule": "drop_if_equals",
+    "value": "unknown",
+}
+CONTACT_METHOD_RULE = {
+    "column": "Contact Method",
+    "rule": "normalise_case_map",
+    "mapping": {"cell": "cellular", "cellular": "cellular"},
+    "default": "telephone",
+}
+CAMPAIGN_CALLS_RULE = {"column": "Campaign Calls", "rule": "abs"}
+PREVIOUS_CONTACT_DAYS_RULE = {
+    "column": "Previous Contact Days",
+    "rule": "sentinel_to_flag",
+    "sentinel": 999,
+    "output": "Previously Contacted",
+}
+SUBSCRIPTION_STATUS_RULE = {
+    "column": "Subscription Status",
+    "rule": "normalise_case_map",
+    "mapping": {"yes": True},
+    "default": False,
+    "dtype": "bool",
+}
+
+# {cleaning_rules key: default rule}
+CLEANING_RULES = {
+    "age": AGE_RULE,
+    "occupation": OCCUPATION_RULE,
+    "marital_status": MARITAL_STATUS_RULE,
+    "contact_method": CONTACT_METHOD_RULE,
+    "campaign_calls": CAMPAIGN_CALLS_RULE,
+    "previous_contact_days": PREVIOUS_CONTACT_DAYS_RULE,
+    "subscription_status": SUBSCRIPTION_STATUS_RULE,
+}
+
+
+def resolve_cleaning_rules(cleaning_rules: dict = None) -> dict:
+    """
+    Rule of every cleaning step: cleaning_rules (parameters_data_preparation)
+    over the defaults of CLEANING_RULES
+
+    parameters:
+    -----------
+    cleaning_rules: dict
+        {cleaning_rules key: rule}, see CLEANING_RULES
+    """
+    unknown = set(cleaning_rules or {}) - set(CLEANING_RULES)
+    if unknown:
+        raise ValueError(
+            f"Unknown cleaning_rules {sorted(unknown)}, expected {list(CLEANING_RULES)}"
+        )
+    return {**CLEANING_RULES, **(cleaning_rules or {})}
+
+
+@sql_pushdown(drop_columns=["Client ID"])
 def clean_clientId(df: pd.DataFrame) -> pd.DataFrame:
     """
     Data cleaning on Client ID column
@@ -141,7 +232,7 @@ def clean_clientId(df: pd.DataFrame) -> pd.DataFrame:
     return df_new
 
 
-def extract_age(df: pd.DataFrame) -> pd.DataFrame:
+def extract_age(df: pd.DataFrame, rule: dict = None) -> pd.DataFrame:
     """
     Data cleaning on Age column
     Function actions: Remove 'years' and keep the age number as integer
@@ -150,14 +241,17 @@ def extract_age(df: pd.DataFrame) -> pd.DataFrame:
     -----------
     df: pd.DataFrame
         Input DataFrame
+
+    rule: dict
+        Column rule of the step (cleaning_rules), AGE_RULE when not given
     """
-    df_temp = df.copy()
-    df_temp["Age"] = df_temp["Age"].map(lambda x: x.split()[0])
-    df_temp["Age"] = df_temp["Age"].astype(int)
-    return df_temp
+    df_new = apply_column_rules(df, [rule or AGE_RULE])
+    return df_new
 
 
-def impute_age(df: pd.DataFrame, impute_method: str = "randdist") -> pd.DataFrame:
+def impute_age(
+    df: pd.DataFrame, impute_method: str = "randdist", imputers: dict = None
+) -> pd.DataFrame:
     """
     Impute the value 150 in Age.
     This function includes two techniques of imputing are random distribution and KNN
@@ -174,20 +268,37 @@ def impute_age(df: pd.DataFrame, impute_method: str = "randdist") -> pd.DataFram
         "randdist" (default) or "knn"
             randdist: random distribution imputation
             knn: KNN imputation
+
+    imputers: dict
+        Fitted imputers from fit_distribution_imputers (randdist only),
+        fitted on df when not given
     """
     df_temp = df.copy()
     match impute_method:
         case "randdist":
-            df_new = _random_distribution(df_temp, target_col="Age", target_val=150)
+            df_new = _random_distribution(
+                df_temp,
+                target_col="Age",
+                target_val=150,
+                imputer=imputers["Age"] if imputers else None,
+            )
 
         case "knn":
             df_encoded_temp = int_encode(df_temp)
-            df_new = _my_knnimputer(df_encoded_temp, target_col="Age", target_val=150)
+            df_new = _my_knnimputer(
+                df_encoded_temp,
+                target_col="Age",
+                target_val=150,
+                corr_cols=df_encoded_temp.columns.drop(
+                    "Subscription Status", errors="ignore"
+                ).tolist(),
+            )
 
     return df_new
 
 
-def clean_occupation(df: pd.DataFrame) -> pd.DataFrame:
+@sql_pushdown(drop_rows_equal={"Occupation": "unknown"})
+def clean_occupation(df: pd.DataFrame, rule: dict = None) -> pd.DataFrame:
     """
     Data cleaning on Occupation column
     Function action: Drop rows with 'unknown'
@@ -196,12 +307,16 @@ def clean_occupation(df: pd.DataFrame) -> pd.DataFrame:
     -----------
     df: pd.DataFrame
         Input DataFrame
+
+    rule: dict
+        Column rule of the step (cleaning_rules), OCCUPATION_RULE when not given
     """
-    df_new = df.drop(df[df["Occupation"] == "unknown"].index, axis=0)
+    df_new = apply_column_rules(df, [rule or OCCUPATION_RULE])
     return df_new
 
 
-def clean_maritalStatus(df: pd.DataFrame) -> pd.DataFrame:
+@sql_pushdown(drop_rows_equal={"Marital Status": "unknown"})
+def clean_maritalStatus(df: pd.DataFrame, rule: dict = None) -> pd.DataFrame:
     """
     Data cleaning on Marital Status column
     Function action: drop rows with 'unknown'
@@ -210,11 +325,15 @@ def clean_maritalStatus(df: pd.DataFrame) -> pd.DataFrame:
     -----------
     df: pd.DataFrame
         Input DataFrame
+
+    rule: dict
+        Column rule of the step (cleaning_rules), MARITAL_STATUS_RULE when not given
     """
-    df_new = df.drop(df[df["Marital Status"] == "unknown"].index, axis=0)
+    df_new = apply_column_rules(df, [rule or MARITAL_STATUS_RULE])
     return df_new
 
 
+@sql_pushdown(drop_columns=["Credit Default"])
 def clean_creditDefault(df: pd.DataFrame) -> pd.DataFrame:
     """
     Data cleaning on Credit Default column
@@ -229,6 +348,7 @@ def clean_creditDefault(df: pd.DataFrame) -> pd.DataFrame:
     return df_new
 
 
+@sql_pushdown(drop_columns=["Housing Loan"])
 def clean_housingLoan(df: pd.DataFrame) -> pd.DataFrame:
     """
     Data cleaning on Housing Loan column
@@ -243,7 +363,7 @@ def clean_housingLoan(df: pd.DataFrame) -> pd.DataFrame:
     return df_new
 
 
-def clean_personalLoan(df: pd.DataFrame) -> pd.DataFrame:
+def clean_personalLoan(df: pd.DataFrame, imputers: dict = None) -> pd.DataFrame:
     """
     Data cleaning on Personal Loan column
     Function action: Apply random distribution imputation to Personal Loan column
@@ -252,13 +372,109 @@ def clean_personalLoan(df: pd.DataFrame) -> pd.DataFrame:
     -----------
     df: pd.DataFrame
         Input DataFrame
+
+    imputers: dict
+        Fitted imputers from fit_distribution_imputers, fitted on df when not given
     """
     df_temp = df.copy()
-    df_new = _random_distribution(df_temp, target_col="Personal Loan")
+    df_new = _random_distribution(
+        df_temp,
+        target_col="Personal Loan",
+        imputer=imputers["Personal Loan"] if imputers else None,
+    )
     return df_new
 
 
-def clean_contactMethod(df: pd.DataFrame) -> pd.DataFrame:
+def fit_distribution_imputers(
+    df: pd.DataFrame | Iterable[pd.DataFrame],
+    sampling_method: str = "cdf",
+    cleaning_rules: dict = None,
+) -> dict:
+    """
+    Fit the random distribution imputers of Personal Loan and Age once
+    Function action: Count the values of Personal Loan and Age on the rows kept by
+                    the row filters (like in the node chain), and build the
+                    sampling table of each column. The fitted imputers are saved
+                    (distribution_imputers) and used by every execution_mode.
+
+    parameters:
+    -----------
+    df: pd.DataFrame | Iterable[pd.DataFrame]
+        Raw bmarket table (or bmarket read with sql_pushdown), or re-iterable row
+        chunks of it (see egt309_pipeline.datasets.ChunkedSQLTableDataset)
+
+    sampling_method: str
+        "cdf" (default) or "alias", see distribution_imputer.py
+
+    cleaning_rules: dict
+        Rules of the cleaning steps over the defaults (cleaning_rules in
+        parameters_data_preparation), see resolve_cleaning_rules
+
+    returns:
+    --------
+    dict
+        {"Personal Loan": DistributionImputer, "Age": DistributionImputer}
+    """
+    imputers = _new_imputers(sampling_method)
+    for chunk in [df] if isinstance(df, pd.DataFrame) else df:
+        _partial_fit_imputers(imputers, chunk, cleaning_rules)
+    return imputers
+
+
+def _new_imputers(sampling_method: str = "cdf") -> dict:
+    # Unfitted imputers of fit_distribution_imputers
+    return {
+        "Personal Loan": DistributionImputer(method=sampling_method),
+        "Age": DistributionImputer(150, method=sampling_method),
+    }
+
+
+def _partial_fit_imputers(
+    imputers: dict, df: pd.DataFrame, cleaning_rules: dict = None
+) -> None:
+    """
+    Add raw rows of the bmarket table to the imputers of fit_distribution_imputers
+
+    parameters:
+    -----------
+    imputers: dict
+        Imputers to update in place
+
+    df: pd.DataFrame
+        Raw rows of the bmarket table
+
+    cleaning_rules: dict
+        Rules of the cleaning steps over the defaults (cleaning_rules in
+        parameters_data_preparation), see resolve_cleaning_rules
+    """
+    for col, values in _imputed_columns(df, cleaning_rules).items():
+        imputers[col].partial_fit(values)
+
+
+def _imputed_columns(df: pd.DataFrame, cleaning_rules: dict = None) -> dict:
+    """
+    Personal Loan and Age as the random distribution imputation steps see them:
+    on the rows kept by the row filters, with Age extracted (like in the node chain)
+
+    parameters:
+    -----------
+    df: pd.DataFrame
+        Raw rows of the bmarket table
+
+    cleaning_rules: dict
+        Rules of the cleaning steps over the defaults (cleaning_rules in
+        parameters_data_preparation), see resolve_cleaning_rules
+    """
+    rules = resolve_cleaning_rules(cleaning_rules)
+    df_temp = clean_occupation(df, rules["occupation"])
+    df_temp = clean_maritalStatus(df_temp, rules["marital_status"])
+    return {
+        "Personal Loan": df_temp["Personal Loan"],
+        "Age": extract_age(df_temp[["Age"]], rules["age"])["Age"],
+    }
+
+
+def clean_contactMethod(df: pd.DataFrame, rule: dict = None) -> pd.DataFrame:
     """
     Data cleaning on Contact Method column
     Function action: Rename 'Cell' value with 'cellular' and 'Telephone' with 'telephone'
@@ -267,15 +483,15 @@ def clean_contactMethod(df: pd.DataFrame) -> pd.DataFrame:
     -----------
     df: pd.DataFrame
         Input DataFrame
+
+    rule: dict
+        Column rule of the step (cleaning_rules), CONTACT_METHOD_RULE when not given
     """
-    df_new = df.copy()
-    df_new["Contact Method"] = df_new["Contact Method"].map(
-        lambda x: "cellular" if x[0].lower() == "c" else "telephone"
-    )
+    df_new = apply_column_rules(df, [rule or CONTACT_METHOD_RULE])
     return df_new
 
 
-def clean_campaignCalls(df: pd.DataFrame) -> pd.DataFrame:
+def clean_campaignCalls(df: pd.DataFrame, rule: dict = None) -> pd.DataFrame:
     """
     Data cleaning on Campaign Calls column
     Function action: Absolute/Convert all negative values to positive
@@ -284,13 +500,15 @@ def clean_campaignCalls(df: pd.DataFrame) -> pd.DataFrame:
     -----------
     df: pd.DataFrame
         Input DataFrame
+
+    rule: dict
+        Column rule of the step (cleaning_rules), CAMPAIGN_CALLS_RULE when not given
     """
-    df_new = df.copy()
-    df_new["Campaign Calls"] = df_new["Campaign Calls"].apply(lambda x: abs(x))
+    df_new = apply_column_rules(df, [rule or CAMPAIGN_CALLS_RULE])
     return df_new
 
 
-def clean_previousContactDays(df: pd.DataFrame) -> pd.DataFrame:
+def clean_previousContactDays(df: pd.DataFrame, rule: dict = None) -> pd.DataFrame:
     """
     Data cleaning on Previous Contact Days column
     Function action: Drop Previous Contact Days and
@@ -303,15 +521,16 @@ def clean_previousContactDays(df: pd.DataFrame) -> pd.DataFrame:
     -----------
     df: pd.DataFrame
         Input DataFrame
+
+    rule: dict
+        Column rule of the step (cleaning_rules), PREVIOUS_CONTACT_DAYS_RULE when not given
     """
-    df_new = df.copy()
-    df_new["Previously Contacted"] = df_new["Previous Contact Days"] != 999
-    df_new.drop("Previous Contact Days", axis=1, inplace=True)
+    df_new = apply_column_rules(df, [rule or PREVIOUS_CONTACT_DAYS_RULE])
     df_new = _reindex_target_col(df_new)
     return df_new
 
 
-def clean_subscriptionStatus(df: pd.DataFrame) -> pd.DataFrame:
+def clean_subscriptionStatus(df: pd.DataFrame, rule: dict = None) -> pd.DataFrame:
     """
     Data cleaning on Subscription Status column
     Function action: Rename 'yes' with 1 and 'no' with 0 and convert to boolean type
@@ -320,15 +539,446 @@ def clean_subscriptionStatus(df: pd.DataFrame) -> pd.DataFrame:
     -----------
     df: pd.DataFrame
         Input DataFrame
+
+    rule: dict
+        Column rule of the step (cleaning_rules), SUBSCRIPTION_STATUS_RULE when not given
+    """
+    df_new = apply_column_rules(df, [rule or SUBSCRIPTION_STATUS_RULE])
+    return df_new
+
+
+def clean_bmarket_fused(
+    df: pd.DataFrame,
+    impute_method: str = "randdist",
+    column_rules: list = None,
+    imputers: dict = None,
+    rngs: dict = None,
+    cleaning_rules: dict = None,
+) -> pd.DataFrame:
     """
-    df_new = df.copy()
-    df_new["Subscription Status"] = df_new["Subscription Status"].map(
-        lambda x: True if x == "yes" else False
+    Fused data cleaning on the whole bmarket table
+    Function action: Apply every cleaning step of the data_preparation pipeline
+                    (clean_clientId -> impute_age) in one vectorized pass over a
+                    single frame with copy-on-write enabled, instead of creating
+                    a new copy of the table for every step.
+                    Output is identical to running the nodes one after another.
+
+    parameters:
+    -----------
+    df: pd.DataFrame
+        Input DataFrame (raw bmarket table, or bmarket read with sql_pushdown)
+
+    impute_method: str
+        "randdist" (default) or "knn", see impute_age
+
+    column_rules: list
+        Extra column rules applied last (column_rules in parameters_data_preparation)
+
+    imputers: dict
+        Fitted imputers from fit_distribution_imputers, fitted on df when not given
+
+    rngs: dict
+        Generator to draw with for every column in imputers, imputer.rng() when
+        not given
+
+    cleaning_rules: dict
+        Rules of the cleaning steps over the defaults (cleaning_rules in
+        parameters_data_preparation), see resolve_cleaning_rules
+    """
+    rules = resolve_cleaning_rules(cleaning_rules)
+    if imputers is None:
+        imputers = fit_distribution_imputers(df, cleaning_rules=cleaning_rules)
+    rngs = rngs or {}
+
+    with pd.option_context("mode.copy_on_write", True):
+        # clean_occupation & clean_maritalStatus: one combined row filter when
+        # both are drop_if_equals rules (the defaults)
+        row_rules = [rules["occupation"], rules["marital_status"]]
+        if all(rule["rule"] == "drop_if_equals" for rule in row_rules):
+            keep_rows = np.logical_and.reduce(
+                [df[rule["column"]] != rule["value"] for rule in row_rules]
+            )
+            df_new = df.loc[keep_rows]
+        else:
+            df_new = compile_rules(row_rules)(df)
+
+        # clean_clientId, clean_creditDefault & clean_housingLoan
+        # (already gone if the table was loaded with sql_pushdown)
+        df_new = df_new.drop(
+            columns=["Client ID", "Credit Default", "Housing Loan"], errors="ignore"
+        )
+
+        # extract_age
+        df_new = compile_rules([rules["age"]])(df_new)
+
+        # clean_personalLoan
+        fill_mask, fill = imputers["Personal Loan"].fill(
+            df_new["Personal Loan"], rngs.get("Personal Loan")
+        )
+        df_new.loc[fill_mask, "Personal Loan"] = fill
+
+        # clean_contactMethod -> clean_subscriptionStatus
+        df_new = compile_rules(
+            [
+                rules["contact_method"],
+                rules["campaign_calls"],
+                rules["previous_contact_days"],
+                rules["subscription_status"],
+            ]
+        )(df_new)
+        df_new = _reindex_target_col(df_new)
+
+        # impute_age
+        if impute_method == "randdist":
+            fill_mask, fill = imputers["Age"].fill(df_new["Age"], rngs.get("Age"))
+            df_new.loc[fill_mask, "Age"] = fill
+        else:
+            df_new = impute_age(df_new, impute_method=impute_method)
+
+        if column_rules:
+            df_new = compile_rules(column_rules)(df_new)
+
+    return df_new
+
+
+def clean_bmarket_streaming(
+    chunks: Iterable[pd.DataFrame],
+    column_rules: list = None,
+    imputers: dict = None,
+    cleaning_rules: dict = None,
+) -> Iterator[pd.DataFrame | dict]:
+    """
+    Streaming data cleaning on the bmarket table, one row chunk at a time
+    Function action: Pass every chunk through the data preparation node functions
+                    and yield the cleaned chunk, so Kedro writes it out before the
+                    next chunk is read. Memory stays bounded by the chunk size.
+                    The first chunk is yielded as a DataFrame (replacing
+                    cleaned_bmarket), the next ones as {part name: DataFrame}
+                    (added to it).
+
+                    Random distribution imputation needs the distribution of the
+                    whole column, so the imputers are fitted over every chunk first
+                    (fit_distribution_imputers) before the cleaning pass.
+                    The output is the same as cleaning the whole table at once.
+
+    parameters:
+    -----------
+    chunks: Iterable[pd.DataFrame]
+        Re-iterable row chunks of the raw bmarket table
+        (see egt309_pipeline.datasets.ChunkedSQLTableDataset)
+
+    column_rules: list
+        Extra column rules applied last (column_rules in parameters_data_preparation)
+
+    imputers: dict
+        Fitted imputers from fit_distribution_imputers, fitted with a first pass
+        over the chunks when not given
+
+    cleaning_rules: dict
+        Rules of the cleaning steps over the defaults (cleaning_rules in
+        parameters_data_preparation), see resolve_cleaning_rules
+    """
+    if imputers is None:
+        imputers = fit_distribution_imputers(chunks, cleaning_rules=cleaning_rules)
+
+    # Clean each chunk, drawing the imputed values from one generator per column
+    # so the draws continue across chunk boundaries
+    rngs = {col: imputer.rng() for col, imputer in imputers.items()}
+    apply_extra_rules = compile_rules(column_rules or [])
+    for i, chunk in enumerate(chunks):
+        df_new = _clean_rows(chunk, imputers, rngs, cleaning_rules)
+        # Rules only look at one row at a time, so they can run per chunk
+        df_new = apply_extra_rules(df_new)
+        # The first chunk replaces cleaned_bmarket, the next ones are added to it
+        yield df_new if i == 0 else {f"{i:05d}": df_new}
+
+
+def clean_bmarket_incremental(increment, options: dict) -> pd.DataFrame | dict:
+    """
+    Incremental (change data capture) data cleaning on the bmarket table
+    Function action: Clean only the rows added to the table since the last run,
+                    with the data preparation node functions, and return them as
+                    a new part of cleaned_bmarket. The whole table is cleaned again
+                    (and cleaned_bmarket replaced) on the first run, when the
+                    cleaning code or parameters_data_preparation changed, or when
+                    rows already read were deleted from the table.
+
+                    The checkpoint keeps the highest rowid read and the fitted
+                    imputers of Personal Loan and Age, updated with the new rows,
+                    so the new rows are drawn from the distribution of every row
+                    read so far. A rebuild gives the same output as the other
+                    execution modes.
+
+    parameters:
+    -----------
+    increment: SQLTableIncrement
+        New rows of the raw bmarket table and the checkpoint of the last run
+        (see egt309_pipeline.datasets.IncrementalSQLTableDataset)
+
+    options: dict
+        parameters_data_preparation (cleaning_rules are the rules of the cleaning
+        steps, column_rules are applied last)
+
+    returns:
+    --------
+    pd.DataFrame | dict
+        The whole cleaned table on a rebuild, else {part name: cleaned new rows}
+    """
+    checkpoint = increment.checkpoint
+    fingerprint = _cleaning_fingerprint(options)
+    rebuild = (
+        checkpoint.get("fingerprint") != fingerprint
+        or increment.count_up_to(checkpoint["watermark"]) != checkpoint["rows_read"]
+    )
+
+    watermark = 0 if rebuild else checkpoint["watermark"]
+    new_rows = increment.read_after(watermark)
+    logger.info(
+        "Incremental ingestion: %d new rows after rowid %d%s",
+        len(new_rows),
+        watermark,
+        " (full rebuild)" if rebuild else "",
+    )
+    if new_rows.empty and not rebuild:
+        return {}
+
+    cleaning_rules = options.get("cleaning_rules")
+    if rebuild:
+        imputers = fit_distribution_imputers(
+            new_rows, options.get("imputation_sampling", "cdf"), cleaning_rules
+        )
+    else:
+        imputers = {
+            col: DistributionImputer.from_dict(state)
+            for col, state in checkpoint["imputers"].items()
+        }
+        _partial_fit_imputers(imputers, new_rows, cleaning_rules)
+
+    # Seeded like the other modes on a rebuild, and per increment otherwise, so
+    # every run is reproducible
+    chunk_id = None if watermark == 0 else watermark
+    rngs = {col: imputer.rng(chunk_id) for col, imputer in imputers.items()}
+    df_new = _clean_rows(new_rows, imputers, rngs, cleaning_rules)
+    df_new = compile_rules(options.get("column_rules") or [])(df_new)
+
+    new_watermark = int(new_rows.index.max()) if len(new_rows) else watermark
+    increment.commit(
+        {
+            "fingerprint": fingerprint,
+            "watermark": new_watermark,
+            "rows_read": (0 if rebuild else checkpoint["rows_read"]) + len(new_rows),
+            "imputers": {col: imputer.to_dict() for col, imputer in imputers.items()},
+        }
+    )
+
+    if rebuild:
+        return df_new.reset_index(drop=True)
+    # Zero-padded so that the parts load in the order the rows were added
+    return {f"rowid-{watermark + 1:012d}": df_new}
+
+
+def clean_bmarket_parallel(
+    df: pd.DataFrame,
+    column_rules: list = None,
+    n_jobs: int = -1,
+    n_shards: int = None,
+    sampling_method: str = "cdf",
+    cleaning_rules: dict = None,
+) -> tuple[pd.DataFrame, dict]:
+    """
+    Parallel data cleaning on the bmarket table, in row shards on a process pool
+    Function action: Split the table into row shards and clean them in two phases:
+                    1. Statistics: every shard counts the values of Personal Loan
+                    and Age, and how many of them it has to impute. The counts
+                    are merged in table order into the imputers of the whole table.
+                    2. Apply: every shard goes through clean_bmarket_fused, with
+                    its generators moved past the draws of the shards before it.
+                    Both phases run on a pool of n_jobs processes. The output is
+                    the same as cleaning the whole table at once, whatever the
+                    number of shards or processes.
+
+    parameters:
+    -----------
+    df: pd.DataFrame
+        Input DataFrame (raw bmarket table, or bmarket read with sql_pushdown)
+
+    column_rules: list
+        Extra column rules applied last (column_rules in parameters_data_preparation)
+
+    n_jobs: int
+        Number of processes, -1 (default) uses all cores
+
+    n_shards: int
+        Number of row shards, one per process when not given
+
+    sampling_method: str
+        "cdf" (default) or "alias", see fit_distribution_imputers
+
+    cleaning_rules: dict
+        Rules of the cleaning steps over the defaults (cleaning_rules in
+        parameters_data_preparation), see resolve_cleaning_rules
+
+    returns:
+    --------
+    tuple[pd.DataFrame, dict]
+        Cleaned table and the imputers fitted on the whole table
+    """
+    import joblib  # noqa: PLC0415
+
+    n_jobs = joblib.effective_n_jobs(n_jobs)
+    bounds = np.linspace(0, len(df), (n_shards or n_jobs) + 1).astype(int)
+    shards = [df.iloc[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+    with joblib.Parallel(n_jobs=n_jobs) as parallel:
+        statistics = parallel(
+            joblib.delayed(_shard_statistics)(shard, sampling_method, cleaning_rules)
+            for shard in shards
+        )
+
+        # Merged in table order, so that values keep their order of first appearance
+        imputers = _new_imputers(sampling_method)
+        skips, shard_skips = dict.fromkeys(imputers, 0), []
+        for shard_imputers, fill_counts in statistics:
+            for col, imputer in shard_imputers.items():
+                imputers[col].merge(imputer)
+            shard_skips.append(dict(skips))
+            skips = {col: skips[col] + fill_counts[col] for col in skips}
+
+        cleaned = parallel(
+            joblib.delayed(_clean_shard)(
+                shard, imputers, skips, column_rules, cleaning_rules
+            )
+            for shard, skips in zip(shards, shard_skips)
+        )
+
+    # Empty shards could change the dtypes of the concatenated columns
+    cleaned = [shard for shard in cleaned if len(shard)] or cleaned[:1]
+    return pd.concat(cleaned), imputers
+
+
+def _shard_statistics(
+    shard: pd.DataFrame, sampling_method: str, cleaning_rules: dict = None
+) -> tuple[dict, dict]:
+    """
+    Phase 1 of clean_bmarket_parallel: imputers fitted on one shard, and the number
+    of values the shard imputes in each column
+
+    parameters:
+    -----------
+    shard: pd.DataFrame
+        Rows of the bmarket table (raw, or read with sql_pushdown)
+
+    sampling_method: str
+        See fit_distribution_imputers
+
+    cleaning_rules: dict
+        Rules of the cleaning steps over the defaults (cleaning_rules in
+        parameters_data_preparation), see resolve_cleaning_rules
+    """
+    imputers = _new_imputers(sampling_method)
+    fill_counts = {}
+    for col, values in _imputed_columns(shard, cleaning_rules).items():
+        imputers[col].partial_fit(values)
+        fill_counts[col] = int(imputers[col].fill_mask(values).sum())
+    return imputers, fill_counts
+
+
+def _clean_shard(
+    shard: pd.DataFrame,
+    imputers: dict,
+    skips: dict,
+    column_rules: list = None,
+    cleaning_rules: dict = None,
+) -> pd.DataFrame:
+    """
+    Phase 2 of clean_bmarket_parallel: clean one shard
+
+    parameters:
+    -----------
+    shard: pd.DataFrame
+        Rows of the bmarket table (raw, or read with sql_pushdown)
+
+    imputers: dict
+        Imputers fitted on the whole table
+
+    skips: dict
+        Number of values imputed in the shards before this one, in each column
+
+    column_rules: list
+        Extra column rules applied last
+
+    cleaning_rules: dict
+        Rules of the cleaning steps over the defaults (cleaning_rules in
+        parameters_data_preparation), see resolve_cleaning_rules
+    """
+    rngs = {col: imputer.rng(skip=skips[col]) for col, imputer in imputers.items()}
+    return clean_bmarket_fused(
+        shard, "randdist", column_rules, imputers, rngs, cleaning_rules
+    )
+
+
+def _clean_rows(
+    df: pd.DataFrame, imputers: dict, rngs: dict, cleaning_rules: dict = None
+) -> pd.DataFrame:
+    """
+    Pass raw rows of the bmarket table through the data preparation node functions,
+    with random distribution imputation from fitted imputers
+
+    parameters:
+    -----------
+    df: pd.DataFrame
+        Raw rows of the bmarket table
+
+    imputers: dict
+        Fitted imputers from fit_distribution_imputers
+
+    rngs: dict
+        Generator to draw with for every column in imputers
+
+    cleaning_rules: dict
+        Rules of the cleaning steps over the defaults (cleaning_rules in
+        parameters_data_preparation), see resolve_cleaning_rules
+    """
+    rules = resolve_cleaning_rules(cleaning_rules)
+    df_new = clean_clientId(df)
+    df_new = extract_age(df_new, rules["age"])
+    df_new = clean_occupation(df_new, rules["occupation"])
+    df_new = clean_maritalStatus(df_new, rules["marital_status"])
+    df_new = clean_housingLoan(clean_creditDefault(df_new))
+
+    fill_mask, fill = imputers["Personal Loan"].fill(
+        df_new["Personal Loan"], rngs["Personal Loan"]
     )
+    df_new.loc[fill_mask, "Personal Loan"] = fill
+
+    df_new = clean_contactMethod(df_new, rules["contact_method"])
+    df_new = clean_campaignCalls(df_new, rules["campaign_calls"])
+    df_new = clean_previousContactDays(df_new, rules["previous_contact_days"])
+    df_new = clean_subscriptionStatus(df_new, rules["subscription_status"])
+
+    fill_mask, fill = imputers["Age"].fill(df_new["Age"], rngs["Age"])
+    df_new.loc[fill_mask, "Age"] = fill
     return df_new
 
 
-def encoder_selection(encoder: str = "ohe") -> Union[OneHotEncoder, LabelEncoder]:
+def _cleaning_fingerprint(options: dict) -> str:
+    """
+    Hash of the data_preparation source code and parameters, which changes
+    whenever the cleaned table would
+
+    parameters:
+    -----------
+    options: dict
+        parameters_data_preparation
+    """
+    digest = hashlib.sha256()
+    for source in sorted(Path(__file__).parent.glob("*.py")):
+        digest.update(source.read_bytes())
+    digest.update(json.dumps(options, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def encoder_selection(encoder: str = "ohe") -> OneHotEncoder | LabelEncoder:
     """
     Select One Hot Encoding or Integer Encoding method
 
@@ -338,6 +988,8 @@ def encoder_selection(encoder: str = "ohe") -> Union[OneHotEncoder, LabelEncoder
         ohe: one hot encoding
         int: integer encoding
     """
+    from sklearn.preprocessing import LabelEncoder, OneHotEncoder  # noqa: PLC0415
+
     match encoder:
         case "ohe":
             encoder = OneHotEncoder()
@@ -348,7 +1000,7 @@ def encoder_selection(encoder: str = "ohe") -> Union[OneHotEncoder, LabelEncoder
     return encoder
 
 
-def ohe_encode(df: pd.DataFrame) -> pd.DataFrame:
+def ohe_encode(df: pd.DataFrame, encoder: CategoricalEncoder = None) -> pd.DataFrame:
     """
     One hot encode all object type columns in input DataFrame
 
@@ -356,23 +1008,17 @@ def ohe_encode(df: pd.DataFrame) -> pd.DataFrame:
     -----------
     df: pd.DataFrame
         Input DataFrame
+
+    encoder: CategoricalEncoder
+        Fitted encoder to apply (e.g. fitted on the training split, so the test
+        split gets the same columns); a new one is fitted on df when not given
     """
-    encoder = encoder_selection("ohe")
-    df_copy = df.copy()
-    df_encode = pd.DataFrame(index=df_copy.index)
-
-    for col in df_copy.columns:
-        if df_copy[col].dtype == "object":
-            encoded = encoder.fit_transform(df_copy[[col]])
-            value_col = encoder.get_feature_names_out([col])
-            encoded_df = pd.DataFrame(encoded, columns=value_col, index=df_copy.index)
-            df_encode = pd.concat([df_encode, encoded_df], axis=1)
-        else:
-            df_encode[col] = df_copy[col]
-    return df_encode
+    if encoder is None:
+        encoder = _fit_object_encoder(df, "ohe")
+    return encoder.transform(df)
 
 
-def int_encode(df: pd.DataFrame) -> pd.DataFrame:
+def int_encode(df: pd.DataFrame, encoder: CategoricalEncoder = None) -> pd.DataFrame:
     """
     Integer encode all object type columns in input DataFrame
 
@@ -380,25 +1026,29 @@ def int_encode(df: pd.DataFrame) -> pd.DataFrame:
     -----------
     df: pd.DataFrame
         Input DataFrame
+
+    encoder: CategoricalEncoder
+        Fitted encoder to apply, see ohe_encode
     """
-    encoder = encoder_selection("int")
-    df_copy = df.copy()
-    df_encode = pd.DataFrame(index=df_copy.index)
+    if encoder is None:
+        encoder = _fit_object_encoder(df, "int")
+    return encoder.transform(df)
 
-    for col in df_copy.columns:
-        if df_copy[col].dtype == "object":
-            df_encode[col] = encoder.fit_transform(df_copy[col])
-        else:
-            df_encode[col] = df_copy[col]
-    return df_encode
+
+def _fit_object_encoder(df: pd.DataFrame, encoding: str) -> CategoricalEncoder:
+    # Encoder of the object type columns of df, fitted once for all of them
+    from egt309_pipeline.encoding import CategoricalEncoder  # noqa: PLC0415
+
+    object_cols = [col for col in df.columns if df[col].dtype == "object"]
+    return CategoricalEncoder(encoding=encoding, columns=object_cols).fit(df)
 
 
 def my_train_test_split(
     df: pd.DataFrame, val_sample: bool = False, test_size: int = 0.2, rs: int = 42
-) -> Union[
-    Tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series],
-    Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.Series, pd.Series, pd.Series],
-]:
+) -> (
+    tuple[pd.DataFrame, pd.DataFrame, pd.Series, pd.Series]
+    | tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame, pd.Series, pd.Series, pd.Series]
+):
     """
     Split input DataFrame into train, test and val(optional)
 
@@ -416,6 +1066,8 @@ def my_train_test_split(
     rs: int
       Set random state for randomness
     """
+    from sklearn.model_selection import train_test_split  # noqa: PLC0415
+
     label = "Subscription Status"
     X, y = df.drop(label, axis=1), df[label]
     if val_sample:
@@ -436,7 +1088,7 @@ def my_train_test_split(
 
 def smote(
     X_train: pd.DataFrame, y_train: pd.Series, rs: int = 42
-) -> Tuple[pd.DataFrame, pd.Series]:
+) -> tuple[pd.DataFrame, pd.Series]:
     """
     Apply SMOTE to training dataset
 
@@ -449,6 +1101,8 @@ def smote(
     rs: int
       Set random state for randomness
     """
+    from imblearn.over_sampling import SMOTE  # noqa: PLC0415
+
     smote = SMOTE(random_state=rs)
     X_train_res, y_train_res = smote.fit_resample(X_train, y_train)
     X_train_res, y_train_res = pd.DataFrame(X_train_res), pd.Series(y_train_res)
@@ -3,86 +3,377 @@ This is a boilerplate pipeline 'data_preparation'
 generated using Kedro 1.0.0
 """
 
+from functools import partial, update_wrapper
+
 from kedro.pipeline import Node, Pipeline  # noqa
-from .nodes import *
+
+from egt309_pipeline.config import project_parameters
+
+from .column_rules import apply_column_rules
+from .nodes import (
+    CLEANING_RULES,
+    clean_bmarket_fused,
+    clean_bmarket_incremental,
+    clean_bmarket_parallel,
+    clean_bmarket_streaming,
+    clean_campaignCalls,
+    clean_clientId,
+    clean_contactMethod,
+    clean_creditDefault,
+    clean_housingLoan,
+    clean_maritalStatus,
+    clean_occupation,
+    clean_personalLoan,
+    clean_previousContactDays,
+    clean_subscriptionStatus,
+    extract_age,
+    fit_distribution_imputers,
+    impute_age,
+    resolve_cleaning_rules,
+)
+from .sql_pushdown import is_pushdown_step, read_with_pushdown
+
+# Options of create_pipeline, with their defaults when parameters_data_preparation
+# does not set them
+_OPTION_DEFAULTS = {
+    "execution_mode": "nodes",
+    "sql_pushdown": False,
+    "column_rules": [],
+    "imputation_sampling": "cdf",
+    "parallel": {},
+    "cleaning_rules": {},
+}
 
 
 def create_pipeline(**kwargs) -> Pipeline:
+    """
+    Builds the data preparation pipeline.
+
+    The options not passed in as keyword arguments are read from
+    parameters_data_preparation of the session's parameters (see
+    project_parameters) when the pipeline is built, so they follow `kedro run
+    --params` (e.g. `--params parameters_data_preparation.execution_mode=fused`)
+    and `--env`.
+
+    execution_mode:
+        "nodes" (default): one node per cleaning step
+        "fused": every cleaning step in a single node (see clean_bmarket_fused)
+        "streaming": cleans the table in row chunks (see clean_bmarket_streaming)
+        "incremental": cleans only the rows added since the last run and adds them
+            to cleaned_bmarket (see clean_bmarket_incremental)
+        "parallel": cleans row shards of the table on a process pool, configured
+            by parallel: {n_jobs, n_shards} (see clean_bmarket_parallel)
+
+    sql_pushdown reads bmarket through bmarket_table with every step tagged with
+    @sql_pushdown run by the database, and drops those steps from the pipeline.
+
+    column_rules are extra column rules (see column_rules.py) applied to the
+    cleaned table in every mode.
+
+    cleaning_rules are the rules of the cleaning steps, {step key: rule} over the
+    defaults of CLEANING_RULES in nodes.py. The step nodes read them as params:
+    inputs.
+
+    imputation_sampling is the sampling table of the random distribution
+    imputers fitted by fit_distribution_imputers: "cdf" (default) or "alias".
+    """
+    options = _pipeline_options(kwargs)
+    # Fails on unknown keys when the pipeline is built rather than when it runs
+    resolve_cleaning_rules(options["cleaning_rules"])
     return Pipeline(
         namespace="Data Preparation",
         prefix_datasets_with_namespace=False,
-        nodes=[
-            Node(
-                func=clean_clientId,
-                inputs="bmarket",
-                outputs="df_clientID_cleaned",
-                name="clean_clientID_node",
-            ),
-            Node(
-                func=extract_age,
-                inputs="df_clientID_cleaned",
-                outputs="df_age_extracted",
-                name="age_extracted_node",
-            ),
-            Node(
-                func=clean_occupation,
-                inputs="df_age_extracted",
-                outputs="df_occupation_cleaned",
-                name="clean_occupation_node",
-            ),
-            Node(
-                func=clean_maritalStatus,
-                inputs="df_occupation_cleaned",
-                outputs="df_maritalStatus_cleaned",
-                name="clean_maritalStatus_node",
-            ),
-            Node(
-                func=clean_creditDefault,
-                inputs="df_maritalStatus_cleaned",
-                outputs="df_creditDefault_cleaned",
-                name="clean_creditDefault_node",
-            ),
-            Node(
-                func=clean_housingLoan,
-                inputs="df_creditDefault_cleaned",
-                outputs="df_housingLoan_cleaned",
-                name="clean_housingLoan_node",
-            ),
-            Node(
-                func=clean_personalLoan,
-                inputs="df_housingLoan_cleaned",
-                outputs="df_personalLoan_cleaned",
-                name="clean_personalLoan_node",
-            ),
-            Node(
-                func=clean_contactMethod,
-                inputs="df_personalLoan_cleaned",
-                outputs="df_contactMethod_cleaned",
-                name="clean_contactMethod_node",
-            ),
-            Node(
-                func=clean_campaignCalls,
-                inputs="df_contactMethod_cleaned",
-                outputs="df_campaignCalls_cleaned",
-                name="clean_campaignCalls_node",
+        nodes=_mode_nodes(**options),
+    )
+
+
+def _pipeline_options(overrides: dict) -> dict:
+    # Options of create_pipeline: those passed in, the others from the session's
+    # parameters (its --env & --params), shared by every pipeline
+    options = {
+        name: overrides[name]
+        for name in _OPTION_DEFAULTS
+        if overrides.get(name) is not None
+    }
+    if len(options) < len(_OPTION_DEFAULTS):
+        parameters = project_parameters()["parameters_data_preparation"]
+        for name, default in _OPTION_DEFAULTS.items():
+            if name not in options:
+                value = parameters.get(name)
+                options[name] = default if value is None else value
+    return options
+
+
+def _mode_nodes(execution_mode: str, sql_pushdown: bool, **options) -> list:
+    # Nodes of an execution_mode; options are the other options of create_pipeline
+    column_rules = options["column_rules"]
+    imputation_sampling = options["imputation_sampling"]
+    cleaning_rules = options["cleaning_rules"]
+    if sql_pushdown and execution_mode in ("streaming", "incremental"):
+        raise ValueError(f"sql_pushdown is not supported in '{execution_mode}' mode")
+
+    if execution_mode == "nodes":
+        return _cleaning_step_nodes(
+            sql_pushdown, column_rules, imputation_sampling, cleaning_rules
+        )
+    if execution_mode == "fused":
+        return _fused_nodes(
+            sql_pushdown, column_rules, imputation_sampling, cleaning_rules
+        )
+    if execution_mode == "streaming":
+        return _streaming_nodes(column_rules, imputation_sampling, cleaning_rules)
+    if execution_mode == "incremental":
+        return _incremental_nodes()
+    if execution_mode == "parallel":
+        return _parallel_nodes(
+            sql_pushdown,
+            column_rules,
+            imputation_sampling,
+            options["parallel"] or {},
+            cleaning_rules,
+        )
+    raise ValueError(
+        "execution_mode must be 'nodes', 'fused', 'streaming', 'incremental' or "
+        "'parallel'"
+    )
+
+
+_COLUMN_RULES_PARAM = "params:parameters_data_preparation.column_rules"
+_CLEANING_RULES_PARAM = "params:parameters_data_preparation.cleaning_rules"
+_IMPUTERS = "distribution_imputers"
+
+# (function, output dataset, node name, cleaning_rules key) of every cleaning
+# step, in order
+_CLEANING_STEPS = [
+    (clean_clientId, "df_clientID_cleaned", "clean_clientID_node", None),
+    (extract_age, "df_age_extracted", "age_extracted_node", "age"),
+    (
+        clean_occupation,
+        "df_occupation_cleaned",
+        "clean_occupation_node",
+        "occupation",
+    ),
+    (
+        clean_maritalStatus,
+        "df_maritalStatus_cleaned",
+        "clean_maritalStatus_node",
+        "marital_status",
+    ),
+    (
+        clean_creditDefault,
+        "df_creditDefault_cleaned",
+        "clean_creditDefault_node",
+        None,
+    ),
+    (clean_housingLoan, "df_housingLoan_cleaned", "clean_housingLoan_node", None),
+    (clean_personalLoan, "df_personalLoan_cleaned", "clean_personalLoan_node", None),
+    (
+        clean_contactMethod,
+        "df_contactMethod_cleaned",
+        "clean_contactMethod_node",
+        "contact_method",
+    ),
+    (
+        clean_campaignCalls,
+        "df_campaignCalls_cleaned",
+        "clean_campaignCalls_node",
+        "campaign_calls",
+    ),
+    (
+        clean_previousContactDays,
+        "df_previousContactDays_cleaned",
+        "clean_previousContactDays_node",
+        "previous_contact_days",
+    ),
+    (
+        clean_subscriptionStatus,
+        "df_subscriptionStatus_cleaned",
+        "clean_subscriptionStatus_node",
+        "subscription_status",
+    ),
+    (impute_age, "cleaned_bmarket", "age_imputed_node", None),
+]
+
+
+def _pushdown_steps(cleaning_rules: dict = None) -> list:
+    # Steps tagged with @sql_pushdown, but for those whose rule cleaning_rules
+    # changes: their tag is the SQL of the default rule, so they run in pandas
+    rules = resolve_cleaning_rules(cleaning_rules)
+    return [
+        func
+        for func, _, _, key in _CLEANING_STEPS
+        if is_pushdown_step(func) and (key is None or rules[key] == CLEANING_RULES[key])
+    ]
+
+
+def _named_partial(func, **kwargs):
+    # partial with the name of func, which Kedro logs (instead of <partial>)
+    return update_wrapper(partial(func, **kwargs), func)
+
+
+def _pushdown_node(steps: list) -> Node:
+    return Node(
+        func=_named_partial(read_with_pushdown, steps=steps),
+        inputs="bmarket_table",
+        outputs="bmarket_pushed_down",
+        name="read_bmarket_pushdown_node",
+    )
+
+
+def _fit_imputers_node(
+    source: str, imputation_sampling: str = "cdf", cleaning_rules: dict = None
+) -> Node:
+    return Node(
+        func=_named_partial(
+            fit_distribution_imputers, sampling_method=imputation_sampling
+        ),
+        inputs=_with_column_rules(None, cleaning_rules, df=source),
+        outputs=_IMPUTERS,
+        name="fit_distribution_imputers_node",
+    )
+
+
+def _with_column_rules(
+    column_rules: list, cleaning_rules: dict = None, **inputs
+) -> dict:
+    # Inputs of a node whose function takes optional column_rules & cleaning_rules
+    # arguments
+    if column_rules:
+        inputs["column_rules"] = _COLUMN_RULES_PARAM
+    if cleaning_rules:
+        inputs["cleaning_rules"] = _CLEANING_RULES_PARAM
+    return inputs
+
+
+def _fused_nodes(
+    sql_pushdown: bool = False,
+    column_rules: list = None,
+    imputation_sampling="cdf",
+    cleaning_rules: dict = None,
+) -> list:
+    nodes, source = [], "bmarket"
+    if sql_pushdown:
+        nodes.append(_pushdown_node(_pushdown_steps(cleaning_rules)))
+        source = "bmarket_pushed_down"
+
+    nodes.append(_fit_imputers_node(source, imputation_sampling, cleaning_rules))
+    nodes.append(
+        Node(
+            func=clean_bmarket_fused,
+            inputs=_with_column_rules(
+                column_rules, cleaning_rules, df=source, imputers=_IMPUTERS
             ),
-            Node(
-                func=clean_previousContactDays,
-                inputs="df_campaignCalls_cleaned",
-                outputs="df_previousContactDays_cleaned",
-                name="clean_previousContactDays_node",
+            outputs="cleaned_bmarket",
+            name="clean_bmarket_fused_node",
+        )
+    )
+    return nodes
+
+
+def _streaming_nodes(
+    column_rules: list = None, imputation_sampling="cdf", cleaning_rules: dict = None
+) -> list:
+    return [
+        # Fitted in a first pass over the chunks
+        _fit_imputers_node("bmarket_chunks", imputation_sampling, cleaning_rules),
+        # Generator node: Kedro saves every yielded chunk to cleaned_bmarket
+        Node(
+            func=clean_bmarket_streaming,
+            inputs=_with_column_rules(
+                column_rules,
+                cleaning_rules,
+                chunks="bmarket_chunks",
+                imputers=_IMPUTERS,
             ),
-            Node(
-                func=clean_subscriptionStatus,
-                inputs="df_previousContactDays_cleaned",
-                outputs="df_subscriptionStatus_cleaned",
-                name="clean_subscriptionStatus_node",
+            outputs="cleaned_bmarket",
+            name="clean_bmarket_streaming_node",
+        ),
+    ]
+
+
+def _parallel_nodes(
+    sql_pushdown: bool = False,
+    column_rules: list = None,
+    imputation_sampling="cdf",
+    parallel: dict = None,
+    cleaning_rules: dict = None,
+) -> list:
+    nodes, source = [], "bmarket"
+    if sql_pushdown:
+        nodes.append(_pushdown_node(_pushdown_steps(cleaning_rules)))
+        source = "bmarket_pushed_down"
+
+    parallel = parallel or {}
+    nodes.append(
+        # The imputers are fitted by the statistics phase of the node
+        Node(
+            func=_named_partial(
+                clean_bmarket_parallel,
+                n_jobs=parallel.get("n_jobs", -1),
+                n_shards=parallel.get("n_shards"),
+                sampling_method=imputation_sampling,
             ),
+            inputs=_with_column_rules(column_rules, cleaning_rules, df=source),
+            outputs=["cleaned_bmarket", _IMPUTERS],
+            name="clean_bmarket_parallel_node",
+        )
+    )
+    return nodes
+
+
+def _incremental_nodes() -> list:
+    return [
+        # bmarket_increment saves its checkpoint once cleaned_bmarket is written
+        Node(
+            func=clean_bmarket_incremental,
+            inputs=["bmarket_increment", "params:parameters_data_preparation"],
+            outputs="cleaned_bmarket",
+            confirms="bmarket_increment",
+            name="clean_bmarket_incremental_node",
+        ),
+    ]
+
+
+def _cleaning_step_nodes(
+    sql_pushdown: bool = False,
+    column_rules: list = None,
+    imputation_sampling="cdf",
+    cleaning_rules: dict = None,
+) -> list:
+    nodes, source = [], "bmarket"
+    pushed_down = _pushdown_steps(cleaning_rules) if sql_pushdown else []
+    if sql_pushdown:
+        nodes.append(_pushdown_node(pushed_down))
+        source = "bmarket_pushed_down"
+    nodes.append(_fit_imputers_node(source, imputation_sampling, cleaning_rules))
+
+    # Chain the steps, each one reading the output of the one before it
+    for func, output, name, rule_key in _CLEANING_STEPS:
+        if func in pushed_down:
+            continue
+        # The column rules node writes cleaned_bmarket instead of the last step
+        if column_rules and output == "cleaned_bmarket":
+            source_next = "df_age_imputed"
+        else:
+            source_next = output
+        # The random distribution imputation steps draw from the fitted imputers
+        if func in (clean_personalLoan, impute_age):
+            inputs = {"df": source, "imputers": _IMPUTERS}
+        # The steps with a rule in cleaning_rules read it as a parameter
+        elif rule_key in (cleaning_rules or {}):
+            inputs = {"df": source, "rule": f"{_CLEANING_RULES_PARAM}.{rule_key}"}
+        else:
+            inputs = source
+        nodes.append(Node(func=func, inputs=inputs, outputs=source_next, name=name))
+        source = source_next
+
+    if column_rules:
+        nodes.append(
             Node(
-                func=impute_age,
-                inputs="df_subscriptionStatus_cleaned",
+                func=apply_column_rules,
+                inputs=[source, _COLUMN_RULES_PARAM],
                 outputs="cleaned_bmarket",
-                name="age_imputed_node",
-            ),
-        ],
-    )
+                name="apply_column_rules_node",
+            )
+        )
+    return nodes
@@ -0,0 +1,95 @@
+"""
+SQL pushdown for the data_preparation pipeline.
+
+Cleaning steps that only drop columns, or only drop rows holding a given value, can
+be run by the database instead of pandas. Such steps are tagged with the
+sql_pushdown decorator, and build_pushdown_query turns the tags of a list of steps
+into a single SELECT, so the rows and columns those steps would discard are never
+read out of the database.
+
+sqlalchemy is only imported to build a query: the decorator is applied when the
+pipelines are built, by every kedro command.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    import sqlalchemy as sa
+
+
+def sql_pushdown(
+    drop_columns: Iterable[str] = (), drop_rows_equal: dict[str, Any] = None
+) -> Callable:
+    """
+    Tag a cleaning step with the SQL equivalent of what it does.
+
+    parameters:
+    -----------
+    drop_columns: Iterable[str]
+        Columns the step drops (pushed down as a projection)
+
+    drop_rows_equal: dict
+        {column: value}, the step drops rows where column == value
+        (pushed down as "column IS NOT value", so NULLs are kept like in pandas)
+    """
+
+    def decorator(func: Callable) -> Callable:
+        func.sql_pushdown = {
+            "drop_columns": list(drop_columns),
+            "drop_rows_equal": dict(drop_rows_equal or {}),
+        }
+        return func
+
+    return decorator
+
+
+def is_pushdown_step(func: Callable) -> bool:
+    """Whether func was tagged with sql_pushdown"""
+    return hasattr(func, "sql_pushdown")
+
+
+def build_pushdown_query(table: sa.Table, steps: Iterable[Callable]) -> sa.Select:
+    """
+    Build one SELECT on table that applies every step in steps
+
+    parameters:
+    -----------
+    table: sa.Table
+        Source table
+
+    steps: Iterable[Callable]
+        Cleaning steps tagged with sql_pushdown
+    """
+    import sqlalchemy as sa  # noqa: PLC0415
+
+    dropped_columns, predicates = set(), []
+    for step in steps:
+        if not is_pushdown_step(step):
+            raise ValueError(f"{step.__name__} cannot be pushed down to SQL")
+
+        dropped_columns.update(step.sql_pushdown["drop_columns"])
+        for column, value in step.sql_pushdown["drop_rows_equal"].items():
+            predicates.append(table.c[column].is_distinct_from(value))
+
+    columns = [column for column in table.c if column.name not in dropped_columns]
+    return sa.select(*columns).where(*predicates)
+
+
+def read_with_pushdown(table, steps: Iterable[Callable]) -> pd.DataFrame:
+    """
+    Load the source table with steps already applied by the database
+
+    parameters:
+    -----------
+    table: egt309_pipeline.datasets.SQLTableHandle
+        Handle on the source table (see SQLTableHandleDataset)
+
+    steps: Iterable[Callable]
+        Cleaning steps tagged with sql_pushdown
+    """
+    return table.read(build_pushdown_query(table.table, steps))
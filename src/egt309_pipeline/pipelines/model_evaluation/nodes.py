@@ -2,24 +2,19 @@
 # Autoformatted & Linted with Ruff
 # Docstrings follow numpy Python Docstring Format
 
-from typing import Dict, Tuple, Type
+# matplotlib, seaborn & sklearn are imported by the functions that use them, so
+# building the pipelines (every kedro command) does not import them
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Tuple, Type
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
-from matplotlib.figure import Figure
-from sklearn.base import BaseEstimator
-from sklearn.inspection import permutation_importance
-from sklearn.metrics import (
-    accuracy_score,
-    confusion_matrix,
-    f1_score,
-    precision_score,
-    recall_score,
-    roc_auc_score,
-    roc_curve,
-)
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+    from sklearn.base import BaseEstimator
 
 #############
 # Utilities #
@@ -30,6 +25,14 @@ def _measure_error(y_test: pd.Series, y_pred: np.ndarray, y_proba: np.ndarray) -
     """
     Calculates multiple metrics that will be used to evaluate model performance.
     """
+    from sklearn.metrics import (  # noqa: PLC0415
+        accuracy_score,
+        f1_score,
+        precision_score,
+        recall_score,
+        roc_auc_score,
+    )
+
     return {
         "accuracy": accuracy_score(y_test, y_pred),
         "precision": precision_score(y_test, y_pred),
@@ -46,6 +49,10 @@ def _plot_confusion_matrix(y_test: pd.Series, y_pred: np.ndarray) -> Figure:
     """
     Plots the confusion matrix of the model.
     """
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+    import seaborn as sns  # noqa: PLC0415
+    from sklearn.metrics import confusion_matrix  # noqa: PLC0415
+
     fig_cm = plt.figure(figsize=(8, 6))
     cm = confusion_matrix(y_test, y_pred)
     ax = sns.heatmap(cm, annot=True, fmt="d")
@@ -66,6 +73,9 @@ def _plot_auc_roc(
     """
     Plots the AUC-ROC graph.
     """
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+    from sklearn.metrics import roc_curve  # noqa: PLC0415
+
     fpr, tpr, _ = roc_curve(y_test, y_proba)
     fig_roc = plt.figure(figsize=(8, 6))
 
@@ -87,6 +97,10 @@ def _plot_permutation_importance(
     Calculates the feature importance for model.
     Docs: https://scikit-learn.org/stable/modules/permutation_importance.html
     """
+    import matplotlib.pyplot as plt  # noqa: PLC0415
+    import seaborn as sns  # noqa: PLC0415
+    from sklearn.inspection import permutation_importance  # noqa: PLC0415
+
     r = permutation_importance(
         model,
         X_test,
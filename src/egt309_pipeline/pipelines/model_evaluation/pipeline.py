@@ -1,21 +1,13 @@
-from pathlib import Path
-
-from kedro.config import (
-    OmegaConfigLoader,  # Docs: https://docs.kedro.org/en/0.19.10/api/kedro.config.OmegaConfigLoader.html
-)
-from kedro.framework.project import settings
 from kedro.pipeline import Node, Pipeline
 
+from egt309_pipeline.config import project_parameters
+
 from .nodes import evaluate_model
 
 
 def create_pipeline(**kwargs) -> Pipeline:
-    # Loader is used to load all configurations defined within the /conf/base/** dir
-    conf_loader = OmegaConfigLoader(
-        conf_source=str(Path.cwd() / settings.CONF_SOURCE),
-        **settings.CONFIG_LOADER_ARGS,
-    )
-    parameters = conf_loader["parameters"]
+    # Parameters of the session (its --env & --params), shared by every pipeline
+    parameters = project_parameters()
 
     nodes = []
     model_registry = parameters["model_registry_config"]
@@ -0,0 +1,149 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+from __future__ import annotations
+
+import inspect
+import logging
+import os
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import joblib
+
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
+
+logger = logging.getLogger(__name__)
+
+# Estimator parameters that set the number of threads of a model
+_THREAD_PARAMS = ("n_jobs", "thread_count")
+
+# Environment variable holding the cores a runner gives to the node it runs (set
+# by the SharedMemoryRunner from the node's declared cpus); when set, it is the
+# model_cores of the node's budget
+NODE_CPUS_ENV = "EGT309_NODE_CPUS"
+
+
+@dataclass(frozen=True)
+class CPUBudget:
+    """
+    Split of a global core budget between the models trained at the same time, the
+    workers of each model's hyperparameter search and each worker's threads.
+
+    search_workers * estimator_threads never exceeds the cores of one model, and
+    the cores of all models never exceed the budget, so nested n_jobs=-1 can no
+    longer run (cores)^2 threads.
+
+    Parameters
+    ----------
+    total_cores: int
+        Cores of the whole budget
+
+    model_cores: int
+        Cores of one training node
+
+    search_workers: int
+        Parallel fits of the hyperparameter search (processes)
+
+    estimator_threads: int
+        Threads of every fit (model n_jobs/thread_count, BLAS & OpenMP pools)
+
+    preprocessor_jobs: int
+        n_jobs of the ColumnTransformer
+    """
+
+    total_cores: int
+    model_cores: int
+    search_workers: int
+    estimator_threads: int
+    preprocessor_jobs: int = 1
+
+    def search_context(self) -> joblib.parallel_config:
+        """
+        Context for the hyperparameter search: its worker processes limit their
+        BLAS & OpenMP thread pools to estimator_threads
+        """
+        return joblib.parallel_config(
+            backend="loky", inner_max_num_threads=self.estimator_threads
+        )
+
+
+def plan_cpu_budget(options: dict, parallel_fits: int = None) -> CPUBudget:
+    """
+    Splits the core budget of parameters_model_training.
+
+    Parameters
+    ----------
+    options: dict
+        Defined in parameters_model_training.yml under key 'parameters_model_training';
+        'cpu_budget' holds:
+            total_cores: cores to use, null for every core
+            concurrent_models: training nodes run at the same time by the Kedro
+                runner (1 with the default SequentialRunner)
+            search_workers: parallel fits of each search, null to let the budget
+                decide
+
+    parallel_fits: int, optional
+        Highest number of fits the search can run at once (e.g. cv_splits for a
+        search that evaluates one candidate at a time); more workers would idle
+
+    When the node runs with a number of cores given by its runner (NODE_CPUS_ENV,
+    set by the SharedMemoryRunner from the node's declared cpus), the model gets
+    those cores instead of total_cores // concurrent_models.
+
+    Returns
+    -------
+    CPUBudget
+        Cores of every level
+
+    Example
+    -------
+        # 32 cores, 2 models at once, 5 CV folds
+        plan_cpu_budget({"cv_splits": 5, "cpu_budget": {"total_cores": 32, "concurrent_models": 2}}, 5)
+        CPUBudget(total_cores=32, model_cores=16, search_workers=5, estimator_threads=3, preprocessor_jobs=1)
+    """
+    budget = options.get("cpu_budget") or {}
+    total_cores = budget.get("total_cores") or joblib.cpu_count()
+    concurrent_models = max(1, budget.get("concurrent_models", 1))
+    model_cores = max(1, total_cores // concurrent_models)
+    if os.environ.get(NODE_CPUS_ENV):
+        model_cores = max(1, int(os.environ[NODE_CPUS_ENV]))
+
+    search_workers = budget.get("search_workers") or model_cores
+    if parallel_fits:
+        search_workers = min(search_workers, parallel_fits)
+    search_workers = max(1, min(search_workers, model_cores))
+
+    return CPUBudget(
+        total_cores=total_cores,
+        model_cores=model_cores,
+        search_workers=search_workers,
+        estimator_threads=max(1, model_cores // search_workers),
+    )
+
+
+def limit_model_threads(model: BaseEstimator, threads: int) -> BaseEstimator:
+    """
+    Sets the thread parameters of a model (n_jobs, thread_count) to threads,
+    overriding the value from its model_params (e.g. n_jobs: -1).
+
+    Parameters
+    ----------
+    model: BaseEstimator
+        Initialised model
+
+    threads: int
+        Threads of every fit of the model
+
+    Returns
+    -------
+    BaseEstimator
+        The same model
+    """
+    params = set(model.get_params()) | set(inspect.signature(type(model)).parameters)
+    for name in _THREAD_PARAMS:
+        if name in params:
+            model.set_params(**{name: threads})
+            logger.debug(f"Set {type(model).__name__} {name}={threads}")
+    return model
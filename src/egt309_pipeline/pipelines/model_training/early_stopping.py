@@ -0,0 +1,147 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+from sklearn.base import BaseEstimator, ClassifierMixin, clone
+from sklearn.model_selection import train_test_split
+
+# Parameter holding the number of boosting rounds of every supported library
+ROUNDS_PARAMS = {
+    "xgboost": "n_estimators",
+    "lightgbm": "n_estimators",
+    "catboost": "iterations",
+}
+
+
+class EarlyStoppingClassifier(ClassifierMixin, BaseEstimator):
+    """
+    Wrapper that fits a boosted model (XGBoost, LightGBM or CatBoost) with native
+    early stopping.
+
+    Every fit carves a stratified validation slice out of the data it is given
+    (e.g. the training part of a CV fold, already preprocessed when the wrapper is
+    the model step of a Pipeline), boosts on the rest with the model's number of
+    rounds as a cap, and stops once the validation metric (eval_metric, or the
+    model's own metric) has not improved for `rounds` rounds. Predictions use the
+    best round.
+
+    Parameters
+    ----------
+    estimator: BaseEstimator
+        XGBClassifier, LGBMClassifier or CatBoostClassifier; its n_estimators /
+        iterations is the maximum number of rounds
+
+    rounds: int, default=50
+        Rounds without improvement before boosting stops
+
+    validation_fraction: float, default=0.1
+        Share of the data held out for early stopping
+
+    eval_metric: str, optional
+        Validation metric, in the naming of the model's library (e.g. "auc" for
+        XGBoost & LightGBM, "AUC" for CatBoost); the model's metric when not given.
+        A ranking metric suits models trained with class weights, whose
+        (unweighted) validation loss often worsens from the first rounds
+
+    random_state: int, optional
+        Seed of the validation slice
+
+    Attributes
+    ----------
+    estimator_: BaseEstimator
+        Fitted model
+
+    best_iteration_: int
+        Number of rounds up to the best one
+
+    Example
+    -------
+        model = Pipeline(
+            [("preprocessor", preprocessor), ("model", EarlyStoppingClassifier(XGBClassifier(n_estimators=1000)))]
+        )
+    """
+
+    def __init__(
+        self,
+        estimator: BaseEstimator,
+        rounds: int = 50,
+        validation_fraction: float = 0.1,
+        eval_metric: str = None,
+        random_state: int = None,
+    ):
+        self.estimator = estimator
+        self.rounds = rounds
+        self.validation_fraction = validation_fraction
+        self.eval_metric = eval_metric
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        X_fit, X_val, y_fit, y_val = train_test_split(
+            X,
+            y,
+            test_size=self.validation_fraction,
+            stratify=y,
+            random_state=self.random_state,
+        )
+
+        self.estimator_ = clone(self.estimator)
+        library = boosting_library(self.estimator_)
+        if self.eval_metric is not None:
+            metric_param = "metric" if library == "lightgbm" else "eval_metric"
+            self.estimator_.set_params(**{metric_param: self.eval_metric})
+
+        if library == "xgboost":
+            self.estimator_.set_params(early_stopping_rounds=self.rounds)
+            self.estimator_.fit(X_fit, y_fit, eval_set=[(X_val, y_val)], verbose=False)
+            self.best_iteration_ = self.estimator_.best_iteration + 1
+
+        elif library == "lightgbm":
+            import lightgbm  # noqa: PLC0415
+
+            self.estimator_.fit(
+                X_fit,
+                y_fit,
+                eval_set=[(X_val, y_val)],
+                callbacks=[
+                    lightgbm.early_stopping(
+                        self.rounds, first_metric_only=True, verbose=False
+                    )
+                ],
+            )
+            self.best_iteration_ = self.estimator_.best_iteration_
+
+        else:
+            self.estimator_.fit(
+                X_fit,
+                y_fit,
+                eval_set=(X_val, y_val),
+                early_stopping_rounds=self.rounds,
+                use_best_model=True,
+            )
+            self.best_iteration_ = self.estimator_.get_best_iteration() + 1
+
+        self.classes_ = self.estimator_.classes_
+        return self
+
+    def predict(self, X):
+        return self.estimator_.predict(X)
+
+    def predict_proba(self, X):
+        return self.estimator_.predict_proba(X)
+
+
+def boosting_library(estimator: BaseEstimator) -> str:
+    """
+    Boosting library of a model ("xgboost", "lightgbm" or "catboost")
+
+    Raises
+    ------
+    ValueError
+        When the model is not from one of them
+    """
+    library = type(estimator).__module__.split(".")[0]
+    if library not in ROUNDS_PARAMS:
+        raise ValueError(
+            f"early_stopping is only supported for {tuple(ROUNDS_PARAMS)} models, "
+            f"not {type(estimator).__name__}"
+        )
+    return library
@@ -2,33 +2,52 @@
 # Autoformatted & Linted with Ruff
 # Docstrings follow numpy Python Docstring Format
 
+# The ML libraries (sklearn, skopt, imblearn, GPUtil...) are imported by the
+# functions that use them, so building the pipelines (every kedro command) does
+# not import them
+
+from __future__ import annotations
+
 import importlib
 import logging
-from typing import Any, Dict, Tuple, Type
+import os
+import tempfile
+from dataclasses import dataclass, replace
+from functools import cache
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+import pandas as pd
 
-import sklearn
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
+    from sklearn.compose import ColumnTransformer
+
+    from egt309_pipeline.encoding import CategoricalEncoder
+
+    from .cpu_budget import CPUBudget
+    from .recall_optimized import RecallOptimizedClassifier
+    from .search_history import SearchHistory
 
 logger = logging.getLogger(__name__)
-sklearn.set_config(transform_output="pandas")
 
-import GPUtil
-import numpy as np
-import pandas as pd
-from sklearn.base import BaseEstimator, ClassifierMixin
-from sklearn.compose import ColumnTransformer
-from sklearn.metrics import precision_recall_curve
-from sklearn.model_selection import StratifiedKFold, cross_val_predict, train_test_split
-from sklearn.pipeline import Pipeline
-from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, StandardScaler
-from skopt import BayesSearchCV
-from skopt.space import Categorical, Integer, Real
+
+def __getattr__(name: str):
+    # RecallOptimizedClassifier moved to recall_optimized.py; models pickled
+    # before still refer to it here
+    if name == "RecallOptimizedClassifier":
+        from .recall_optimized import RecallOptimizedClassifier  # noqa: PLC0415
+
+        return RecallOptimizedClassifier
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 #############
 # Utilities #
 #############
 
 
-def _parse_search_space(search_space: dict) -> Dict[str, Any]:
+def _parse_search_space(search_space: dict) -> dict[str, Any]:
     """
     Parses a dictionary into skopt.space objects.
     Converting to skopt.space objects is necessary before passing into BayesSearchCV as 'search_spaces' parameters.
@@ -42,7 +61,7 @@ def _parse_search_space(search_space: dict) -> Dict[str, Any]:
 
     Returns
     -------
-    Dict[str, Any]
+    dict[str, Any]
         Dictionary with parameters wrapped in skopt.space objects
 
     Example
@@ -55,6 +74,8 @@ def _parse_search_space(search_space: dict) -> Dict[str, Any]:
         _parse_search_space(space)
         {'x': Integer(1, 10), 'y': Categorical(['a', 'b'])}
     """
+    from skopt.space import Categorical, Integer, Real  # noqa: PLC0415
+
     bayes_search_params = {}
     for identifier, values in search_space.items():
         value_type = values["type"]
@@ -77,7 +98,7 @@ def _parse_search_space(search_space: dict) -> Dict[str, Any]:
     return bayes_search_params
 
 
-def _get_model_class(class_path: str) -> Type[BaseEstimator]:
+def _get_model_class(class_path: str) -> type[BaseEstimator]:
     """
     Imports and returns a class from a dotted string path.
 
@@ -88,7 +109,7 @@ def _get_model_class(class_path: str) -> Type[BaseEstimator]:
 
     Returns
     -------
-    Type[BaseEstimator]
+    type[BaseEstimator]
         Python class of the dotted string path
 
     Example
@@ -106,8 +127,8 @@ def _get_model_class(class_path: str) -> Type[BaseEstimator]:
 
 
 def _init_model(
-    X_train: pd.DataFrame, model_config: Dict, options: Dict
-) -> Type[BaseEstimator]:
+    X_train: pd.DataFrame, model_config: dict, options: dict
+) -> type[BaseEstimator]:
     """
     Initializes a ML model object with model confiuration specified in model's *.yml file.
     Moves uses cuda if specified in model's configuration.
@@ -119,15 +140,15 @@ def _init_model(
     X_train: pd.DataFrame
         Training data; Used to detect categorial features for catboost classifier
 
-    model_config: Dict
+    model_config: dict
         Model base hyperparameter configuration; Defined in conf/base/parameters_model_config/*.yml under header 'model_params'
 
-    options: Dict
+    options: dict
         Execution confiuration; Defined in parameters_execution_configuration.yml under header 'execution_config'
 
     Returns
     -------
-    Type[BaseEstimator]
+    type[BaseEstimator]
         Initialise model instance
     """
     model_class = _get_model_class(model_config["class"])
@@ -138,7 +159,7 @@ def _init_model(
     # code block will switch model training device to
     # 'cpu' or 'cuda' depending on existing hardware
     if model_params.get("device") == "auto":
-        device = "cuda" if GPUtil.getAvailable() else "cpu"
+        device = "cuda" if _gpu_available() else "cpu"
         model_params["device"] = device
         logger.debug(f"Selected: {device}")
 
@@ -154,7 +175,25 @@ def _init_model(
     return model_class(random_state=options["random_state"], **model_params)
 
 
-def _build_preprocessor(X_train: pd.DataFrame, model_config: dict) -> ColumnTransformer:
+@cache
+def _gpu_available() -> bool:
+    """
+    Whether a GPU is available (GPUtil runs nvidia-smi), probed once per process
+    rather than for every model with device: auto
+    """
+    import GPUtil  # noqa: PLC0415
+
+    available = bool(GPUtil.getAvailable())
+    logger.debug(f"GPU available: {available}")
+    return available
+
+
+def _build_preprocessor(
+    X_train: pd.DataFrame,
+    model_config: dict,
+    encoder: CategoricalEncoder = None,
+    n_jobs: int = None,
+) -> ColumnTransformer:
     """
     Creates dataset transformation object.
     Used for applying One-Hot, Label (Oritental) encoding on the entire dataset.
@@ -170,44 +209,63 @@ def _build_preprocessor(X_train: pd.DataFrame, model_config: dict) -> ColumnTran
         Used to check datset how dataset should be encoded, as well as if the dataset requires scaling.
 
         If encoding is not specified as a parameter, One-Hot encoding will be applied by default.;
+        'sparse_encoding: True' passes One-Hot encoded data to the model as a sparse matrix.
 
         Defined in conf/base/parameters_model_config/*.yml under key 'model_params'
 
+    encoder: CategoricalEncoder, optional
+        Encoder fitted on the training data (see fit_encoder); its categories are
+        reused so the preprocessor does not learn them again in every CV fold
+
+    n_jobs: int, optional
+        Parallel jobs of the ColumnTransformer (see CPUBudget.preprocessor_jobs)
+
     Returns
     -------
     ColumnTransformer
         Defines how dataset should be transformed: (OHE/Label/None) w/o Scaling
     """
+    from sklearn.compose import ColumnTransformer  # noqa: PLC0415
+    from sklearn.preprocessing import StandardScaler  # noqa: PLC0415
+
+    from egt309_pipeline.encoding import CategoricalEncoder  # noqa: PLC0415
 
     # Returns subset of DataFrame cols based on col dtypes
     categorical_cols = X_train.select_dtypes(
         include=["object", "category"]
     ).columns.tolist()
-    numerical_cols = X_train.select_dtypes(
-        include=["int64", "float64"]
-    ).columns.tolist()
+    # "number" covers the downcast widths from compact_dtypes (int8, float32...)
+    numerical_cols = X_train.select_dtypes(include="number").columns.tolist()
 
     preprocessing_steps = []
     data_encoding = model_config.get(
         "data_encoding", "ohe"
     ).lower()  # Default encoding is one-hot encoding
+    sparse_encoding = data_encoding == "ohe" and model_config.get(
+        "sparse_encoding", False
+    )
+    categories = encoder.categories_ if encoder is not None else None
 
     # Applies One-Hot encoding to dataset
+    # (unseen categories are encoded as all zeros)
     if data_encoding == "ohe":
         logger.debug("Applying One-Hot Encoding")
         encoding_transformer = (
             "ohe",
-            OneHotEncoder(handle_unknown="ignore", sparse_output=False),
+            CategoricalEncoder(
+                encoding="ohe", categories=categories, sparse_output=sparse_encoding
+            ),
             categorical_cols,
         )
         preprocessing_steps.append(encoding_transformer)
 
     # Applies Label/Ordinal encoding to datset
+    # (unseen categories are encoded as -1)
     elif data_encoding == "label":
         logger.debug("Applying Label Encoding")
         encoding_transformer = (
             "label",
-            OrdinalEncoder(handle_unknown="use_encoded_value", unknown_value=-1),
+            CategoricalEncoder(encoding="int", categories=categories),
             categorical_cols,
         )
         preprocessing_steps.append(encoding_transformer)
@@ -223,68 +281,93 @@ def _build_preprocessor(X_train: pd.DataFrame, model_config: dict) -> ColumnTran
         preprocessing_steps.append(scaling_transformer)
         logger.debug("Applied Standard Scaling")
 
-    return ColumnTransformer(
+    preprocessor = ColumnTransformer(
         transformers=preprocessing_steps,
         remainder="passthrough",
-        n_jobs=-1,
+        n_jobs=n_jobs,
         verbose_feature_names_out=False,
+        sparse_threshold=1.0 if sparse_encoding else 0.0,
     )
+    # The model is fitted on (and predicts from) a DataFrame with the column names,
+    # whatever the global output config of the process (e.g. a search worker)
+    # Sparse matrices cannot be wrapped in a DataFrame
+    preprocessor.set_output(transform="default" if sparse_encoding else "pandas")
+    if sparse_encoding:
+        logger.debug("Using sparse One-Hot Encoding")
+    return preprocessor
 
 
-class RecallOptimizedClassifier(BaseEstimator, ClassifierMixin):
-    """
-    A wrapper that adjusts the model's decision threshold to ensure that a certain percentage of positive cases is minimally caught.
-    This ensures that the model finds at least the "min_recall" amount of true positives, which minimizes false negatives (missed detections).
+#########
+# Nodes #
+#########
+
 
-    Do take note this approach also decreases the precision, which means the model will also be more prone to flagging more false positives.
+def compact_dtypes(df: pd.DataFrame, options: dict) -> pd.DataFrame:
+    """
+    Converts columns to the most compact dtypes that hold the same values.
+    Low-cardinality string columns become pandas 'category', integer columns are
+    downcast to the smallest integer width and float columns to float32 when no
+    value changes. Boolean columns are kept as they are.
 
     Parameters
     ----------
-    base_estimator: BaseEstimator
-        Model that is to be tuned
-
-    cv: int
-        How many cross validation chunks to split the data
+    df: pd.DataFrame
+        Dataset to be compacted
 
-    min_recall: float, default=0.85
-        Minimum target percentage of positive classes that the model should be able to detect (Float between range of 0.0 to 1.0)
+    options: dict
+        Defined in parameters_model_training.yml under key 'parameters_model_training';
+        'category_max_unique_ratio' is the highest ratio of distinct values to rows
+        for a string column to be converted to 'category' (default 0.5)
 
+    Returns
+    -------
+    pd.DataFrame
+        Dataset with compact dtypes
     """
+    max_unique_ratio = options.get("category_max_unique_ratio", 0.5)
+
+    df_compact = df.copy()
+    for col in df_compact.columns:
+        values = df_compact[col]
+        if values.dtype == object or isinstance(values.dtype, pd.StringDtype):
+            if values.nunique(dropna=False) <= max_unique_ratio * len(values):
+                df_compact[col] = values.astype("category")
 
-    def __init__(self, base_estimator, cv, min_recall=0.85):
-        self.base_estimator = base_estimator
-        self.cv = cv
-        self.min_recall = min_recall
-        self.threshold_ = 0.5  # Default decision threshold (will be overwritten in fit)
+        elif pd.api.types.is_integer_dtype(values):
+            df_compact[col] = pd.to_numeric(values, downcast="integer")
 
-    # Determines the optimal probability threshold that achieves min_recall based on cv predictions
-    def fit(self, X, y):
-        y_proba = cross_val_predict(
-            self.base_estimator, X, y, cv=self.cv, method="predict_proba"
-        )[:, 1]
+        elif pd.api.types.is_float_dtype(values):
+            downcast = values.astype(np.float32)
+            if downcast.astype(values.dtype).equals(values):
+                df_compact[col] = downcast
 
-        precision, recalls, thresholds = precision_recall_curve(y, y_proba)
+    return df_compact
 
-        valid_indices = np.where(recalls[:-1] >= self.min_recall)[0]
-        best_index = valid_indices[-1]
-        self.threshold_ = thresholds[best_index]
 
-    # Predict class labels using the tuned threshold
-    def predict(self, X):
-        probs = self.base_estimator.predict_proba(X)[:, 1]
-        return (probs >= self.threshold_).astype(int)
+def fit_encoder(X_train: pd.DataFrame) -> CategoricalEncoder:
+    """
+    Fits the categories of every categorical column of the training data once.
+    The fitted encoder is saved with the models and reused by every model's
+    preprocessor, and can encode the test split or new data the same way.
 
-    # Return predicted probabilities
-    def predict_proba(self, X):
-        return self.base_estimator.predict_proba(X)
+    Parameters
+    ----------
+    X_train: pd.DataFrame
+        Features of the training dataset
 
+    Returns
+    -------
+    CategoricalEncoder
+        Fitted (One-Hot) encoder; its categories also serve Label encoding
+    """
+    from egt309_pipeline.encoding import CategoricalEncoder  # noqa: PLC0415
 
-#########
-# Nodes #
-#########
+    encoder = CategoricalEncoder(encoding="ohe").fit(X_train)
+    logger.debug(f"Fitted categories of {len(encoder.columns_)} columns")
+    return encoder
 
 
-def split_dataset(df: pd.DataFrame, options: Dict) -> Tuple:
+def split_dataset(df: pd.DataFrame, options: dict) -> tuple:
     """
     Splits the dataframe and applies stratification.
 
@@ -293,15 +376,17 @@ def split_dataset(df: pd.DataFrame, options: Dict) -> Tuple:
     df: pd.DataFrame
         Dataset to be split
 
-    options: Dict
+    options: dict
         Configuration that specifies train test split ratio and random state;
         Defined in parameters_execution_configuration.yml under key 'execution_config'
 
     Returns
     -------
-    Tuple
+    tuple
         Returns train test split
     """
+    from sklearn.model_selection import train_test_split  # noqa: PLC0415
+
     X = df.drop("Subscription Status", axis=1)
     y = df["Subscription Status"]
 
@@ -316,11 +401,17 @@ def split_dataset(df: pd.DataFrame, options: Dict) -> Tuple:
     return X_train, X_test, y_train, y_test
 
 
-def train_model(
-    X_train: pd.DataFrame, y_train: pd.DataFrame, model_config: Dict, options: Dict
-) -> Tuple[BaseEstimator, Dict]:
+def train_model(  # noqa: PLR0913
+    X_train: pd.DataFrame,
+    y_train: pd.DataFrame,
+    model_config: dict,
+    options: dict,
+    encoder: CategoricalEncoder = None,
+    rebalancing: dict = None,
+) -> tuple[BaseEstimator, dict]:
     """
-    Trains a model using Bayesian Optimization for hyperparameter tuning
+    Trains a model using Bayesian Optimization (or successive halving, see
+    search_strategy) for hyperparameter tuning
 
     Parameters
     ----------
@@ -330,66 +421,431 @@ def train_model(
     Y_train: pd.DataFrame
         Targets of the training dataset
 
-    model_config: Dict
+    model_config: dict
         Defined in conf/base/parameters_model_config/*.yml under key '<model_header>'
 
-    options: Dict
+    options: dict
         Defined in parameters_execution_configuration.yml under key 'execution_config'
+
+    encoder: CategoricalEncoder, optional
+        Encoder fitted on X_train by fit_encoder
+
+    rebalancing: dict, optional
+        Defined in model_registry_config.yml under key 'rebalancing'; oversamples
+        the minority class with SMOTE inside every CV fold (see rebalancing.py)
+    """
+    from sklearn.pipeline import Pipeline  # noqa: PLC0415
+    from threadpoolctl import threadpool_limits  # noqa: PLC0415
+
+    budget = _plan_budget(options)
+    logger.debug(f"CPU budget of {model_config['class']}: {budget}")
+
+    # Fitted preprocessors, transformed folds and rebalancing recipes are cached
+    # for the whole search (and the refit), shared by the search's worker processes
+    # Thread pools of this process (refit, threshold tuning) and of the search's
+    # workers are limited to estimator_threads
+    with (
+        tempfile.TemporaryDirectory(prefix="train_model_") as cache_dir,
+        threadpool_limits(limits=budget.estimator_threads),
+        budget.search_context(),
+    ):
+        setup = _SearchSetup(
+            model_config, options, encoder, rebalancing, cache_dir, budget
+        )
+        final_model, best_params = _search_model(X_train, y_train, setup)
+
+    # The cache directory is gone; caches are only used while fitting
+    if isinstance(final_model.base_estimator, Pipeline):
+        final_model.base_estimator.set_params(memory=None)
+    if rebalancing:
+        final_model.base_estimator.set_params(rebalancer__cache_dir=None)
+    return final_model, best_params
+
+
+################
+# Model search #
+################
+
+
+@dataclass(frozen=True)
+class _SearchSetup:
     """
+    Configuration of a model's search, shared by the steps of _search_model
+
+    Attributes
+    ----------
+    model_config: dict
+        Defined in conf/base/parameters_model_config/*.yml under key '<model_header>'
+
+    options: dict
+        Defined in parameters_model_training.yml under key 'parameters_model_training'
+
+    encoder: CategoricalEncoder, optional
+        Encoder fitted on X_train by fit_encoder
 
-    # Initialize model object
-    model = _init_model(X_train, model_config, options)
+    rebalancing: dict, optional
+        Defined in model_registry_config.yml under key 'rebalancing'
+
+    cache_dir: str, optional
+        Directory of the preprocessing cache, the shared training data and the
+        out-of-fold predictions; none of them are used without it
+
+    budget: CPUBudget, optional
+        Planned from the options when not given
+    """
+
+    model_config: dict
+    options: dict
+    encoder: CategoricalEncoder = None
+    rebalancing: dict = None
+    cache_dir: str = None
+    budget: CPUBudget = None
+
+
+def _plan_budget(options: dict) -> CPUBudget:
+    """
+    CPU budget of a model's search (see cpu_budget.py)
+    """
+    from .cpu_budget import plan_cpu_budget  # noqa: PLC0415
+
+    # The search evaluates n_points candidates (cv_splits fits each) at a time
+    n_points = (options.get("batch_proposals") or {}).get("n_points", 1)
+    return plan_cpu_budget(options, parallel_fits=options["cv_splits"] * n_points)
+
+
+def _search_model(
+    X_train: pd.DataFrame, y_train: pd.DataFrame, setup: _SearchSetup
+) -> tuple[BaseEstimator, dict]:
+    """
+    Hyperparameter search (Bayesian or successive halving, see search_strategy)
+    and recall threshold tuning of train_model
+    """
+    from sklearn.model_selection import StratifiedKFold  # noqa: PLC0415
+
+    if setup.budget is None:
+        setup = replace(setup, budget=_plan_budget(setup.options))
+
+    estimator, search_space = _build_estimator(X_train, setup)
+
+    # Use StratifiedKFold over KFold due to imbalanced datset
+    cv_strategy = StratifiedKFold(
+        n_splits=setup.options["cv_splits"],
+        shuffle=True,
+        random_state=setup.options["random_state"],
+    )
+
+    # One set of fold indices, shared by the search and the threshold tuning
+    folds = list(cv_strategy.split(X_train, y_train))
+
+    history = _search_history(X_train, y_train, setup)
+    search = _build_search(estimator, search_space, folds, history, setup)
+    search.fit(X_train, y_train)
+
+    final_model = _tune_threshold(search, X_train, y_train, cv_strategy, setup)
+    return final_model, _best_params(search, setup)
+
+
+def _build_model(
+    X_train: pd.DataFrame, setup: _SearchSetup
+) -> tuple[BaseEstimator, dict]:
+    """
+    Model of a search, with its threads set by the CPU budget and wrapped for
+    early stopping when configured, and the search space of its parameters
+    """
+    from .cpu_budget import limit_model_threads  # noqa: PLC0415
+    from .early_stopping import (  # noqa: PLC0415
+        ROUNDS_PARAMS,
+        EarlyStoppingClassifier,
+        boosting_library,
+    )
+
+    model = _init_model(X_train, setup.model_config, setup.options)
+    limit_model_threads(model, setup.budget.estimator_threads)
+    search_space = dict(setup.model_config.get("search_space", {}))
+
+    # Boosted models stop at the best round on a validation slice carved out of
+    # every fit (CV fold or refit): their number of rounds is capped by its
+    # search_space 'high' instead of being searched
+    early_stopping = setup.model_config.get("early_stopping")
+    if early_stopping:
+        rounds_param = ROUNDS_PARAMS[boosting_library(model)]
+        rounds_space = search_space.pop(rounds_param, None)
+        if rounds_space is not None:
+            model.set_params(**{rounds_param: rounds_space["high"]})
+        model = EarlyStoppingClassifier(
+            model, random_state=setup.options["random_state"], **early_stopping
+        )
+        logger.debug(f"Early stopping with {model}")
+
+    return model, search_space
+
+
+def _build_estimator(
+    X_train: pd.DataFrame, setup: _SearchSetup
+) -> tuple[BaseEstimator, dict]:
+    """
+    Estimator tuned by a search (the model behind its preprocessing and
+    rebalancing steps) and the search space of its parameters
+    """
+    import joblib  # noqa: PLC0415
+    from imblearn.pipeline import Pipeline as ImbPipeline  # noqa: PLC0415
+    from sklearn.pipeline import Pipeline  # noqa: PLC0415
+
+    from .cpu_budget import limit_model_threads  # noqa: PLC0415
+    from .rebalancing import build_rebalancer  # noqa: PLC0415
+
+    model_config, options = setup.model_config, setup.options
+    model, search_space = _build_model(X_train, setup)
 
     # Create dataset preprocessor object
-    preprocessor = _build_preprocessor(X_train, model_config)
+    preprocessor = _build_preprocessor(
+        X_train, model_config, setup.encoder, n_jobs=setup.budget.preprocessor_jobs
+    )
+
+    # The preprocessor has no hyperparameters to search, so the fitted preprocessor
+    # & transformed data of every fold are the same for every candidate: they are
+    # computed once per fold (and once for the refit) and loaded from the cache
+    memory = None
+    if setup.cache_dir is not None and options.get("preprocessing_cache", True):
+        memory = joblib.Memory(setup.cache_dir, mmap_mode="r", verbose=0)
 
     # Pipes ColumnTransformer object to Pipeline object
     # When dataset is passed into the Pipeline object, the necessary dataset
     # preprocessing steps are applied before being fit to the model
     # Docs: https://scikit-learn.org/stable/auto_examples/compose/plot_column_transformer_mixed_types.html
-    if preprocessor:
-        model_to_tune = Pipeline(
-            steps=[("preprocessor", preprocessor), ("model", model)]
+    if setup.rebalancing:
+        if model_config.get("data_encoding", "ohe").lower() == "none":
+            raise ValueError("rebalancing requires an encoded dataset")
+
+        # imblearn's Pipeline only resamples while fitting, i.e. on the training
+        # part of every CV fold; validation folds and predictions are untouched
+        rebalancer = build_rebalancer(
+            setup.rebalancing, options["random_state"], setup.cache_dir
+        )
+        limit_model_threads(rebalancer, setup.budget.estimator_threads)
+        estimator = ImbPipeline(
+            steps=[
+                ("preprocessor", preprocessor),
+                ("rebalancer", rebalancer),
+                ("model", model),
+            ],
+            memory=memory,
         )
-        prefix = (
-            "model__"  # Pipeline object requires to add prefix in front of parameters
+        logger.debug(f"Rebalancing with {rebalancer}")
+
+    elif preprocessor:
+        estimator = Pipeline(
+            steps=[("preprocessor", preprocessor), ("model", model)], memory=memory
         )
 
     else:
-        model_to_tune = model
-        prefix = ""
+        estimator = model
 
-    search_space = model_config.get("search_space", {})
-    search_space = {f"{prefix}{k}": v for k, v in search_space.items()}
-    param_grid = _parse_search_space(search_space)
+    prefix = _param_prefix(estimator)
+    return estimator, {f"{prefix}{k}": v for k, v in search_space.items()}
 
-    # Use StratifiedKFold over KFold due to imbalanced datset
-    cv_strategy = StratifiedKFold(
-        n_splits=options["cv_splits"],
-        shuffle=True,
-        random_state=options["random_state"],
+
+def _param_prefix(estimator: BaseEstimator) -> str:
+    """
+    Prefix of the model's parameters in the estimator of a search
+    """
+    from sklearn.pipeline import Pipeline  # noqa: PLC0415
+
+    from .early_stopping import EarlyStoppingClassifier  # noqa: PLC0415
+
+    prefix = ""
+    if isinstance(estimator, Pipeline):
+        # Pipeline object requires to add prefix in front of parameters
+        prefix, estimator = "model__", estimator[-1]
+    if isinstance(estimator, EarlyStoppingClassifier):
+        prefix = f"{prefix}estimator__"
+    return prefix
+
+
+def _search_history(
+    X_train: pd.DataFrame, y_train: pd.DataFrame, setup: _SearchSetup
+) -> SearchHistory:
+    """
+    Persisted evaluations of a Bayesian search (see search_history), or None
+    """
+    from .search_history import SearchHistory, search_fingerprint  # noqa: PLC0415
+
+    options = setup.options
+    if not options.get("search_history") or options.get("search_strategy") == "halving":
+        return None
+
+    # Evaluations are persisted: a search identical to an earlier one (same
+    # model, search space, folds, scoring & training data) warm starts from
+    # its evaluations, and an interrupted search resumes where it stopped
+    fingerprint = search_fingerprint(
+        setup.model_config,
+        setup.rebalancing,
+        {
+            name: options.get(name)
+            for name in ("cv_splits", "random_state", "bayes_scoring", "pruning")
+        },
+        X_train,
+        y_train,
     )
+    return SearchHistory(
+        options["search_history"], setup.model_config["class"], fingerprint
+    )
+
 
-    # Hyperparameter optimization with Bayesian Optimisation
-    bs = BayesSearchCV(
-        estimator=model_to_tune,
+def _build_search(
+    estimator: BaseEstimator,
+    search_space: dict,
+    folds: list,
+    history: SearchHistory,
+    setup: _SearchSetup,
+) -> BaseEstimator:
+    """
+    Hyperparameter search of the estimator over the given CV folds
+    """
+    from .out_of_fold import OutOfFoldScorer  # noqa: PLC0415
+    from .search import (  # noqa: PLC0415
+        SEARCH_STRATEGIES,
+        BayesianSearch,
+        SuccessiveHalvingSearch,
+    )
+
+    options = setup.options
+    search_strategy = options.get("search_strategy", "bayes")
+    if search_strategy not in SEARCH_STRATEGIES:
+        raise ValueError(f"Unknown search_strategy: {search_strategy}")
+
+    # With an estimator count (or other model parameter) as the halving resource,
+    # the parameter is set by the rounds instead of searched: its search_space
+    # 'high' is the resource of the last round
+    search_space = dict(search_space)
+    halving = dict(options.get("halving") or {})
+    resource = halving.get("resource", "n_samples")
+    if search_strategy == "halving" and resource != "n_samples":
+        if setup.model_config.get("early_stopping"):
+            raise ValueError("early_stopping decides the rounds, use n_samples")
+        resource = f"{_param_prefix(estimator)}{resource}"
+        resource_space = search_space.pop(resource, {})
+        if halving.get("max_resources") is None:
+            halving["max_resources"] = resource_space.get("high")
+
+    param_grid = _parse_search_space(search_space)
+
+    # The search's scorer also stores the out-of-fold predictions of every
+    # candidate, which the threshold tuning reuses
+    # (halving scores on whole validation folds; its last round, fitted on whole
+    # training folds, is the last to store the predictions of its candidates)
+    scoring = options["bayes_scoring"]
+    if setup.cache_dir is not None:
+        param_names = list(param_grid)
+        if search_strategy == "halving" and resource != "n_samples":
+            param_names.append(resource)
+        scoring = OutOfFoldScorer(scoring, param_names, setup.cache_dir)
+
+    # The training data is memory-mapped once for the search's workers, which
+    # share its pages instead of unpickling a copy with every fold fit
+    shared_dir = None
+    if setup.cache_dir is not None and options.get("shared_data", True):
+        shared_dir = os.path.join(setup.cache_dir, "shared_data")
+
+    # A fold whose fit raises scores error_score; with NaN, the candidate ranks
+    # last and the search carries on
+    error_score = options.get("error_score")
+    if error_score is None:
+        error_score = np.nan
+
+    if search_strategy == "halving":
+        # Successive halving: many candidates on few resources, the best third
+        # promoted with thrice the resources every round
+        return SuccessiveHalvingSearch(
+            estimator=estimator,
+            search_spaces=param_grid,
+            cv=folds,
+            scoring=scoring,
+            n_candidates=halving.get("n_candidates", 27),
+            factor=halving.get("factor", 3),
+            resource=resource,
+            min_resources=halving.get("min_resources"),
+            max_resources=halving.get("max_resources"),
+            n_jobs=setup.budget.search_workers,
+            random_state=options["random_state"],
+            shared_dir=shared_dir,
+            error_score=error_score,
+        )
+
+    # Hyperparameter optimization with Bayesian Optimisation, fold by fold so
+    # that candidates scoring below the completed ones are pruned early; with
+    # batch_proposals, several candidates are evaluated at once, asynchronously
+    # The search of every model stops proposing candidates once its
+    # search_time_budget has elapsed
+    batch_proposals = options.get("batch_proposals") or {}
+    return BayesianSearch(
+        estimator=estimator,
         search_spaces=param_grid,
-        cv=cv_strategy,
-        scoring=options["bayes_scoring"],
-        n_jobs=-1,
-        verbose=0,
+        cv=folds,
+        scoring=scoring,
         n_iter=options["bayes_search_n_iters"],
+        pruning=options.get("pruning"),
+        n_points=batch_proposals.get("n_points", 1),
+        strategy=batch_proposals.get("strategy", "cl_min"),
+        acq_func=options.get("bayes_acq_func", "gp_hedge"),
+        time_budget=setup.model_config.get(
+            "search_time_budget", options.get("search_time_budget")
+        ),
+        n_jobs=setup.budget.search_workers,
         random_state=options["random_state"],
+        history=history,
+        shared_dir=shared_dir,
+        error_score=error_score,
     )
 
-    bs.fit(X_train, y_train)
+
+def _tune_threshold(
+    search: BaseEstimator,
+    X_train: pd.DataFrame,
+    y_train: pd.DataFrame,
+    cv_strategy: Any,
+    setup: _SearchSetup,
+) -> RecallOptimizedClassifier:
+    """
+    Wraps the best estimator of a fitted search in a RecallOptimizedClassifier,
+    tuned on the out-of-fold predictions stored by the search when available
+    """
+    from .out_of_fold import load_out_of_fold  # noqa: PLC0415
+    from .recall_optimized import RecallOptimizedClassifier  # noqa: PLC0415
+
+    # Out-of-fold predictions of the best candidate, on the folds of the search
+    y_proba = None
+    if setup.cache_dir is not None:
+        y_proba = load_out_of_fold(setup.cache_dir, search.best_params_, X_train.index)
+    if y_proba is None:
+        logger.debug("No stored out-of-fold predictions, refitting on every fold")
 
     # Wrapper to ensure that the model meets the minimum recall
+    # (cv_strategy splits the same folds, should the predictions be missing)
     final_model = RecallOptimizedClassifier(
-        base_estimator=bs.best_estimator_,
-        cv=options["cv_splits"],
-        min_recall=options.get("minimum_recall", 0.85),
+        base_estimator=search.best_estimator_,
+        cv=cv_strategy,
+        min_recall=setup.options.get("minimum_recall", 0.85),
+        n_jobs=setup.budget.search_workers,
     )
+    return final_model.fit(X_train, y_train, y_proba=y_proba)
+
 
-    final_model.fit(X_train, y_train)
-    return final_model, bs.best_params_
+def _best_params(search: BaseEstimator, setup: _SearchSetup) -> dict:
+    """
+    Best parameters of a fitted search; with early stopping, the rounds its refit
+    on the whole training set stopped at
+    """
+    from sklearn.pipeline import Pipeline  # noqa: PLC0415
+
+    from .early_stopping import ROUNDS_PARAMS, boosting_library  # noqa: PLC0415
+
+    best_params = dict(search.best_params_)
+    if setup.model_config.get("early_stopping"):
+        stopped_model = search.best_estimator_
+        if isinstance(stopped_model, Pipeline):
+            stopped_model = stopped_model[-1]
+        rounds_param = ROUNDS_PARAMS[boosting_library(stopped_model.estimator)]
+        prefix = _param_prefix(search.best_estimator_)
+        best_params[f"{prefix}{rounds_param}"] = stopped_model.best_iteration_
+    return best_params
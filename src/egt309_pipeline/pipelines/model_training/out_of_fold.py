@@ -0,0 +1,149 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import shutil
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.metrics import get_scorer
+from sklearn.utils.metaestimators import available_if
+
+
+class OutOfFoldScorer:
+    """
+    Scorer of a hyperparameter search that also stores the out-of-fold predictions
+    of every candidate.
+
+    Every time the search scores a candidate on a validation fold, the positive
+    class probabilities of the fold are written to directory, under a key made
+    of the candidate's searched parameters. Once the search is done, the
+    out-of-fold probabilities of the best candidate are assembled with
+    load_out_of_fold, instead of fitting it on every fold again (e.g. with
+    cross_val_predict). directory must be shared by the search's workers.
+
+    The probabilities of a fold are predicted once: a scorer that reads them
+    (e.g. "neg_log_loss") is handed the stored ones, while predict (e.g.
+    "recall_weighted") and decision_function are the estimator's own, so every
+    score is the one the scorer gives the estimator. A fold scoring NaN is not
+    stored, and the searches discard the predictions of candidates that failed
+    or were pruned (see discard).
+
+    Parameters
+    ----------
+    scoring: str
+        Scoring of the search (any sklearn scorer name)
+
+    param_names: list[str]
+        Names of the searched parameters, which identify a candidate
+
+    directory: str
+        Directory the predictions are written to
+
+    Example
+    -------
+        scorer = OutOfFoldScorer("recall_weighted", list(param_grid), cache_dir)
+        search = BayesSearchCV(model, param_grid, cv=folds, scoring=scorer).fit(X, y)
+        y_proba = load_out_of_fold(cache_dir, search.best_params_, X.index)
+    """
+
+    def __init__(self, scoring: str, param_names: list, directory: str):
+        self.scoring = scoring
+        self.param_names = param_names
+        self.directory = directory
+        self.scorer = get_scorer(scoring)
+
+    def __call__(self, estimator, X: pd.DataFrame, y: pd.Series) -> float:
+        proba = estimator.predict_proba(X)
+        score = self.scorer(_StoredProbabilities(estimator, proba), X, y)
+        if np.isnan(score):
+            return score  # Never the best, nothing to store
+
+        params = estimator.get_params()
+        path = _candidate_path(
+            self.directory, {name: params[name] for name in self.param_names}
+        )
+        path.mkdir(parents=True, exist_ok=True)
+        index = np.asarray(X.index)
+        np.savez(path / f"{joblib.hash(index)}.npz", index=index, proba=proba[:, 1])
+        return score
+
+    def discard(self, params: dict):
+        """
+        Removes the stored predictions of a candidate that can never be the best
+        (it failed, was pruned or was not promoted)
+
+        Parameters
+        ----------
+        params: dict
+            Searched parameters of the candidate
+        """
+        shutil.rmtree(_candidate_path(self.directory, params), ignore_errors=True)
+
+
+class _StoredProbabilities(ClassifierMixin, BaseEstimator):
+    # Stands in for a fitted classifier on the rows it predicted: a scorer reads
+    # their stored class probabilities instead of predicting them again, and the
+    # classifier's own predict & decision_function (e.g. SVC's, which disagree
+    # with its Platt-scaled probabilities)
+    def __init__(self, estimator: BaseEstimator, proba: np.ndarray):
+        self.estimator = estimator
+        self.proba = proba
+        self.classes_ = estimator.classes_
+
+    def predict_proba(self, X) -> np.ndarray:
+        return self.proba
+
+    def predict(self, X) -> np.ndarray:
+        return self.estimator.predict(X)
+
+    @available_if(lambda self: hasattr(self.estimator, "decision_function"))
+    def decision_function(self, X) -> np.ndarray:
+        return self.estimator.decision_function(X)
+
+
+def load_out_of_fold(directory: str, params: dict, index: pd.Index) -> np.ndarray:
+    """
+    Out-of-fold positive class probabilities of a candidate, stored by
+    OutOfFoldScorer, in the order of index
+
+    Parameters
+    ----------
+    directory: str
+        Directory of the OutOfFoldScorer
+
+    params: dict
+        Searched parameters of the candidate (e.g. best_params_ of the search)
+
+    index: pd.Index
+        Index of the data the search was fitted on; must be unique
+
+    Returns
+    -------
+    np.ndarray or None
+        Probabilities of every row of index, None when some rows have none (e.g.
+        a fold failed to fit)
+    """
+    path = _candidate_path(directory, params)
+    if not index.is_unique or not path.is_dir():
+        return None
+
+    y_proba = np.full(len(index), np.nan)
+    for fold in path.glob("*.npz"):
+        with np.load(fold, allow_pickle=True) as stored:
+            positions = index.get_indexer(stored["index"])
+            if (positions < 0).any():
+                return None
+            y_proba[positions] = stored["proba"]
+
+    if np.isnan(y_proba).any():
+        return None
+    return y_proba
+
+
+def _candidate_path(directory: str, params: dict) -> Path:
+    # Same directory for the same parameter values, whatever their order
+    key = joblib.hash(sorted(dict(params).items()))
+    return Path(directory) / "out_of_fold" / key
@@ -2,36 +2,53 @@
 # Autoformatted & Linted with Ruff
 # Docstrings follow numpy Python Docstring Format
 
-from pathlib import Path
+from functools import partial, update_wrapper
 
-from kedro.config import (
-    OmegaConfigLoader,  # https://docs.kedro.org/en/0.19.10/api/kedro.config.OmegaConfigLoader.html
-)
-from kedro.framework.project import settings
 from kedro.pipeline import Node, Pipeline
 
-from .nodes import split_dataset, train_model
+from egt309_pipeline.config import project_parameters
+
+from .nodes import compact_dtypes, fit_encoder, split_dataset, train_model
 
 
 def create_pipeline(**kwargs) -> Pipeline:
-    # Loader is used to load all configurations defined within the /conf/base/** dir
-    conf_loader = OmegaConfigLoader(
-        conf_source=str(Path.cwd() / settings.CONF_SOURCE),
-        **settings.CONFIG_LOADER_ARGS,
-    )
-    parameters = conf_loader["parameters"]
+    # Parameters of the session (its --env & --params), shared by every pipeline
+    parameters = project_parameters()
 
     nodes = []
+    dataset = "cleaned_bmarket"
+    if parameters["parameters_model_training"].get("compact_dtypes", True):
+        nodes.append(
+            # Node that converts the dataset to compact dtypes (category, int8...)
+            Node(
+                func=compact_dtypes,
+                inputs=[dataset, "params:parameters_model_training"],
+                outputs="compact_bmarket",
+                name="compact_dtypes_node",
+            )
+        )
+        dataset = "compact_bmarket"
+
     nodes.append(
         # Node that splits the dataset into training and testing data
         Node(
             func=split_dataset,
-            inputs=["cleaned_bmarket", "params:parameters_model_training"],
+            inputs=[dataset, "params:parameters_model_training"],
             outputs=["X_train", "X_test", "y_train", "y_test"],
             name="split_dataset_node",
         )
     )
 
+    nodes.append(
+        # Node that fits the categorical encoding once, for every model
+        Node(
+            func=fit_encoder,
+            inputs="X_train",
+            outputs="categorical_encoder",
+            name="fit_encoder_node",
+        )
+    )
+
     model_registry = parameters["model_registry_config"]
     for config in model_registry.values():
         if not config.get("train_now", True):
@@ -42,12 +59,18 @@ def create_pipeline(**kwargs) -> Pipeline:
         # Creates a node for each model that has train_now=True
         nodes.append(
             Node(
-                func=train_model,
+                # Opt-in class rebalancing inside the CV folds, named train_model
+                # in the logs
+                func=update_wrapper(
+                    partial(train_model, rebalancing=config.get("rebalancing")),
+                    train_model,
+                ),
                 inputs=[
                     "X_train",
                     "y_train",
                     f"params:{config_name}",
                     "params:parameters_model_training",
+                    "categorical_encoder",
                 ],
                 outputs=[f"{model_name}_model_weights", f"{model_name}_best_params"],
                 name=f"train_{model_name}_node",
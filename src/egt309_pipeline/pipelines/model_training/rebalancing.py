@@ -0,0 +1,229 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import numbers
+
+import joblib
+import numpy as np
+from imblearn.over_sampling.base import BaseOverSampler
+from scipy import sparse
+from sklearn.neighbors import NearestNeighbors
+from sklearn.utils import check_random_state
+from sklearn.utils._param_validation import Interval
+
+REBALANCING_METHODS = ("smote",)
+
+
+class BlockedSMOTE(BaseOverSampler):
+    """
+    Memory-bounded SMOTE, meant to run inside every CV fold of an imblearn Pipeline.
+
+    Draws the same kind of synthetic samples as imblearn's SMOTE: a minority sample,
+    one of its k nearest neighbours (within its class) and a random gap between
+    them. Resampling is split in two steps:
+
+    1. The recipe: which samples are interpolated (indices of the sample and of
+       its neighbour, and the gap). Only the neighbours of the samples that are
+       drawn are searched, block by block, with n_jobs parallel queries.
+    2. The interpolation, written block by block into a single preallocated
+       output, so temporaries never grow past batch_size rows.
+
+    With cache_dir (and an int random_state), recipes are cached on disk by
+    joblib.Memory, keyed by the minority samples and the parameters. Every
+    hyperparameter candidate of a search is fitted on the same preprocessed fold,
+    so the neighbour search runs once per fold instead of once per candidate.
+
+    Parameters
+    ----------
+    sampling_strategy: float, str, dict or callable, default="auto"
+        Classes to oversample and by how much, like imblearn's SMOTE
+
+    random_state: int, optional
+        Seed of the recipe; recipes are only cached with an int seed
+
+    k_neighbors: int, default=5
+        Number of nearest neighbours to interpolate with
+
+    n_jobs: int, optional
+        Number of parallel jobs of the neighbour search
+
+    batch_size: int, default=10000
+        Number of samples searched / generated at once
+
+    cache_dir: str, optional
+        Directory of the recipe cache; no caching when not given
+
+    Example
+    -------
+        model = imblearn.pipeline.Pipeline(
+            [("preprocessor", preprocessor), ("rebalancer", BlockedSMOTE()), ("model", model)]
+        )
+    """
+
+    _parameter_constraints: dict = {
+        **BaseOverSampler._parameter_constraints,
+        "k_neighbors": [Interval(numbers.Integral, 1, None, closed="left")],
+        "n_jobs": [numbers.Integral, None],
+        "batch_size": [Interval(numbers.Integral, 1, None, closed="left")],
+        "cache_dir": [str, None],
+    }
+
+    def __init__(  # noqa: PLR0913
+        self,
+        sampling_strategy="auto",
+        random_state: int = None,
+        k_neighbors: int = 5,
+        n_jobs: int = None,
+        batch_size: int = 10_000,
+        cache_dir: str = None,
+    ):
+        super().__init__(sampling_strategy=sampling_strategy)
+        self.random_state = random_state
+        self.k_neighbors = k_neighbors
+        self.n_jobs = n_jobs
+        self.batch_size = batch_size
+        self.cache_dir = cache_dir
+
+    def _fit_resample(self, X, y):
+        recipe = _smote_recipe
+        if self.cache_dir is not None and isinstance(self.random_state, int):
+            memory = joblib.Memory(self.cache_dir, verbose=0)
+            recipe = memory.cache(_smote_recipe, ignore=["n_jobs", "batch_size"])
+
+        # (rows of the class in X, recipe) of every oversampled class
+        recipes, y_new = [], [y]
+        for class_label, n_samples in self.sampling_strategy_.items():
+            if n_samples == 0:
+                continue
+            class_rows = np.flatnonzero(y == class_label)
+            class_recipe = recipe(
+                X[class_rows],
+                n_samples,
+                self.k_neighbors,
+                self.random_state,
+                self.n_jobs,
+                self.batch_size,
+            )
+            recipes.append((class_rows, class_recipe))
+            y_new.append(np.full(n_samples, class_label, dtype=y.dtype))
+
+        y_resampled = np.concatenate(y_new)
+        if sparse.issparse(X):
+            blocks = [X]
+            for class_rows, (rows, neighbours, gaps) in recipes:
+                blocks.extend(
+                    _interpolate(X[class_rows], rows[i], neighbours[i], gaps[i])
+                    for i in _blocks(len(gaps), self.batch_size)
+                )
+            return sparse.vstack(blocks, format=X.format), y_resampled
+
+        dtype = X.dtype if X.dtype.kind == "f" else np.float64
+        X_resampled = np.empty((len(y_resampled), X.shape[1]), dtype=dtype)
+        X_resampled[: len(X)] = X
+        start = len(X)
+        for class_rows, (rows, neighbours, gaps) in recipes:
+            X_class = X[class_rows]
+            for i in _blocks(len(gaps), self.batch_size):
+                X_resampled[start + i.start : start + i.stop] = _interpolate(
+                    X_class, rows[i], neighbours[i], gaps[i]
+                )
+            start += len(gaps)
+        return X_resampled, y_resampled
+
+
+def _smote_recipe(  # noqa: PLR0913
+    X_class,
+    n_samples: int,
+    k_neighbors: int,
+    random_state,
+    n_jobs=None,
+    batch_size=10_000,
+) -> tuple:
+    """
+    Synthetic samples to draw from the samples of one class, as three arrays of
+    length n_samples: rows (sample to start from), neighbours (row of the neighbour
+    to move towards) and gaps (fraction of the way to the neighbour)
+
+    Parameters
+    ----------
+    X_class: {ndarray, sparse matrix}
+        Samples of the class to oversample
+
+    n_samples: int
+        Number of synthetic samples
+
+    k_neighbors: int
+        Number of nearest neighbours to choose from
+
+    random_state: int, RandomState or None
+        Seed of the draws
+
+    n_jobs: int, optional
+        Parallel jobs of the neighbour search (does not change the recipe)
+
+    batch_size: int
+        Samples searched at once (does not change the recipe)
+    """
+    k_neighbors = min(k_neighbors, X_class.shape[0] - 1)
+    if k_neighbors < 1:
+        raise ValueError("SMOTE needs at least 2 samples of every oversampled class")
+
+    rng = check_random_state(random_state)
+    rows = rng.randint(0, X_class.shape[0], size=n_samples)
+    choices = rng.randint(0, k_neighbors, size=n_samples)
+    gaps = rng.uniform(size=n_samples)
+
+    # Neighbours of the drawn samples only, searched block by block
+    drawn, inverse = np.unique(rows, return_inverse=True)
+    nn = NearestNeighbors(n_neighbors=k_neighbors + 1, n_jobs=n_jobs).fit(X_class)
+    table = np.empty((len(drawn), k_neighbors), dtype=np.int64)
+    for i in _blocks(len(drawn), batch_size):
+        # The first neighbour of every sample is the sample itself
+        table[i] = nn.kneighbors(X_class[drawn[i]], return_distance=False)[:, 1:]
+    return rows, table[inverse, choices], gaps
+
+
+def _interpolate(X_class, rows, neighbours, gaps):
+    # Moves every sample of rows by gaps towards its neighbour
+    start = X_class[rows]
+    if sparse.issparse(X_class):
+        return start + sparse.diags(gaps) @ (X_class[neighbours] - start)
+    return start + gaps[:, np.newaxis] * (X_class[neighbours] - start)
+
+
+def _blocks(n: int, batch_size: int):
+    # Consecutive slices of at most batch_size out of range(n)
+    return (slice(i, min(i + batch_size, n)) for i in range(0, n, batch_size))
+
+
+def build_rebalancer(
+    rebalancing: dict, random_state: int = None, cache_dir: str = None
+) -> BlockedSMOTE:
+    """
+    Creates the rebalancing step of a model's pipeline.
+
+    Parameters
+    ----------
+    rebalancing: dict
+        Defined in model_registry_config.yml under key 'rebalancing';
+        'method' (only "smote") and the parameters of the sampler, e.g.
+        {method: smote, k_neighbors: 5, n_jobs: -1}
+
+    random_state: int, optional
+        Seed of the sampler, when not set in rebalancing
+
+    cache_dir: str, optional
+        Directory of the fold-level recipe cache, see BlockedSMOTE
+
+    Returns
+    -------
+    BlockedSMOTE
+        Sampler to be placed between the preprocessor and the model
+    """
+    params = dict(rebalancing)
+    method = params.pop("method", "smote")
+    if method not in REBALANCING_METHODS:
+        raise ValueError(f"rebalancing method must be one of {REBALANCING_METHODS}")
+
+    params.setdefault("random_state", random_state)
+    return BlockedSMOTE(cache_dir=cache_dir, **params)
@@ -0,0 +1,76 @@
+# File written by Zhang Zhexiang (232842C)
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import numpy as np
+import sklearn
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.metrics import precision_recall_curve
+from sklearn.model_selection import cross_val_predict
+
+# The models of this project transform DataFrames into DataFrames: their
+# preprocessors set their own output (see _build_preprocessor); the global output
+# config still applies to models pickled before, wherever they are loaded
+# (unpickling one imports this module)
+sklearn.set_config(transform_output="pandas")
+
+
+class RecallOptimizedClassifier(BaseEstimator, ClassifierMixin):
+    """
+    A wrapper that adjusts the model's decision threshold to ensure that a certain percentage of positive cases is minimally caught.
+    This ensures that the model finds at least the "min_recall" amount of true positives, which minimizes false negatives (missed detections).
+
+    Do take note this approach also decreases the precision, which means the model will also be more prone to flagging more false positives.
+
+    Parameters
+    ----------
+    base_estimator: BaseEstimator
+        Model that is to be tuned
+
+    cv: int or cross-validation generator
+        How many cross validation chunks to split the data (or the splitter to use)
+
+    min_recall: float, default=0.85
+        Minimum target percentage of positive classes that the model should be able to detect (Float between range of 0.0 to 1.0)
+
+    n_jobs: int, optional
+        Parallel fits of the cross validation predictions
+
+    """
+
+    def __init__(self, base_estimator, cv, min_recall=0.85, n_jobs=None):
+        self.base_estimator = base_estimator
+        self.cv = cv
+        self.min_recall = min_recall
+        self.n_jobs = n_jobs
+        self.threshold_ = 0.5  # Default decision threshold (will be overwritten in fit)
+
+    # Determines the optimal probability threshold that achieves min_recall based on cv predictions
+    # y_proba: out-of-fold positive class probabilities that are already known (e.g.
+    # from the hyperparameter search), so the base estimator is not fitted again
+    def fit(self, X, y, y_proba=None):
+        if y_proba is None:
+            y_proba = cross_val_predict(
+                self.base_estimator,
+                X,
+                y,
+                cv=self.cv,
+                method="predict_proba",
+                n_jobs=self.n_jobs,
+            )[:, 1]
+
+        precision, recalls, thresholds = precision_recall_curve(y, y_proba)
+
+        valid_indices = np.where(recalls[:-1] >= self.min_recall)[0]
+        best_index = valid_indices[-1]
+        self.threshold_ = thresholds[best_index]
+        return self
+
+    # Predict class labels using the tuned threshold
+    def predict(self, X):
+        probs = self.base_estimator.predict_proba(X)[:, 1]
+        return (probs >= self.threshold_).astype(int)
+
+    # Return predicted probabilities
+    def predict_proba(self, X):
+        return self.base_estimator.predict_proba(X)
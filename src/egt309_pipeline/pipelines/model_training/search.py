@@ -0,0 +1,901 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import logging
+import math
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+from joblib import Parallel, cpu_count, delayed, effective_n_jobs
+from joblib.externals.loky import ProcessPoolExecutor
+from joblib.parallel import get_active_backend
+from sklearn.base import BaseEstimator, clone
+from sklearn.metrics import check_scoring
+from sklearn.model_selection import check_cv
+from sklearn.utils import check_random_state, resample
+from skopt import Optimizer
+from skopt.space import Space
+from skopt.utils import dimensions_aslist
+
+from .search_history import SearchHistory
+from .shared_data import SharedFrame
+
+logger = logging.getLogger(__name__)
+
+SEARCH_STRATEGIES = ("bayes", "halving")
+
+# Made-up score of the candidates being evaluated, from the scores so far
+LIAR_STRATEGIES = {"cl_min": np.min, "cl_mean": np.mean, "cl_max": np.max}
+
+# Acquisition functions of skopt; the "per second" ones (EIps, PIps) divide the
+# improvement by the fit time predicted by a second surrogate model
+ACQ_FUNCS = ("gp_hedge", "EI", "PI", "LCB", "EIps", "PIps")
+
+
+class _FoldSearch:
+    # cv_results_, data of the workers & refit of the best candidate, common to
+    # the searches; _live counts the entries of every parameter set that can
+    # still be the best, as a search may evaluate the same parameters twice
+
+    def _share(self, X: pd.DataFrame, y: pd.Series) -> tuple:
+        # Data handed to the fits of the workers: memory-mapped under shared_dir
+        # (see SharedFrame), or X & y themselves, copied into every task
+        if self.shared_dir is None:
+            return X, y
+        return SharedFrame(X, self.shared_dir), SharedFrame(y, self.shared_dir)
+
+    def _record(self, params: dict, fold_results: list, n_splits: int, **columns):
+        # Adds the cv_results_ entry of a candidate from its (score, fit time) per
+        # fold (None, or missing at the end, for the folds it was not evaluated
+        # on), returns its mean score on the folds it was evaluated on
+        fold_results = list(fold_results) + [None] * (n_splits - len(fold_results))
+        evaluated = [result for result in fold_results if result is not None]
+        mean_score = float(np.mean([score for score, _ in evaluated]))
+        entry = {
+            "params": params,
+            **columns,
+            "mean_test_score": mean_score,
+            "mean_fit_time": float(np.mean([fit_time for _, fit_time in evaluated])),
+        }
+        for fold, result in enumerate(fold_results):
+            entry[f"split{fold}_test_score"] = np.nan if result is None else result[0]
+        for name, value in entry.items():
+            self.cv_results_.setdefault(name, []).append(value)
+        self._live[_params_key(params)] += 1
+        return mean_score
+
+    def _discard(self, params: dict):
+        # An entry of params can never be the best: drops what the scorer stored
+        # for them (see OutOfFoldScorer.discard), unless another entry with the
+        # same parameters still can be, as the predictions are shared
+        key = _params_key(params)
+        self._live[key] -= 1
+        discard = getattr(self.scoring, "discard", None)
+        if discard is not None and self._live[key] <= 0:
+            discard(params)
+
+    def _best_index(self, scores, offset: int = 0) -> int:
+        # Index in cv_results_ of the best of scores, the mean scores of its
+        # entries from offset on; failed (NaN) and pruned (-inf) candidates are
+        # never the best
+        scores = np.nan_to_num(np.asarray(scores, dtype=float), nan=-np.inf)
+        if not (scores > -np.inf).any():
+            reason = "no candidate was evaluated"
+            if len(scores):
+                reason = f"all {len(scores)} candidates failed or were pruned"
+            raise ValueError(
+                f"No candidate of {type(self).__name__} finished: {reason}"
+            )
+        return offset + int(np.argmax(scores))
+
+    def _refit(self, X: pd.DataFrame, y: pd.Series, best_index: int):
+        self.best_index_ = best_index
+        self.best_params_ = self.cv_results_["params"][best_index]
+        self.best_score_ = self.cv_results_["mean_test_score"][best_index]
+        self.best_estimator_ = clone(self.estimator).set_params(**self.best_params_)
+        self.best_estimator_.fit(X, y)
+        return self
+
+
+class BayesianSearch(_FoldSearch):
+    """
+    Bayesian hyperparameter search that evaluates candidates fold by fold, and
+    optionally prunes the hopeless ones.
+
+    Candidates are proposed by a skopt Optimizer with the defaults of
+    BayesSearchCV (Gaussian process, 10 random initial points, gp_hedge
+    acquisition), so without pruning & with n_points=1 the same candidates are
+    evaluated. The folds of a candidate are fitted all at once without pruning.
+    With pruning, its first n_warmup_folds folds are fitted first, then the others
+    in batches of n_jobs folds, and a candidate is abandoned after a batch when its
+    mean score on the folds evaluated so far is below the percentile (the median
+    by default) of the mean scores of the completed candidates on the same folds.
+    The warm-up folds come first even with n_jobs >= the number of folds, so that
+    a hopeless candidate is abandoned before its other folds are fitted; a
+    candidate that is not pruned then takes two rounds of fits instead of one.
+    The optimizer is told the mean score of the evaluated folds, so the surrogate
+    model still learns from pruned candidates; pruned candidates are never
+    selected.
+
+    A candidate whose fit (or scoring) raises on a fold scores error_score on it,
+    like BayesSearchCV: with the default NaN, the candidate is never selected and
+    the optimizer is told the worst score so far, so that it moves away from it.
+
+    With n_points > 1, n_points candidates are evaluated at once, asynchronously:
+    every fold fit is a task of a pool of n_jobs worker processes (with pruning,
+    the other folds of a candidate are submitted once its warm-up folds are done
+    and it is not pruned), and as soon as the last fold of a candidate is done (or
+    it is pruned), the optimizer is told its score and proposes the next
+    candidate. Proposals account for the
+    candidates still being evaluated with a constant liar (strategy): they are
+    told to a copy of the optimizer with a made-up score, so that it does not
+    propose the same region again. Candidates complete in any order, so the
+    search is not reproducible from random_state alone.
+
+    The search is cost-aware with a time_budget and/or a "per second"
+    acq_func. With a time_budget, no candidate is proposed once it has elapsed
+    (the candidates being evaluated are completed, so the search overruns it by
+    at most their evaluation), and fewer than n_iter candidates may be evaluated.
+    The budget holds whether or not a candidate finished: a search whose
+    candidates all failed or were pruned within it raises.
+    With acq_func "EIps" or "PIps", the optimizer also learns the mean fold fit
+    time of every candidate and proposes the best expected improvement per
+    second, favouring cheap candidates over expensive ones that promise about
+    the same score.
+
+    Parameters
+    ----------
+    estimator: BaseEstimator
+        Estimator (or Pipeline) to tune
+
+    search_spaces: dict
+        skopt.space dimensions of the searched parameters (see _parse_search_space)
+
+    cv: int, splitter or list of (train, test) indices
+        Cross validation folds
+
+    scoring: str or callable
+        Scoring of the folds, higher is better
+
+    n_iter: int, default=50
+        Candidates to evaluate
+
+    pruning: dict, optional
+        Disabled when None, otherwise:
+            percentile: float, default=50
+                Percentile of the completed candidates a candidate must reach
+            n_startup_candidates: int, default=5
+                Completed candidates before any candidate is pruned
+            n_warmup_folds: int, default=1
+                Folds a candidate is evaluated on before it can be pruned
+
+    n_points: int, default=1
+        Candidates evaluated at once
+
+    strategy: {"cl_min", "cl_mean", "cl_max"}, default="cl_min"
+        Made-up score of the candidates being evaluated (the worst, mean or best
+        score so far, for the minimised objective), when n_points > 1
+
+    acq_func: str, default="gp_hedge"
+        Acquisition function of the optimizer (see ACQ_FUNCS)
+
+    time_budget: float, optional
+        Seconds after which no candidate is proposed, unlimited when None; the
+        search raises when no candidate finished within it
+
+    n_jobs: int, optional
+        Parallel fits
+
+    random_state: int, optional
+        Seed of the optimizer
+
+    shared_dir: str, optional
+        Directory where X & y are memory-mapped once for the fits of the workers
+        (see SharedFrame), instead of being copied into every task; the data is
+        copied when None
+
+    history: SearchHistory, optional
+        Evaluations of earlier runs of the same search, which are told to the
+        optimizer before it proposes any candidate and count towards n_iter (an
+        interrupted search resumes where it stopped); every new evaluation is
+        appended to it as soon as it is done
+
+    error_score: "raise" or float, default=np.nan
+        Score of a fold whose fit or scoring raises (see FoldFit); "raise" stops
+        the search
+
+    Attributes
+    ----------
+    best_params_: dict
+        Parameters of the best completed candidate
+
+    best_score_: float
+        Mean fold score of the best candidate
+
+    best_estimator_: BaseEstimator
+        Estimator with best_params_ fitted on the whole data
+
+    cv_results_: dict
+        One entry per candidate, in their order of completion: params, n_folds
+        (folds evaluated), pruned, mean_test_score, split<i>_test_score (NaN when
+        not evaluated) and mean_fit_time
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        estimator: BaseEstimator,
+        search_spaces: dict,
+        cv,
+        scoring,
+        n_iter: int = 50,
+        pruning: dict = None,
+        n_points: int = 1,
+        strategy: str = "cl_min",
+        acq_func: str = "gp_hedge",
+        time_budget: float = None,
+        n_jobs: int = None,
+        random_state: int = None,
+        history: SearchHistory = None,
+        shared_dir: str = None,
+        error_score=np.nan,
+    ):
+        self.estimator = estimator
+        self.search_spaces = search_spaces
+        self.cv = cv
+        self.scoring = scoring
+        self.n_iter = n_iter
+        self.pruning = pruning
+        self.n_points = n_points
+        self.strategy = strategy
+        self.acq_func = acq_func
+        self.time_budget = time_budget
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.history = history
+        self.shared_dir = shared_dir
+        self.error_score = error_score
+
+    def fit(self, X: pd.DataFrame, y: pd.Series) -> "BayesianSearch":
+        if self.strategy not in LIAR_STRATEGIES:
+            raise ValueError(f"strategy must be one of {tuple(LIAR_STRATEGIES)}")
+        if self.acq_func not in ACQ_FUNCS:
+            raise ValueError(f"acq_func must be one of {ACQ_FUNCS}")
+
+        deadline = None
+        if self.time_budget is not None:
+            deadline = time.perf_counter() + self.time_budget
+
+        X_shared, y_shared = self._share(X, y)
+        run = _SearchRun(
+            X_shared,
+            y_shared,
+            _split(self.cv, X, y),
+            FoldFit(
+                self.estimator,
+                check_scoring(self.estimator, scoring=self.scoring),
+                self.error_score,
+            ),
+            Optimizer(
+                dimensions_aslist(self.search_spaces),
+                acq_func=self.acq_func,
+                random_state=check_random_state(self.random_state),
+            ),
+            deadline,
+        )
+        names = sorted(self.search_spaces)
+        self.cv_results_ = {}
+        self._live = Counter()
+
+        # Warm start from the evaluations of earlier runs
+        records = self.history.load()[: self.n_iter] if self.history else []
+        if records:
+            for record in records:
+                fold_results = [
+                    None if score is None else (score, fit_time)
+                    for score, fit_time in zip(
+                        record["fold_scores"], record["fit_times"]
+                    )
+                ]
+                self._add(record["params"], fold_results, len(run.folds), run.completed)
+            points, objectives = [], []
+            for record, score, fit_time in zip(
+                records,
+                self.cv_results_["mean_test_score"],
+                self.cv_results_["mean_fit_time"],
+            ):
+                objective = self._objective(
+                    score, fit_time, run.optimizer.yi + objectives
+                )
+                if objective is not None:
+                    points.append([record["params"][name] for name in names])
+                    objectives.append(objective)
+            if points:
+                run.optimizer.tell(points, objectives)
+            # Reused evaluations make the result depend on files left by earlier
+            # runs, so they are reported loudly
+            logger.warning(
+                f"Reusing {len(records)} of {self.n_iter} candidates evaluated by an "
+                f"earlier run, from {self.history.path} (delete it to search afresh)"
+            )
+
+        search = self._search_async if self.n_points > 1 else self._search
+        search(run, self.n_iter - len(records))
+        if _out_of_time(deadline):
+            n_evaluated = len(self.cv_results_.get("params", []))
+            if not run.completed:
+                raise ValueError(
+                    f"No candidate of {type(self).__name__} finished within the "
+                    f"time budget of {self.time_budget} s: {n_evaluated} candidates "
+                    "failed or were pruned"
+                )
+            logger.info(
+                f"Spent the time budget of {self.time_budget} s after "
+                f"{n_evaluated} candidates"
+            )
+
+        mean_scores = np.where(
+            self.cv_results_.get("pruned", []),
+            -np.inf,
+            self.cv_results_.get("mean_test_score", []),
+        )
+        return self._refit(X, y, self._best_index(mean_scores))
+
+    def _search(self, run: "_SearchRun", n_candidates: int):
+        # One candidate at a time: its warm-up folds, then the others in batches of
+        # n_jobs (all the folds in one batch without pruning)
+        folds = run.folds
+        n_warmup = self._warmup_folds(len(folds))
+        batch_size = max(1, min(effective_n_jobs(self.n_jobs), len(folds)))
+        batches = [range(n_warmup)] + [
+            range(start, min(start + batch_size, len(folds)))
+            for start in range(n_warmup, len(folds), batch_size)
+        ]
+
+        with Parallel(n_jobs=self.n_jobs) as parallel:
+            for _ in range(n_candidates):
+                if _out_of_time(run.deadline):
+                    break
+                point = self._propose(run.optimizer, [])
+                params = dict(zip(sorted(self.search_spaces), point))
+
+                fold_results = [None] * len(folds)
+                for batch in batches:
+                    results = parallel(
+                        delayed(run.fit)(run.X, run.y, *folds[fold], params)
+                        for fold in batch
+                    )
+                    for fold, result in zip(batch, results):
+                        fold_results[fold] = result
+                    if self._prune(fold_results, run.completed):
+                        break
+
+                self._tell(run, point, params, fold_results)
+
+    def _search_async(self, run: "_SearchRun", n_candidates: int):
+        # n_points candidates at a time, every fold fit a task of the worker pool;
+        # a candidate is told as soon as it is done, and replaced right away
+        with _worker_pool(self.n_jobs) as executor:
+            running = {}  # Future of a fold fit: (candidate, fold)
+            pending = []  # Candidates being evaluated
+            n_proposed = 0
+
+            def proposing():
+                return n_proposed < n_candidates and not _out_of_time(run.deadline)
+
+            def submit(candidate: dict, folds):
+                for fold in folds:
+                    train, test = run.folds[fold]
+                    future = executor.submit(
+                        run.fit, run.X, run.y, train, test, candidate["params"]
+                    )
+                    running[future] = (candidate, fold)
+
+            n_warmup = self._warmup_folds(len(run.folds))
+
+            while running or proposing():
+                while len(pending) < self.n_points and proposing():
+                    point = self._propose(run.optimizer, [c["point"] for c in pending])
+                    candidate = {
+                        "point": point,
+                        "params": dict(zip(sorted(self.search_spaces), point)),
+                        "fold_results": [None] * len(run.folds),
+                    }
+                    submit(candidate, range(n_warmup))
+                    pending.append(candidate)
+                    n_proposed += 1
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    candidate, fold = running.pop(future)
+                    if future.cancelled() or not any(c is candidate for c in pending):
+                        continue  # Remaining fold of a pruned candidate
+
+                    fold_results = candidate["fold_results"]
+                    fold_results[fold] = future.result()
+                    if None in fold_results and not self._prune(
+                        fold_results, run.completed
+                    ):
+                        if not any(owner is candidate for owner, _ in running.values()):
+                            # Warm-up folds done, not pruned: the other folds
+                            submit(candidate, range(n_warmup, len(run.folds)))
+                        continue
+
+                    pending.remove(candidate)
+                    for other, (owner, _) in running.items():
+                        if owner is candidate:
+                            other.cancel()
+                    self._tell(
+                        run, candidate["point"], candidate["params"], fold_results
+                    )
+
+    def _propose(self, optimizer: Optimizer, pending: list) -> list:
+        # Next candidate (as Python values), given the points being evaluated
+        if not pending:
+            # ask(n_points=1) like BayesSearchCV, which draws differently
+            (point,) = optimizer.ask(n_points=1)
+        else:
+            liar = optimizer.copy(
+                random_state=optimizer.rng.randint(0, np.iinfo(np.int32).max)
+            )
+            liar._tell(pending, [self._lie(optimizer)] * len(pending))
+            point = liar.ask()
+        return [np.array(value).item() for value in point]
+
+    def _lie(self, optimizer: Optimizer):
+        # Made-up objective of the candidates being evaluated, like skopt's
+        # Optimizer.ask: with a "per second" acq_func, the optimizer holds (score,
+        # log fit time) pairs and the lie is a pair too (the log time is told
+        # through _tell, so that it is not logged twice)
+        lie = LIAR_STRATEGIES[self.strategy]
+        if "ps" not in self.acq_func:
+            return lie(optimizer.yi) if optimizer.yi else 0.0
+        if not optimizer.yi:
+            return (0.0, math.log(sys.float_info.max))
+        scores, log_times = zip(*optimizer.yi)
+        return (lie(scores), lie(log_times))
+
+    def _objective(self, mean_score: float, mean_fit_time: float, told: list):
+        # Optimizer minimizes, hence the negative score; the "per second"
+        # acq_funcs also learn the (per fold) fit time. A failed candidate (NaN
+        # score) gets the worst objective told so far (told, like the optimizer's
+        # yi), or None (not told) when there is none yet
+        if np.isnan(mean_score):
+            told = [y[0] if "ps" in self.acq_func else y for y in told]
+            if not told:
+                return None
+            mean_score = -max(told)
+        if "ps" in self.acq_func:
+            return (-mean_score, mean_fit_time)
+        return -mean_score
+
+    def _tell(self, run: "_SearchRun", point: list, params: dict, fold_results: list):
+        # Records & persists an evaluated candidate, and tells it to the optimizer
+        mean_score = self._add(params, fold_results, len(fold_results), run.completed)
+        if self.history is not None:
+            self.history.append(
+                params,
+                [None if result is None else result[0] for result in fold_results],
+                [None if result is None else result[1] for result in fold_results],
+                pruned=None in fold_results,
+            )
+
+        mean_fit_time = self.cv_results_["mean_fit_time"][-1]
+        objective = self._objective(mean_score, mean_fit_time, run.optimizer.yi)
+        if objective is not None:
+            run.optimizer.tell(point, objective)
+
+    def _add(
+        self, params: dict, fold_results: list, n_splits: int, completed: list
+    ) -> float:
+        # Records an evaluated candidate, returns its mean score
+        fold_results = list(fold_results) + [None] * (n_splits - len(fold_results))
+        n_folds = sum(result is not None for result in fold_results)
+        pruned = n_folds < n_splits
+        mean_score = self._record(
+            params, fold_results, n_splits, n_folds=n_folds, pruned=pruned
+        )
+        if np.isnan(mean_score):
+            logger.warning(f"Candidate failed, ranked last: {params}")
+        elif pruned:
+            logger.debug(f"Pruned after {n_folds} folds: {params}")
+        else:
+            completed.append([score for score, _ in fold_results])
+            return mean_score
+        self._discard(params)
+        return mean_score
+
+    def _warmup_folds(self, n_folds: int) -> int:
+        # Folds of a candidate fitted before the others: with pruning, the
+        # n_warmup_folds it must run before it can be pruned; all without
+        if self.pruning is None:
+            return n_folds
+        return max(1, min(self.pruning.get("n_warmup_folds", 1), n_folds))
+
+    def _prune(self, fold_results: list, completed: list) -> bool:
+        # Whether a candidate with the (score, fit time) of some folds (None for
+        # the others) is hopeless
+        evaluated = [fold for fold, result in enumerate(fold_results) if result]
+        if self.pruning is None or len(evaluated) == len(fold_results):
+            return False
+        if len(evaluated) < self.pruning.get("n_warmup_folds", 1):
+            return False
+        if len(completed) < max(1, self.pruning.get("n_startup_candidates", 5)):
+            return False
+
+        references = [np.mean([scores[i] for i in evaluated]) for scores in completed]
+        cutoff = np.percentile(references, self.pruning.get("percentile", 50))
+        return np.mean([fold_results[i][0] for i in evaluated]) < cutoff
+
+
+class SuccessiveHalvingSearch(_FoldSearch):
+    """
+    Successive halving (multi-fidelity) hyperparameter search.
+
+    n_candidates candidates are drawn from the search space and evaluated on every
+    CV fold with a small budget of resources. Only the best 1/factor of them are
+    promoted to the next round, which gets factor times more resources, until the
+    last round evaluates the remaining candidates with max_resources. Most
+    candidates are therefore only ever fitted on a fraction of the cost.
+
+    Resources are either:
+        "n_samples": a stratified subsample of the training part of every fold
+            (the same subsample for every candidate of a round). Validation folds
+            are never subsampled.
+        a parameter of the estimator (e.g. "model__n_estimators"), which must
+            not be part of the search space
+
+    Parameters
+    ----------
+    estimator: BaseEstimator
+        Estimator (or Pipeline) to tune
+
+    search_spaces: dict
+        skopt.space dimensions of the searched parameters (see _parse_search_space)
+
+    cv: int, splitter or list of (train, test) indices
+        Cross validation folds
+
+    scoring: str or callable
+        Scoring of the folds, higher is better
+
+    n_candidates: int, default=27
+        Candidates of the first round
+
+    factor: int, default=3
+        1/factor of the candidates are kept, with factor times the resources,
+        every round
+
+    resource: str, default="n_samples"
+        "n_samples" or the name of an integer parameter of estimator
+
+    min_resources: int, optional
+        Resources of the first round; max_resources / factor^(rounds - 1) when
+        not given, so that the last round uses max_resources
+
+    max_resources: int, optional
+        Resources of the last round, required for a parameter resource. The last
+        round of "n_samples" always fits on the whole training folds
+
+    n_jobs: int, optional
+        Parallel fits
+
+    random_state: int, optional
+        Seed of the candidates and subsamples
+
+    shared_dir: str, optional
+        Directory where X & y are memory-mapped once for the fits of the workers
+        (see SharedFrame); the data is copied into every task when None
+
+    error_score: "raise" or float, default=np.nan
+        Score of a fold whose fit or scoring raises (see FoldFit); with NaN, the
+        candidate ranks last and is never selected
+
+    Attributes
+    ----------
+    best_params_: dict
+        Parameters of the best candidate of the last round (with the resource
+        parameter when it is one)
+
+    best_score_: float
+        Mean fold score of the best candidate
+
+    best_estimator_: BaseEstimator
+        Estimator with best_params_ fitted on the whole data
+
+    cv_results_: dict
+        One entry per (candidate, round): params, iter, n_resources,
+        mean_test_score, split<i>_test_score and mean_fit_time
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        estimator: BaseEstimator,
+        search_spaces: dict,
+        cv,
+        scoring,
+        n_candidates: int = 27,
+        factor: int = 3,
+        resource: str = "n_samples",
+        min_resources: int = None,
+        max_resources: int = None,
+        n_jobs: int = None,
+        random_state: int = None,
+        shared_dir: str = None,
+        error_score=np.nan,
+    ):
+        self.estimator = estimator
+        self.search_spaces = search_spaces
+        self.cv = cv
+        self.scoring = scoring
+        self.n_candidates = n_candidates
+        self.factor = factor
+        self.resource = resource
+        self.min_resources = min_resources
+        self.max_resources = max_resources
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.shared_dir = shared_dir
+        self.error_score = error_score
+
+    def fit(self, X: pd.DataFrame, y: pd.Series) -> "SuccessiveHalvingSearch":
+        if self.factor < 2:
+            raise ValueError("factor must be an integer of at least 2")
+        if self.resource != "n_samples" and self.resource in self.search_spaces:
+            raise ValueError(f"{self.resource} cannot be searched and the resource")
+        if self.resource != "n_samples" and self.max_resources is None:
+            raise ValueError("max_resources is required for a parameter resource")
+        if self.resource == "n_samples" and self.max_resources is not None:
+            raise ValueError("n_samples ends on the whole folds, without max_resources")
+
+        fit = FoldFit(
+            self.estimator,
+            check_scoring(self.estimator, scoring=self.scoring),
+            self.error_score,
+        )
+        folds = _split(self.cv, X, y)
+        candidates = sample_candidates(
+            self.search_spaces, self.n_candidates, self.random_state
+        )
+
+        # 1 + floor(log_factor(candidates)), counted on integers since the float
+        # log undercounts exact powers (e.g. log(243, 3) < 5)
+        n_rounds = 1
+        while self.factor**n_rounds <= len(candidates):
+            n_rounds += 1
+        max_resources = self.max_resources
+        if max_resources is None:
+            max_resources = min(len(train) for train, _ in folds)
+        min_resources = self.min_resources
+        if min_resources is None:
+            min_resources = max(1, max_resources // self.factor ** (n_rounds - 1))
+
+        self.cv_results_ = {}
+        self._live = Counter()
+        scores = []
+        X_shared, y_shared = self._share(X, y)
+        with Parallel(n_jobs=self.n_jobs) as parallel:
+            for round_id in range(n_rounds):
+                n_resources = min(min_resources * self.factor**round_id, max_resources)
+                if round_id == n_rounds - 1:
+                    n_resources = max_resources
+                round_folds, round_candidates = folds, candidates
+                if self.resource == "n_samples":
+                    if round_id < n_rounds - 1:
+                        round_folds = self._subsample(folds, y, n_resources)
+                else:
+                    round_candidates = [
+                        {**params, self.resource: int(n_resources)}
+                        for params in candidates
+                    ]
+
+                logger.debug(
+                    f"Halving round {round_id}: {len(candidates)} candidates, "
+                    f"{n_resources} {self.resource}"
+                )
+                results = parallel(
+                    delayed(fit)(X_shared, y_shared, train, test, params)
+                    for params in round_candidates
+                    for train, test in round_folds
+                )
+                n_folds = len(folds)
+                scores = [
+                    self._record(
+                        params,
+                        results[i * n_folds : (i + 1) * n_folds],
+                        n_folds,
+                        iter=round_id,
+                        n_resources=n_resources,
+                    )
+                    for i, params in enumerate(round_candidates)
+                ]
+
+                # Best 1/factor candidates (in their order of appearance on ties)
+                n_kept = max(1, math.ceil(len(candidates) / self.factor))
+                ranking = np.argsort(-np.asarray(scores), kind="stable")[:n_kept]
+                candidates = [candidates[i] for i in sorted(ranking)]
+
+                self._discard_out(
+                    round_candidates, ranking, last_round=round_id == n_rounds - 1
+                )
+
+        offset = len(self.cv_results_["params"]) - len(scores)
+        return self._refit(X, y, self._best_index(scores, offset))
+
+    def _discard_out(self, round_candidates: list, ranking, last_round: bool):
+        # The candidates of a round that are out can never be the best; with a
+        # parameter resource, the promoted ones are stored again under the
+        # resource of their next round. The eliminated go first, so that a
+        # promoted twin keeps the predictions they share
+        kept = set(np.asarray(ranking).tolist())
+        survive = last_round or self.resource == "n_samples"
+        for i, params in enumerate(round_candidates):
+            if i not in kept:
+                self._discard(params)
+        for i in sorted(kept):
+            if not survive:
+                self._discard(round_candidates[i])
+            elif not last_round:
+                # Superseded by its entry of the next round
+                self._live[_params_key(round_candidates[i])] -= 1
+
+    def _subsample(self, folds: list, y: pd.Series, n_resources: int) -> list:
+        # Stratified subsample of the training part of every fold
+        y_values = np.asarray(y)
+        subsampled = []
+        for train, test in folds:
+            if n_resources >= len(train):
+                subsampled.append((train, test))
+                continue
+            subsample = resample(
+                train,
+                replace=False,
+                n_samples=n_resources,
+                stratify=y_values[train],
+                random_state=self.random_state,
+            )
+            subsampled.append((np.sort(subsample), test))
+        return subsampled
+
+
+def sample_candidates(
+    search_spaces: dict, n_candidates: int, random_state=None
+) -> list:
+    """
+    Draws n_candidates parameter sets from skopt.space dimensions (with their
+    priors, e.g. log-uniform)
+
+    Parameters
+    ----------
+    search_spaces: dict
+        Parameter name to skopt.space dimension
+
+    n_candidates: int
+        Number of parameter sets
+
+    random_state: int, optional
+        Seed of the draws
+
+    Returns
+    -------
+    list[dict]
+        Parameter sets
+    """
+    names = list(search_spaces)
+    if not names:
+        return [{}]
+    points = Space([search_spaces[name] for name in names]).rvs(
+        n_samples=n_candidates, random_state=random_state
+    )
+    # Python types (not numpy scalars), so that best_params_ can be saved as JSON
+    return [
+        {name: np.array(value).item() for name, value in zip(names, point)}
+        for point in points
+    ]
+
+
+class FoldFit:
+    """
+    Fit of a candidate on one CV fold, run by the workers of the searches: fits a
+    clone of estimator with the candidate's parameters on the train rows and scores
+    it on the test rows. A fit or scoring that raises is logged and scores
+    error_score, so that one failing candidate does not stop the search
+
+    Parameters
+    ----------
+    estimator: BaseEstimator
+        Estimator (or Pipeline) to tune
+
+    scorer: callable
+        Scorer of the test rows, higher is better
+
+    error_score: "raise" or float, default=np.nan
+        Score of a fold whose fit or scoring raises; "raise" re-raises the error
+    """
+
+    def __init__(self, estimator: BaseEstimator, scorer, error_score=np.nan):
+        self.estimator = estimator
+        self.scorer = scorer
+        self.error_score = error_score
+
+    def __call__(
+        self,
+        X: pd.DataFrame,
+        y: pd.Series,
+        train: np.ndarray,
+        test: np.ndarray,
+        params: dict,
+    ) -> tuple:
+        """
+        Returns
+        -------
+        tuple
+            (score, fit time in seconds)
+        """
+        model = clone(self.estimator).set_params(**params)
+        start = time.perf_counter()
+        try:
+            model.fit(_take(X, train), _take(y, train))
+            fit_time = time.perf_counter() - start
+            return self.scorer(model, _take(X, test), _take(y, test)), fit_time
+        except Exception as error:
+            if isinstance(self.error_score, str) and self.error_score == "raise":
+                raise
+            logger.warning(
+                f"Fit failed, scored {self.error_score}: {params}\n"
+                f"{type(error).__name__}: {error}"
+            )
+            return self.error_score, time.perf_counter() - start
+
+
+@dataclass
+class _SearchRun:
+    # State of a fit of BayesianSearch, shared by its steps: the data handed to
+    # the workers, the folds, the fold fit, the optimizer, the time budget's
+    # deadline and the fold scores of the completed candidates
+    X: object
+    y: object
+    folds: list
+    fit: FoldFit
+    optimizer: Optimizer
+    deadline: float = None
+    completed: list = field(default_factory=list)
+
+
+def _out_of_time(deadline: float) -> bool:
+    # Whether the time budget of a search has elapsed
+    return deadline is not None and time.perf_counter() > deadline
+
+
+def _worker_pool(n_jobs: int = None):
+    # Process pool of the asynchronous search, apart from joblib's reusable pool
+    # (which joblib reconfigures for its own reducers); like joblib's workers, the
+    # workers limit their BLAS & OpenMP thread pools (see CPUBudget.search_context)
+    n_workers = effective_n_jobs(n_jobs)
+    backend, _ = get_active_backend()
+    threads = getattr(backend, "inner_max_num_threads", None)
+    threads = threads or max(1, cpu_count() // n_workers)
+    env = {name: str(threads) for name in backend.MAX_NUM_THREADS_VARS}
+    return ProcessPoolExecutor(max_workers=n_workers, env=env)
+
+
+def _params_key(params: dict) -> tuple:
+    # Same key for the same parameter values, whatever their order
+    return tuple(sorted(params.items()))
+
+
+def _split(cv, X, y) -> list:
+    # (train, test) indices of every fold
+    if isinstance(cv, list):
+        return cv
+    return list(check_cv(cv, y, classifier=True).split(X, y))
+
+
+def _take(data, rows: np.ndarray):
+    if isinstance(data, SharedFrame):
+        return data.take(rows)
+    return data.iloc[rows] if hasattr(data, "iloc") else data[rows]
@@ -0,0 +1,105 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import json
+import logging
+from pathlib import Path
+
+import joblib
+
+logger = logging.getLogger(__name__)
+
+
+class SearchHistory:
+    """
+    Evaluations of a hyperparameter search, persisted as JSON Lines.
+
+    Every evaluated candidate is appended as one line (params, fold scores, fit
+    times, whether it was pruned) as soon as its evaluation is done, so a search
+    that crashes or is interrupted loses at most the candidate it was evaluating.
+    The file is named after a fingerprint of everything the scores depend on (see
+    search_fingerprint): a search only reuses the evaluations of identical
+    searches on identical data.
+
+    Parameters
+    ----------
+    directory: str
+        Directory of the histories, e.g. data/06_models/search_history
+
+    name: str
+        Subdirectory, e.g. the class of the model
+
+    fingerprint: str
+        Fingerprint of the search (see search_fingerprint)
+
+    Example
+    -------
+        history = SearchHistory(directory, "XGBClassifier", search_fingerprint(...))
+        search = BayesianSearch(model, param_grid, cv=folds, scoring=scoring, history=history)
+    """
+
+    def __init__(self, directory: str, name: str, fingerprint: str):
+        self.path = Path(directory) / name / f"{fingerprint}.jsonl"
+
+    def load(self) -> list:
+        """
+        Evaluations of earlier runs, in their order of evaluation (a line cut
+        short by a crash is skipped)
+
+        Returns
+        -------
+        list[dict]
+            {"params", "fold_scores", "fit_times", "pruned"} of every candidate,
+            with None as the score & fit time of the folds it was not evaluated on
+        """
+        if not self.path.is_file():
+            return []
+
+        records = []
+        with self.path.open(encoding="utf-8") as file:
+            for line in file:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.debug(f"Skipped an incomplete line of {self.path}")
+        return records
+
+    def append(
+        self, params: dict, fold_scores: list, fit_times: list, pruned: bool = False
+    ):
+        """
+        Persists the evaluation of a candidate (None as the score & fit time of
+        the folds it was not evaluated on)
+        """
+        record = {
+            "params": params,
+            "fold_scores": [_float(score) for score in fold_scores],
+            "fit_times": [_float(fit_time) for fit_time in fit_times],
+            "pruned": bool(pruned),
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as file:
+            file.write(json.dumps(record) + "\n")
+
+
+def _float(value) -> float:
+    return None if value is None else float(value)
+
+
+def search_fingerprint(*parts) -> str:
+    """
+    Fingerprint of a search: a hash of everything its scores depend on, e.g. the
+    search space, the model & its fixed parameters, the folds, the scoring and the
+    training data
+
+    Parameters
+    ----------
+    *parts
+        Objects joblib can hash (dicts, DataFrames, arrays...)
+
+    Returns
+    -------
+    str
+        Hexadecimal hash
+    """
+    return joblib.hash(parts)
@@ -0,0 +1,114 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+class SharedFrame:
+    """
+    Read-only DataFrame (or Series) stored as memory-mapped numeric buffers, for
+    the worker processes of a search.
+
+    Every column is written once to a contiguous .npy file: numeric, boolean and
+    datetime columns as they are, categorical columns as their integer codes, and
+    any other column (strings, nullable extension dtypes) as the codes of its
+    distinct values. The schema (column names, dtypes, categories) is kept in the
+    object, so pickling a SharedFrame only sends the schema & the file paths: the
+    workers memory-map the files and share their pages (the OS page cache)
+    instead of receiving a copy of the data with every task. take() rebuilds
+    the rows a fit needs, with the original dtypes & index.
+
+    Parameters
+    ----------
+    data: pd.DataFrame or pd.Series
+        Data to share
+
+    directory: str
+        Directory of the buffers (e.g. the cache directory of train_model, whose
+        removal deletes them)
+
+    Example
+    -------
+        X_shared = SharedFrame(X_train, cache_dir)
+        Parallel(n_jobs=4)(delayed(fit_fold)(X_shared, train) for train, _ in folds)
+        # in a worker
+        X_fold = X_shared.take(train)
+    """
+
+    def __init__(self, data, directory: str):
+        self.series = isinstance(data, pd.Series)
+        self.name = data.name if self.series else None
+        frame = data.to_frame() if self.series else data
+        self.columns = frame.columns
+        self.index_name = frame.index.name
+        self.directory = Path(directory) / f"shared_{uuid.uuid4().hex}"
+        self.directory.mkdir(parents=True)
+
+        # (dtype, categories) of every column, then of the index
+        self.schema = []
+        columns = [frame.iloc[:, i] for i in range(frame.shape[1])]
+        for i, values in enumerate([*columns, frame.index.to_series()]):
+            buffer, categories = _encode(values)
+            np.save(self.directory / f"{i}.npy", buffer)
+            self.schema.append((values.dtype, categories))
+        self._buffers = None
+
+    def __len__(self) -> int:
+        return len(self._load()[-1])
+
+    def __getstate__(self) -> dict:
+        # Workers map the buffers again rather than receiving them
+        return {**self.__dict__, "_buffers": None}
+
+    def take(self, rows: np.ndarray):
+        """
+        Rows of the data, as a pd.DataFrame (pd.Series) with its original
+        dtypes, columns & index
+
+        Parameters
+        ----------
+        rows: np.ndarray
+            Positions of the rows
+        """
+        buffers = self._load()
+        rows = np.asarray(rows)
+        values = [
+            _decode(buffer[rows], dtype, categories)
+            for buffer, (dtype, categories) in zip(buffers, self.schema)
+        ]
+        index = pd.Index(values.pop(), name=self.index_name)
+        frame = pd.DataFrame(dict(enumerate(values)), index=index, copy=False)
+        frame.columns = self.columns
+        return frame.iloc[:, 0].rename(self.name) if self.series else frame
+
+    def _load(self) -> list:
+        # Memory-maps the buffers once per process
+        if self._buffers is None:
+            self._buffers = [
+                np.load(self.directory / f"{i}.npy", mmap_mode="r")
+                for i in range(len(self.schema))
+            ]
+        return self._buffers
+
+
+def _encode(values: pd.Series) -> tuple:
+    # (numeric buffer, categories or None) of a column
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return np.asarray(values.cat.codes), None
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in "biufcmM":
+        return np.ascontiguousarray(values.to_numpy()), None
+    codes, categories = pd.factorize(values, use_na_sentinel=True)
+    return codes.astype(np.min_scalar_type(-max(1, len(categories)))), categories
+
+
+def _decode(buffer: np.ndarray, dtype, categories) -> np.ndarray:
+    # Column (as an array of its dtype) from its buffer
+    if isinstance(dtype, pd.CategoricalDtype):
+        return pd.Categorical.from_codes(np.asarray(buffer), dtype=dtype)
+    if categories is not None:
+        return pd.Categorical.from_codes(np.asarray(buffer), categories).astype(dtype)
+    return np.asarray(buffer)
@@ -0,0 +1,231 @@
+# Autoformatted & Linted with Ruff
+# Docstrings follow numpy Python Docstring Format
+
+import fnmatch
+import os
+import tempfile
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, wait
+from itertools import chain
+from pathlib import Path
+
+import pandas as pd
+from kedro.io import MemoryDataset, SharedMemoryDataset
+from kedro.runner import ParallelRunner
+from kedro.runner.task import Task
+from threadpoolctl import threadpool_limits
+
+from egt309_pipeline.config import project_parameters
+from egt309_pipeline.datasets import ArrowDataset
+from egt309_pipeline.pipelines.model_training.cpu_budget import NODE_CPUS_ENV
+
+# Cost of the nodes no node_costs pattern matches
+DEFAULT_NODE_COST = {"cpus": 1, "memory_gb": 0.5}
+
+
+class SharedMemoryRunner(ParallelRunner):
+    """
+    ParallelRunner that runs independent nodes (e.g. the train_<model>_node and
+    evaluate_<model>_node of every model) concurrently within a CPU & memory
+    budget, and shares their in-memory inputs instead of copying them into every
+    worker process.
+
+    Every node has a declared cost (cpus & memory_gb, from the first node_costs
+    pattern matching its name). A node ready to run is started as soon as the
+    costs of the running nodes plus its own fit in total_cores & total_memory_gb
+    (a node costing more than the budget runs alone); the most expensive ready
+    nodes are started first. A running node is held to its declared cpus: the
+    BLAS & OpenMP thread pools of its worker are limited to them, and the CPU
+    budget of a train node (see plan_cpu_budget) splits them between its search
+    workers and their threads, whatever cpu_budget's concurrent_models says.
+
+    Before a node runs, each of its in-memory pandas inputs that other nodes also
+    read is written once to an Arrow file in shared memory (/dev/shm when
+    available) and replaced in the catalog by an ArrowDataset, which the workers
+    memory-map: numeric & categorical columns are loaded zero-copy and every
+    worker shares the same pages, instead of unpickling its own copy from the
+    ParallelRunner's manager process. Persisted ArrowDatasets (X_train, y_train,
+    X_test, y_test) are already memory-mapped from disk and are loaded as they are.
+
+    Parameters
+    ----------
+    max_workers: int, optional
+        Worker processes, at most total_cores by default
+
+    is_async: bool, default=False
+        Load & save the node inputs and outputs with threads
+
+    config: dict, optional
+        Defined in parameters_runner.yml under key 'parameters_runner' (loaded from
+        the session's parameters when the run starts when not given, as `kedro
+        run` only passes is_async and creates the runner before the session's
+        context, e.g. `--params parameters_runner.total_cores=8`):
+            total_cores: cores shared by the running nodes, null for every core
+            total_memory_gb: memory shared by the running nodes, null for the
+                available memory
+            node_costs: {node name pattern: {cpus, memory_gb}}, matched with
+                fnmatch against the (namespaced) node names, first match wins
+
+    Example
+    -------
+        kedro run --runner=egt309_pipeline.runner.SharedMemoryRunner
+    """
+
+    def __init__(
+        self, max_workers: int = None, is_async: bool = False, config: dict = None
+    ):
+        super().__init__(max_workers=max_workers, is_async=is_async)
+        self._requested_workers = max_workers
+        self._config = config
+        if config is not None:
+            self._configure(config)
+
+    def _configure(self, config: dict):
+        # Budget & worker count of parameters_runner
+        self.total_cores = config.get("total_cores") or os.cpu_count() or 1
+        self.total_memory_gb = config.get("total_memory_gb") or _available_memory_gb()
+        self.node_costs = config.get("node_costs") or {}
+        self._max_workers = self._validate_max_workers(
+            self._requested_workers or self.total_cores
+        )
+
+    def node_cost(self, node) -> dict:
+        """
+        Declared cost of a node
+
+        Returns
+        -------
+        dict
+            {"cpus", "memory_gb"}
+        """
+        for pattern, cost in self.node_costs.items():
+            if fnmatch.fnmatch(node.name, pattern):
+                return {**DEFAULT_NODE_COST, **cost}
+        return dict(DEFAULT_NODE_COST)
+
+    def _run(self, pipeline, catalog, hook_manager=None, run_id=None) -> None:
+        if self._config is None:
+            self._configure(_load_runner_config())
+        nodes = pipeline.nodes
+        self._validate_catalog(catalog)
+        self._validate_nodes(nodes)
+        self._set_manager_datasets(catalog)
+
+        load_counts = Counter(chain.from_iterable(node.inputs for node in nodes))
+        node_dependencies = pipeline.node_dependencies
+        todo_nodes = set(node_dependencies)
+        done_nodes = set()
+        running = {}  # Future of a running node: (node, cost)
+
+        max_workers = self._get_required_workers_count(pipeline)
+        with (
+            tempfile.TemporaryDirectory(prefix="kedro_shared_", dir=_shm_dir()) as shm,
+            self._get_executor(max_workers) as executor,
+        ):
+            while True:
+                ready = [
+                    node
+                    for node in nodes
+                    if node in todo_nodes and node_dependencies[node] <= done_nodes
+                ]
+                ready.sort(
+                    key=lambda node: tuple(self.node_cost(node).values()), reverse=True
+                )
+                for node in ready:
+                    cost = self.node_cost(node)
+                    if running and not self._fits(cost, running.values()):
+                        continue
+
+                    self._share_inputs(node, catalog, load_counts, shm)
+                    # Like the ParallelRunner, the worker registers its own hooks
+                    # (the hook manager cannot be pickled)
+                    task = Task(
+                        node=node,
+                        catalog=catalog,
+                        hook_manager=None,
+                        is_async=self._is_async,
+                        run_id=run_id,
+                        parallel=True,
+                    )
+                    cpus = min(cost["cpus"], self.total_cores)
+                    future = executor.submit(_run_within_cpus, task, cpus)
+                    running[future] = (node, cost)
+                    todo_nodes.remove(node)
+                    self._logger.debug(f"Started node {node.name} ({cost})")
+
+                if not running:
+                    if todo_nodes:
+                        self._raise_runtime_error(todo_nodes, done_nodes, ready, None)
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node, _ = running.pop(future)
+                    try:
+                        future.result()
+                    except Exception:
+                        self._suggest_resume_scenario(pipeline, done_nodes, catalog)
+                        raise
+                    done_nodes.add(node)
+                    self._logger.info("Completed node: %s", node.name)
+                    self._logger.info(
+                        "Completed %d out of %d tasks", len(done_nodes), len(nodes)
+                    )
+                    self._release_datasets(node, catalog, load_counts, pipeline)
+
+    def _fits(self, cost: dict, running_costs) -> bool:
+        # Whether a node fits in the budget left by the running nodes
+        running_costs = list(running_costs)
+        cpus = sum(running["cpus"] for _, running in running_costs)
+        memory_gb = sum(running["memory_gb"] for _, running in running_costs)
+        return (
+            cpus + cost["cpus"] <= self.total_cores
+            and memory_gb + cost["memory_gb"] <= self.total_memory_gb
+        )
+
+    def _share_inputs(self, node, catalog, load_counts: Counter, directory: str):
+        # Moves the in-memory pandas inputs of a node that other nodes also read
+        # to memory-mapped Arrow files, once
+        for name in node.inputs:
+            dataset = catalog.get(name)
+            if load_counts[name] < 2 or not isinstance(
+                dataset, (MemoryDataset, SharedMemoryDataset)
+            ):
+                continue
+            data = catalog.load(name)
+            if not isinstance(data, (pd.DataFrame, pd.Series)):
+                continue
+
+            shared = ArrowDataset(filepath=str(Path(directory) / _file_name(name)))
+            shared.save(data)
+            catalog[name] = shared
+            self._logger.debug(f"Shared {name} through {directory}")
+
+
+def _run_within_cpus(task: Task, cpus: int):
+    # Runs a node's task in a worker process, held to the node's declared cpus
+    os.environ[NODE_CPUS_ENV] = str(cpus)
+    with threadpool_limits(limits=cpus):
+        return task.execute()
+
+
+def _load_runner_config() -> dict:
+    # parameters_runner of the session's parameters (shared with create_pipeline)
+    return project_parameters().get("parameters_runner") or {}
+
+
+def _available_memory_gb() -> float:
+    # Physical memory available to the run (unlimited when the OS does not say)
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") / 2**30
+    except (AttributeError, ValueError, OSError):
+        return float("inf")
+
+
+def _shm_dir() -> str:
+    # Shared memory file system when there is one, else the temporary directory
+    return "/dev/shm" if os.access("/dev/shm", os.W_OK) else None
+
+
+def _file_name(dataset_name: str) -> str:
+    return "".join(char if char.isalnum() else "_" for char in dataset_name)
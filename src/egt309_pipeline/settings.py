@@ -2,7 +2,12 @@
 from the Kedro defaults. For further information, including these default values, see
 https://docs.kedro.org/en/stable/kedro_project_setup/settings.html."""
 
-from egt309_pipeline.hooks import DisplayBannerBeforePipelineRuns, TrainingCompleteHook
+from egt309_pipeline.hooks import (
+    DisplayBannerBeforePipelineRuns,
+    MemoryReportHook,
+    SessionParametersHook,
+    TrainingCompleteHook,
+)
 
 # Instantiated project hooks.
 # For example, after creating a hooks.py and defining a ProjectHooks class there, do
@@ -10,7 +15,12 @@ from egt309_pipeline.hooks import DisplayBannerBeforePipelineRuns, TrainingCompl
 # Hooks are executed in a Last-In-First-Out (LIFO) order.
 # HOOKS = (ProjectHooks(),)
 
-HOOKS = (TrainingCompleteHook(), DisplayBannerBeforePipelineRuns())
+HOOKS = (
+    TrainingCompleteHook(),
+    DisplayBannerBeforePipelineRuns(),
+    MemoryReportHook(),
+    SessionParametersHook(),
+)
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
@@ -0,0 +1,62 @@
+# Autoformatted & Linted with Ruff
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from egt309_pipeline.pipelines.data_preparation.distribution_imputer import (
+    DistributionImputer,
+)
+
+
+def _rng_choice_fill(col: pd.Series, target_val=None) -> np.ndarray:
+    # Draws of the previous _random_distribution node: rng.choice over the
+    # value_counts() of the observed values
+    rng = np.random.default_rng(42)
+    if target_val is None:
+        observed, fill_mask = col[~col.isna()], col.isna()
+    else:
+        observed, fill_mask = col[col != target_val], col == target_val
+    probabilities = observed.value_counts(normalize=True).tolist()
+    labels = observed.value_counts().index.tolist()
+    return rng.choice(labels, size=fill_mask.sum(), p=probabilities)
+
+
+@pytest.fixture
+def tied_ages():
+    # 40 distinct ages, most of them sharing their count with others, in a
+    # shuffled order of first appearance, and 150 for the ages to impute
+    rng = np.random.default_rng(0)
+    ages = np.repeat(np.arange(20, 60), rng.integers(1, 4, size=40))
+    ages = np.concatenate([ages, np.full(200, 150)])
+    return pd.Series(rng.permutation(ages))
+
+
+def test_cdf_draws_like_rng_choice_with_tied_counts(tied_ages):
+    assert tied_ages[tied_ages != 150].value_counts().duplicated().any()
+    imputer = DistributionImputer(target_val=150).fit(tied_ages)
+
+    fill_mask, fill = imputer.fill(tied_ages)
+
+    np.testing.assert_array_equal(fill_mask, tied_ages == 150)
+    np.testing.assert_array_equal(fill, _rng_choice_fill(tied_ages, 150))
+
+
+def test_chunked_fit_draws_like_rng_choice(tied_ages):
+    imputer = DistributionImputer(target_val=150)
+    for start in range(0, len(tied_ages), 50):
+        imputer.partial_fit(tied_ages.iloc[start : start + 50])
+
+    _, fill = imputer.fill(tied_ages)
+
+    np.testing.assert_array_equal(fill, _rng_choice_fill(tied_ages, 150))
+
+
+def test_missing_values_draw_like_rng_choice():
+    col = pd.Series(["yes", None, "no", "yes", "no", None, "maybe", None] * 5)
+    imputer = DistributionImputer().fit(col)
+
+    fill_mask, fill = imputer.fill(col)
+
+    np.testing.assert_array_equal(fill_mask, col.isna())
+    np.testing.assert_array_equal(fill, _rng_choice_fill(col))
@@ -0,0 +1,203 @@
+# Autoformatted & Linted with Ruff
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import StratifiedKFold, cross_val_predict
+from sklearn.svm import SVC
+from sklearn.tree import DecisionTreeClassifier
+from skopt.space import Integer, Real
+
+from egt309_pipeline.pipelines.model_training.out_of_fold import (
+    OutOfFoldScorer,
+    load_out_of_fold,
+)
+from egt309_pipeline.pipelines.model_training.search import (
+    BayesianSearch,
+    SuccessiveHalvingSearch,
+)
+
+
+@pytest.fixture
+def data():
+    X, y = make_classification(n_samples=300, flip_y=0.1, random_state=0)
+    # Shuffled index, so that positions and labels differ
+    index = np.random.default_rng(0).permutation(1000)[: len(y)]
+    return pd.DataFrame(X, index=index), pd.Series(y, index=index)
+
+
+@pytest.fixture
+def folds(data):
+    X, y = data
+    return list(StratifiedKFold(3, shuffle=True, random_state=0).split(X, y))
+
+
+@pytest.mark.parametrize(
+    "scoring", ["recall_weighted", "f1", "neg_log_loss", "roc_auc", "accuracy"]
+)
+def test_scores_like_the_scorer(data, folds, tmp_path, scoring):
+    X, y = data
+    train, test = folds[0]
+    model = DecisionTreeClassifier(max_depth=3, random_state=0)
+    model.fit(X.iloc[train], y.iloc[train])
+    scorer = OutOfFoldScorer(scoring, ["max_depth"], str(tmp_path))
+
+    score = scorer(model, X.iloc[test], y.iloc[test])
+
+    assert score == pytest.approx(
+        get_scorer(scoring)(model, X.iloc[test], y.iloc[test])
+    )
+
+
+@pytest.mark.parametrize(
+    "scoring, expected_calls",
+    [
+        ("recall_weighted", ["predict_proba", "predict"]),
+        ("neg_log_loss", ["predict_proba"]),
+    ],
+)
+def test_predicts_probabilities_once(data, folds, tmp_path, scoring, expected_calls):
+    X, y = data
+    train, test = folds[0]
+    model = DecisionTreeClassifier(max_depth=3, random_state=0)
+    model.fit(X.iloc[train], y.iloc[train])
+    calls = []
+    for method in ("predict", "predict_proba"):
+        original = getattr(model, method)
+        setattr(model, method, lambda X, m=method, f=original: calls.append(m) or f(X))
+    scorer = OutOfFoldScorer(scoring, ["max_depth"], str(tmp_path))
+
+    scorer(model, X.iloc[test], y.iloc[test])
+
+    assert calls == expected_calls
+
+
+@pytest.mark.filterwarnings("ignore:The `probability` parameter:FutureWarning")
+@pytest.mark.parametrize("scoring", ["recall_weighted", "accuracy", "roc_auc"])
+def test_scores_with_the_estimators_own_predict(data, folds, tmp_path, scoring):
+    # SVC predicts with its decision function, its probabilities come from a
+    # separately fitted Platt scaling
+    X, y = data
+    train, test = folds[0]
+    model = SVC(C=0.05, probability=True, random_state=0)
+    model.fit(X.iloc[train], y.iloc[train])
+    most_probable = model.classes_[model.predict_proba(X.iloc[test]).argmax(axis=1)]
+    assert (model.predict(X.iloc[test]) != most_probable).any()
+    scorer = OutOfFoldScorer(scoring, ["C"], str(tmp_path))
+
+    score = scorer(model, X.iloc[test], y.iloc[test])
+
+    assert score == get_scorer(scoring)(model, X.iloc[test], y.iloc[test])
+
+
+def test_out_of_fold_of_the_best_candidate(data, folds, tmp_path):
+    X, y = data
+    space = {"C": Real(1e-3, 10, prior="log-uniform"), "max_iter": Integer(50, 200)}
+    scorer = OutOfFoldScorer("recall_weighted", list(space), str(tmp_path))
+    search = BayesianSearch(
+        LogisticRegression(),
+        space,
+        cv=folds,
+        scoring=scorer,
+        n_iter=6,
+        n_jobs=1,
+        random_state=0,
+    ).fit(X, y)
+
+    y_proba = load_out_of_fold(str(tmp_path), search.best_params_, X.index)
+
+    expected = cross_val_predict(
+        LogisticRegression(**search.best_params_),
+        X,
+        y,
+        cv=folds,
+        method="predict_proba",
+    )[:, 1]
+    np.testing.assert_allclose(y_proba, expected)
+
+
+def test_discards_candidates_that_cannot_be_the_best(data, folds, tmp_path):
+    X, y = data
+    scorer = OutOfFoldScorer("accuracy", ["C"], str(tmp_path))
+    search = BayesianSearch(
+        LogisticRegression(),
+        {"C": Real(1e-4, 10, prior="log-uniform")},
+        cv=folds,
+        scoring=scorer,
+        n_iter=12,
+        pruning={"n_startup_candidates": 2},
+        n_jobs=1,
+        random_state=0,
+    ).fit(X, y)
+
+    results = search.cv_results_
+    assert any(results["pruned"])
+    for params, pruned in zip(results["params"], results["pruned"]):
+        stored = load_out_of_fold(str(tmp_path), params, X.index)
+        assert (stored is None) == pruned
+
+
+def test_nan_scores_are_not_stored(data, folds, tmp_path):
+    X, y = data
+    train, test = folds[0]
+    model = LogisticRegression().fit(X.iloc[train], y.iloc[train])
+    scorer = OutOfFoldScorer("roc_auc", ["C"], str(tmp_path))
+    single_class = test[y.iloc[test].to_numpy() == 1]
+
+    with pytest.warns(UserWarning):
+        score = scorer(model, X.iloc[single_class], y.iloc[single_class])
+
+    assert np.isnan(score)
+    assert not (tmp_path / "out_of_fold").exists()
+
+
+def test_halving_keeps_the_predictions_of_a_promoted_twin(data, folds, tmp_path):
+    # 8 candidates over 2 values: 3 candidates in the last round, of which the
+    # best keeps a tied twin that is out
+    X, y = data
+    space = {"max_depth": Integer(1, 2)}
+    scorer = OutOfFoldScorer("accuracy", list(space), str(tmp_path))
+    search = SuccessiveHalvingSearch(
+        DecisionTreeClassifier(random_state=0),
+        space,
+        cv=folds,
+        scoring=scorer,
+        n_candidates=8,
+        factor=3,
+        random_state=0,
+    ).fit(X, y)
+
+    last_round = [
+        params
+        for params, round_id in zip(
+            search.cv_results_["params"], search.cv_results_["iter"]
+        )
+        if round_id == 1
+    ]
+    assert last_round.count(search.best_params_) > 1
+    y_proba = load_out_of_fold(str(tmp_path), search.best_params_, X.index)
+    assert y_proba is not None
+
+
+def test_discard_keeps_the_predictions_of_a_live_twin(data, folds, tmp_path):
+    X, y = data
+    scorer = OutOfFoldScorer("accuracy", ["C"], str(tmp_path))
+    search = BayesianSearch(
+        LogisticRegression(),
+        {"C": Real(1e-4, 10, prior="log-uniform")},
+        cv=folds,
+        scoring=scorer,
+        n_iter=1,
+        n_jobs=1,
+    ).fit(X, y)
+    best = search.best_params_
+    # The same parameters evaluated again, then pruned
+    search._record(best, [(0.5, 1.0)], len(folds), n_folds=1, pruned=True)
+
+    search._discard(best)
+    assert load_out_of_fold(str(tmp_path), best, X.index) is not None
+    search._discard(best)
+    assert load_out_of_fold(str(tmp_path), best, X.index) is None
@@ -0,0 +1,321 @@
+# Autoformatted & Linted with Ruff
+
+import time
+
+import numpy as np
+import pytest
+from sklearn.base import BaseEstimator, ClassifierMixin
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from sklearn.model_selection import StratifiedKFold
+from skopt import BayesSearchCV
+from skopt.space import Categorical, Integer, Real
+
+from egt309_pipeline.pipelines.model_training.search import (
+    BayesianSearch,
+    SuccessiveHalvingSearch,
+)
+
+SPACE = {
+    "C": Real(1e-4, 10, prior="log-uniform"),
+    "max_iter": Integer(50, 200),
+}
+
+
+class FailingClassifier(ClassifierMixin, BaseEstimator):
+    # LogisticRegression whose fit takes at least fit_time seconds, and raises
+    # when fail is True
+    def __init__(self, C: float = 1.0, fail: bool = False, fit_time: float = 0.0):
+        self.C = C
+        self.fail = fail
+        self.fit_time = fit_time
+
+    def fit(self, X, y):
+        time.sleep(self.fit_time)
+        if self.fail:
+            raise ValueError("failing candidate")
+        self.model_ = LogisticRegression(C=self.C).fit(X, y)
+        self.classes_ = self.model_.classes_
+        return self
+
+    def predict(self, X):
+        return self.model_.predict(X)
+
+    def predict_proba(self, X):
+        return self.model_.predict_proba(X)
+
+
+@pytest.fixture
+def data():
+    return make_classification(n_samples=300, flip_y=0.1, random_state=0)
+
+
+@pytest.fixture
+def cv():
+    return StratifiedKFold(3, shuffle=True, random_state=0)
+
+
+def test_matches_bayes_search_cv(data, cv):
+    X, y = data
+    common = {"n_iter": 12, "cv": cv, "scoring": "roc_auc", "random_state": 0}
+    reference = BayesSearchCV(LogisticRegression(), SPACE, n_jobs=1, **common)
+    search = BayesianSearch(LogisticRegression(), SPACE, n_jobs=1, **common)
+    reference.fit(X, y)
+    search.fit(X, y)
+
+    assert search.cv_results_["params"] == [
+        dict(params) for params in reference.cv_results_["params"]
+    ]
+    np.testing.assert_allclose(
+        search.cv_results_["mean_test_score"],
+        reference.cv_results_["mean_test_score"],
+    )
+    assert search.best_params_ == dict(reference.best_params_)
+    assert search.best_score_ == pytest.approx(reference.best_score_)
+    assert not any(search.cv_results_["pruned"])
+
+
+def test_prune_below_percentile_of_completed():
+    search = BayesianSearch(
+        LogisticRegression(),
+        SPACE,
+        cv=3,
+        scoring="accuracy",
+        pruning={"percentile": 50, "n_startup_candidates": 3, "n_warmup_folds": 1},
+    )
+    completed = [[0.6, 0.9, 0.9], [0.7, 0.5, 0.5], [0.8, 0.7, 0.7]]
+
+    # Cutoff on the first fold: the median of 0.6, 0.7 & 0.8
+    assert search._prune([(0.65, 1.0), None, None], completed)
+    assert not search._prune([(0.7, 1.0), None, None], completed)
+    # On the first two folds, the completed candidates average 0.75, 0.6 & 0.75
+    assert search._prune([(0.7, 1.0), (0.7, 1.0), None], completed)
+    assert not search._prune([(0.7, 1.0), (0.8, 1.0), None], completed)
+    # Not before n_startup_candidates completed candidates, nor once complete
+    assert not search._prune([(0.0, 1.0), None, None], completed[:2])
+    assert not search._prune([(0.0, 1.0)] * 3, completed)
+
+
+def test_prune_waits_for_warmup_folds():
+    search = BayesianSearch(
+        LogisticRegression(),
+        SPACE,
+        cv=3,
+        scoring="accuracy",
+        pruning={"n_startup_candidates": 1, "n_warmup_folds": 2},
+    )
+    completed = [[0.9, 0.9, 0.9]]
+
+    assert not search._prune([(0.1, 1.0), None, None], completed)
+    assert search._prune([(0.1, 1.0), (0.1, 1.0), None], completed)
+
+
+def test_pruning_abandons_candidates_below_cutoff(data, cv):
+    X, y = data
+    pruning = {"percentile": 50, "n_startup_candidates": 3, "n_warmup_folds": 1}
+    search = BayesianSearch(
+        LogisticRegression(),
+        SPACE,
+        cv=cv,
+        scoring="accuracy",
+        n_iter=15,
+        pruning=pruning,
+        n_jobs=1,
+        random_state=0,
+    ).fit(X, y)
+
+    # Replays the search: with one worker, a candidate runs one fold at a time
+    # and is pruned after the first fold whose running mean is below the cutoff
+    results = search.cv_results_
+    completed = []
+    for i, pruned in enumerate(results["pruned"]):
+        scores = [results[f"split{fold}_test_score"][i] for fold in range(3)]
+        expected_folds = 3
+        if len(completed) >= 3:
+            for n_folds in (1, 2):
+                cutoff = np.percentile(
+                    [np.mean(done[:n_folds]) for done in completed], 50
+                )
+                if np.mean(scores[:n_folds]) < cutoff:
+                    expected_folds = n_folds
+                    break
+        assert results["n_folds"][i] == expected_folds
+        assert pruned == (expected_folds < 3)
+        if not pruned:
+            completed.append(scores)
+
+    assert any(results["pruned"])
+    assert not results["pruned"][search.best_index_]
+    assert search.best_score_ == max(
+        score
+        for score, pruned in zip(results["mean_test_score"], results["pruned"])
+        if not pruned
+    )
+
+
+def test_failed_candidates_rank_last(data, cv):
+    X, y = data
+    space = {"C": Real(1e-2, 10, prior="log-uniform"), "fail": Categorical([1, 0])}
+    search = BayesianSearch(
+        FailingClassifier(),
+        space,
+        cv=cv,
+        scoring="roc_auc",
+        n_iter=10,
+        n_jobs=1,
+        random_state=0,
+    ).fit(X, y)
+
+    scores = np.asarray(search.cv_results_["mean_test_score"])
+    failed = [params["fail"] == 1 for params in search.cv_results_["params"]]
+    assert any(failed) and not all(failed)
+    assert np.isnan(scores[failed]).all()
+    assert not np.isnan(scores[np.logical_not(failed)]).any()
+    assert search.best_params_["fail"] == 0
+    assert search.best_score_ == np.max(scores[np.logical_not(failed)])
+
+
+def test_every_candidate_failed_raises(data, cv):
+    X, y = data
+    search = BayesianSearch(
+        FailingClassifier(fail=True),
+        {"C": Real(1e-2, 10, prior="log-uniform")},
+        cv=cv,
+        scoring="roc_auc",
+        n_iter=3,
+        n_jobs=1,
+        random_state=0,
+    )
+
+    with pytest.raises(ValueError, match="No candidate of BayesianSearch finished"):
+        search.fit(X, y)
+
+
+def test_failing_fit_raises_with_error_score_raise(data, cv):
+    X, y = data
+    search = BayesianSearch(
+        FailingClassifier(fail=True),
+        {"C": Real(1e-2, 10, prior="log-uniform")},
+        cv=cv,
+        scoring="roc_auc",
+        n_iter=3,
+        n_jobs=1,
+        error_score="raise",
+    )
+
+    with pytest.raises(ValueError, match="failing candidate"):
+        search.fit(X, y)
+
+
+@pytest.mark.parametrize("pruning", [None, {"n_startup_candidates": 2}])
+def test_async_search_evaluates_n_iter_candidates(data, cv, pruning):
+    X, y = data
+    search = BayesianSearch(
+        LogisticRegression(),
+        SPACE,
+        cv=cv,
+        scoring="roc_auc",
+        n_iter=8,
+        n_points=3,
+        pruning=pruning,
+        n_jobs=2,
+        random_state=0,
+    ).fit(X, y)
+
+    results = search.cv_results_
+    assert len(results["params"]) == 8
+    # The constant liar keeps the candidates in flight apart
+    points = {tuple(sorted(params.items())) for params in results["params"]}
+    assert len(points) == 8
+    for n_folds, pruned in zip(results["n_folds"], results["pruned"]):
+        assert (n_folds < 3) if pruned else (n_folds == 3)
+    assert not results["pruned"][search.best_index_]
+    assert search.best_params_ == results["params"][search.best_index_]
+    assert search.best_estimator_.get_params()["C"] == search.best_params_["C"]
+    np.testing.assert_array_equal(
+        search.best_estimator_.predict(X),
+        LogisticRegression(**search.best_params_).fit(X, y).predict(X),
+    )
+
+
+def test_async_search_rejects_unknown_strategy(data, cv):
+    X, y = data
+    search = BayesianSearch(
+        LogisticRegression(),
+        SPACE,
+        cv=cv,
+        scoring="roc_auc",
+        n_points=2,
+        strategy="cl_median",
+    )
+
+    with pytest.raises(ValueError, match="strategy must be one of"):
+        search.fit(X, y)
+
+
+@pytest.mark.filterwarnings("ignore::sklearn.exceptions.ConvergenceWarning")
+@pytest.mark.parametrize("n_candidates, factor", [(9, 3), (243, 3), (1000, 10)])
+def test_halving_rounds_on_exact_powers(data, n_candidates, factor):
+    # log(243, 3) & log(1000, 10) fall just short of 5 & 3 in floating point
+    X, y = data
+    max_resources = factor ** round(np.log(n_candidates) / np.log(factor))
+    search = SuccessiveHalvingSearch(
+        LogisticRegression(),
+        {"C": Real(1e-2, 10, prior="log-uniform")},
+        cv=2,
+        scoring="accuracy",
+        n_candidates=n_candidates,
+        factor=factor,
+        resource="max_iter",
+        max_resources=max_resources,
+        random_state=0,
+    ).fit(X, y)
+
+    rounds = np.asarray(search.cv_results_["iter"])
+    n_rounds = rounds.max() + 1
+    assert factor ** (n_rounds - 1) == n_candidates
+    # factor times fewer candidates with factor times the resources every round,
+    # down to a single candidate with max_resources
+    for round_id in range(n_rounds):
+        in_round = rounds == round_id
+        assert in_round.sum() == n_candidates // factor**round_id
+        assert set(np.asarray(search.cv_results_["n_resources"])[in_round]) == {
+            factor**round_id
+        }
+    assert search.best_params_["max_iter"] == max_resources
+
+
+def test_time_budget_stops_proposing(data, cv):
+    X, y = data
+    search = BayesianSearch(
+        FailingClassifier(fit_time=0.05),
+        {"C": Real(1e-2, 10, prior="log-uniform")},
+        cv=cv,
+        scoring="roc_auc",
+        n_iter=50,
+        time_budget=0.5,
+        n_jobs=1,
+        random_state=0,
+    ).fit(X, y)
+
+    assert 1 <= len(search.cv_results_["params"]) < 50
+
+
+def test_time_budget_holds_when_every_candidate_fails(data, cv):
+    X, y = data
+    search = BayesianSearch(
+        FailingClassifier(fail=True, fit_time=0.05),
+        {"C": Real(1e-2, 10, prior="log-uniform")},
+        cv=cv,
+        scoring="roc_auc",
+        n_iter=50,
+        time_budget=0.5,
+        n_jobs=1,
+        random_state=0,
+    )
+
+    start = time.perf_counter()
+    with pytest.raises(ValueError, match="within the time budget of 0.5 s"):
+        search.fit(X, y)
+    # 50 candidates of 3 failing folds would take 7.5 s
+    assert time.perf_counter() - start < 3